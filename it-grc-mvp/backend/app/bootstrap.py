@@ -0,0 +1,73 @@
+import time
+
+from sqlalchemy import inspect, select, text
+from sqlalchemy.orm import Session
+
+from app.core.audit_chain import install_audit_chain
+from app.core.bulk import upsert
+from app.core.search import install_search
+from app.db.base import Base
+from app.db.session import SessionLocal
+from app.models.meta import SchemaMeta
+from app.seed import run_seed
+
+# Import models so metadata is complete
+from app.models import user as _user  # noqa: F401
+from app.models import access as _access  # noqa: F401
+from app.models import risk as _risk  # noqa: F401
+from app.models import compliance as _compliance  # noqa: F401
+from app.models import audit as _audit  # noqa: F401
+
+# Bump whenever models or seed data change so the next bootstrap re-applies them
+BOOTSTRAP_VERSION = "5"
+VERSION_KEY = "bootstrap_version"
+
+# pg_advisory_xact_lock key; any constant shared by all processes of this app
+BOOTSTRAP_LOCK_KEY = 0x67726362
+
+def bootstrap_version(db: Session) -> str | None:
+    if not inspect(db.connection()).has_table(SchemaMeta.__tablename__):
+        return None
+    return db.scalar(select(SchemaMeta.value).where(SchemaMeta.key == VERSION_KEY))
+
+def install_indexes(conn) -> None:
+    # create_all skips tables that already exist, and their indexes with them, so indexes
+    # added to a model later are created here. Idempotent; runs after the column upgrades.
+    for table in Base.metadata.sorted_tables:
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            index.create(conn, checkfirst=True)
+
+def run_bootstrap(force: bool = False) -> dict:
+    # Create tables and seed once per BOOTSTRAP_VERSION. Concurrent callers serialize on a
+    # Postgres advisory lock and re-check the marker, so only the first one does the work.
+    # (SQLite has no advisory locks; the seed upserts are idempotent, so a race is harmless.)
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        if not force and bootstrap_version(db) == BOOTSTRAP_VERSION:
+            return {"status": "current", "version": BOOTSTRAP_VERSION}
+        db.rollback()
+
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": BOOTSTRAP_LOCK_KEY})
+        if not force and bootstrap_version(db) == BOOTSTRAP_VERSION:
+            db.rollback()
+            return {"status": "current", "version": BOOTSTRAP_VERSION}
+
+        Base.metadata.create_all(bind=db.connection())
+        install_search(db.connection())
+        install_audit_chain(db.connection())
+        install_indexes(db.connection())
+        run_seed(db)
+        stmt = upsert(db, SchemaMeta).values(key=VERSION_KEY, value=BOOTSTRAP_VERSION)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["key"], set_={"value": stmt.excluded.value, "updated_at": stmt.excluded.updated_at},
+        ))
+        db.commit()
+        return {
+            "status": "applied",
+            "version": BOOTSTRAP_VERSION,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+    finally:
+        db.close()
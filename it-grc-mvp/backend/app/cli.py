@@ -0,0 +1,80 @@
+import argparse
+import json
+from datetime import datetime, timedelta
+
+from app.bootstrap import run_bootstrap
+from app.db.session import SessionLocal
+from app.core.audit_archive import archive_audit
+from app.core.audit_chain import checkpoint_dict, create_checkpoint, verify_chain
+from app.core.config import settings
+from app.core.reports import REPORTS, refresh_snapshots
+
+# Import models so relationships resolve outside the web app
+from app.models import user as _user  # noqa: F401
+from app.models import access as _access  # noqa: F401
+from app.models import risk as _risk  # noqa: F401
+from app.models import compliance as _compliance  # noqa: F401
+from app.models import audit as _audit  # noqa: F401
+
+def cmd_archive_audit(args) -> dict:
+    cutoff = datetime.utcnow() - timedelta(days=args.older_than_days)
+    db = SessionLocal()
+    try:
+        return archive_audit(db, cutoff, args.archive_dir)
+    finally:
+        db.close()
+
+def cmd_checkpoint_audit(args) -> dict:
+    db = SessionLocal()
+    try:
+        cp = create_checkpoint(db)
+        db.commit()
+        return checkpoint_dict(cp) if cp else {"status": "empty"}
+    finally:
+        db.close()
+
+def cmd_verify_audit(args) -> dict:
+    result = verify_chain(args.from_seq, args.to_seq, args.workers)
+    if not result["ok"]:
+        print(json.dumps(result, indent=2, default=str))
+        raise SystemExit(1)
+    return result
+
+def cmd_snapshot_reports(args) -> dict:
+    return refresh_snapshots(args.report, force=args.force)
+
+def cmd_bootstrap(args) -> dict:
+    return run_bootstrap(force=args.force)
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("bootstrap", help="Create tables and seed data once per bootstrap version")
+    p.add_argument("--force", action="store_true", help="Re-apply even if the version marker is current")
+    p.set_defaults(func=cmd_bootstrap)
+
+    p = sub.add_parser("archive-audit", help="Move audit rows past the retention window into archive segments")
+    p.add_argument("--older-than-days", type=int, default=settings.AUDIT_RETENTION_DAYS)
+    p.add_argument("--archive-dir", default=settings.AUDIT_ARCHIVE_DIR)
+    p.set_defaults(func=cmd_archive_audit)
+
+    p = sub.add_parser("checkpoint-audit", help="Sign the current audit hash-chain head (run from cron)")
+    p.set_defaults(func=cmd_checkpoint_audit)
+
+    p = sub.add_parser("verify-audit", help="Verify the audit hash chain; exits 1 on a break")
+    p.add_argument("--from-seq", type=int, help="Check this range only (default: since the last verified checkpoint)")
+    p.add_argument("--to-seq", type=int)
+    p.add_argument("--workers", type=int, default=settings.AUDIT_VERIFY_WORKERS)
+    p.set_defaults(func=cmd_verify_audit)
+
+    p = sub.add_parser("snapshot-reports", help="Write report snapshots whose data changed or aged out, apply retention (run from cron)")
+    p.add_argument("--report", action="append", choices=sorted(REPORTS), help="Only this report (repeatable)")
+    p.add_argument("--force", action="store_true", help="Write a new snapshot even if the data is unchanged")
+    p.set_defaults(func=cmd_snapshot_reports)
+
+    args = parser.parse_args(argv)
+    print(json.dumps(args.func(args), indent=2, default=str))
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,164 @@
-from sqlalchemy.orm import Session
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.audit_chain import chain_records
+from app.core.config import settings
+from app.core.events import announce
+from app.db.session import SessionLocal, on_commit
 from app.models.audit import AuditLog
 
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "pending_audit"
+
+class AuditWriter:
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        batch_size: int,
+        flush_interval: float,
+        max_queue: int,
+        enqueue_timeout: float,
+        max_attempts: int = 5,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.max_attempts = max_attempts
+        self.written = 0
+        self.batches = 0
+        self.overflow_writes = 0
+        self.dropped = 0
+        self._queue: queue.Queue[dict] = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 30.0) -> None:
+        with self._lock:
+            if not self._thread:
+                return
+            self._stop.set()
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.error("Audit writer did not drain within %ss; %d records pending", timeout, self._queue.qsize())
+            self._thread = None
+
+    def submit(self, record: dict) -> bool:
+        # Blocks up to enqueue_timeout when the queue is full (backpressure). Returns
+        # False if the record could not be queued; the caller must write it itself.
+        if not self.running:
+            self.start()
+        try:
+            self._queue.put(record, timeout=self.enqueue_timeout)
+            return True
+        except queue.Full:
+            self.overflow_writes += 1
+            return False
+
+    def submit_or_write(self, record: dict) -> None:
+        # The fallback runs on the request thread: one attempt, no retry loop
+        if not self.submit(record):
+            self._flush([record], attempts=1)
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _take_batch(self) -> list[dict]:
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _insert(self, batch: list[dict]) -> bool:
+        db = self.session_factory()
+        try:
+            chain_records(db, batch)
+            db.execute(insert(AuditLog), batch)
+            announce(db)
+            db.commit()
+            self.written += len(batch)
+            self.batches += 1
+            return True
+        except Exception:
+            db.rollback()
+            logger.exception("Audit insert of %d records failed", len(batch))
+            return False
+        finally:
+            db.close()
+
+    def _flush(self, batch: list[dict], attempts: int | None = None) -> None:
+        # Retries with backoff up to max_attempts. A batch that still fails is retried
+        # record by record, so one bad record does not take the others with it; records
+        # that fail on their own are logged in full and dropped.
+        attempts = attempts or self.max_attempts
+        for attempt in range(1, attempts + 1):
+            if self._insert(batch):
+                return
+            if attempt < attempts:
+                time.sleep(min(0.5 * 2 ** attempt, 30))
+        if len(batch) > 1:
+            for record in batch:
+                self._flush([record], attempts=1)
+            return
+        self.dropped += 1
+        logger.error("Dropping audit record after %d attempts: %r", attempts, batch[0])
+
+    def _run(self) -> None:
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._take_batch()
+            if batch:
+                self._flush(batch)
+
+audit_writer = AuditWriter(
+    SessionLocal,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+    max_queue=settings.AUDIT_QUEUE_MAX,
+    enqueue_timeout=settings.AUDIT_ENQUEUE_TIMEOUT_SECONDS,
+    max_attempts=settings.AUDIT_WRITE_ATTEMPTS,
+)
+
+@event.listens_for(Session, "before_commit")
+def _insert_pending_audit(session: Session) -> None:
+    rows = session.info.pop(_PENDING_KEY, None)
+    if rows:
+        chain_records(session, rows)
+        session.execute(insert(AuditLog), rows)
+        announce(session)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_audit(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+
 def write_audit(
     db: Session,
     actor_user_id: int | None,
@@ -10,12 +168,18 @@ def write_audit(
     ip: str = "",
     details: str = "",
 ) -> None:
-    db.add(AuditLog(
-        actor_user_id=actor_user_id,
-        action=action,
-        entity_type=entity_type,
-        entity_id=str(entity_id),
-        ip=ip or "",
-        details=details or "",
-    ))
-    db.commit()
+    record = {
+        "actor_user_id": actor_user_id,
+        "action": action,
+        "entity_type": entity_type,
+        "entity_id": str(entity_id),
+        "ip": ip or "",
+        "details": details or "",
+        "created_at": datetime.utcnow(),
+    }
+    # Nothing is committed here: the record is written when the caller's unit of
+    # work commits, and discarded if it rolls back.
+    if settings.AUDIT_MODE == "write_behind":
+        on_commit(db, lambda: audit_writer.submit_or_write(record))
+    else:
+        db.info.setdefault(_PENDING_KEY, []).append(record)
@@ -0,0 +1,104 @@
+import gzip
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.audit import AuditLog
+
+# Columns copied into archive segments, in file order
+ARCHIVE_FIELDS = ["id", "actor_user_id", "action", "entity_type", "entity_id", "ip", "details", "created_at", "seq", "chain_hash"]
+
+def segment_name(ts: datetime) -> str:
+    return f"audit-{ts:%Y-%m}.ndjson.gz"
+
+def _segment_month(path: Path) -> datetime | None:
+    try:
+        return datetime.strptime(path.name, "audit-%Y-%m.ndjson.gz")
+    except ValueError:
+        return None
+
+def _next_month(ts: datetime) -> datetime:
+    return (ts.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+def _append_segment(path: Path, rows: list[dict]) -> None:
+    # Each call appends a new gzip member, so existing bytes are never rewritten
+    with open(path, "ab") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="ab") as gz:
+            for row in rows:
+                gz.write((json.dumps(row, separators=(",", ":")) + "\n").encode())
+        raw.flush()
+        os.fsync(raw.fileno())
+
+def archive_audit(db: Session, cutoff: datetime, archive_dir: str | None = None) -> dict:
+    # Moves rows created before `cutoff` out of the hot table, oldest first, one batch per
+    # transaction. Segments are written and fsynced before the rows are deleted, so a crash
+    # can at worst leave a row in both places; readers de-duplicate on id.
+    out = Path(archive_dir or settings.AUDIT_ARCHIVE_DIR)
+    out.mkdir(parents=True, exist_ok=True)
+    cols = [getattr(AuditLog, f) for f in ARCHIVE_FIELDS]
+    moved = 0
+    segments: set[str] = set()
+    while True:
+        rows = db.execute(
+            select(*cols)
+            .where(AuditLog.created_at < cutoff)
+            .order_by(AuditLog.created_at, AuditLog.id)
+            .limit(settings.AUDIT_ARCHIVE_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        by_segment: dict[str, list[dict]] = {}
+        for r in rows:
+            record = r._asdict()
+            record["created_at"] = r.created_at.isoformat()
+            by_segment.setdefault(segment_name(r.created_at), []).append(record)
+        for name, records in by_segment.items():
+            _append_segment(out / name, records)
+            segments.add(name)
+
+        db.execute(delete(AuditLog).where(AuditLog.id.in_([r.id for r in rows])))
+        db.commit()
+        moved += len(rows)
+
+    return {"archived": moved, "cutoff": cutoff.isoformat(), "segments": sorted(segments)}
+
+def iter_archived(
+    start: datetime | None = None,
+    end: datetime | None = None,
+    entity_type: str | None = None,
+    entity_id: str | None = None,
+    action: str | None = None,
+    archive_dir: str | None = None,
+) -> Iterator[dict]:
+    # Streams archived records oldest-first, opening only segments that overlap [start, end)
+    root = Path(archive_dir or settings.AUDIT_ARCHIVE_DIR)
+    if not root.is_dir():
+        return
+    segments = sorted((m, p) for p in root.glob("audit-*.ndjson.gz") if (m := _segment_month(p)))
+    seen: set[int] = set()
+    for month, path in segments:
+        if (start and _next_month(month) <= start) or (end and month >= end):
+            continue
+        with gzip.open(path, "rt") as f:
+            for line in f:
+                rec = json.loads(line)
+                created = datetime.fromisoformat(rec["created_at"])
+                if (start and created < start) or (end and created >= end):
+                    continue
+                if (entity_type and rec["entity_type"] != entity_type) or (entity_id and rec["entity_id"] != entity_id):
+                    continue
+                if action and rec["action"] != action:
+                    continue
+                if rec["id"] in seen:
+                    continue
+                seen.add(rec["id"])
+                rec["created_at"] = created
+                yield rec
+        seen.clear()  # ids never span months
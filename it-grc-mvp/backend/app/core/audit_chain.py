@@ -0,0 +1,233 @@
+import hashlib
+import hmac
+import json
+import time
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+
+from sqlalchemy import create_engine, inspect, insert, select, text, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.core.bulk import upsert
+from app.core.config import settings
+from app.db.session import SessionLocal, read_connection
+from app.models.audit import AuditChainHead, AuditCheckpoint, AuditLog
+from app.models import user as _user  # noqa: F401  (AuditLog.actor; worker processes import only this module)
+
+# Tamper evidence for audit_logs. Every row written through write_audit (either audit
+# mode) gets the next `seq` and chain_hash = sha256(previous chain_hash + row fields).
+# Editing, deleting or inserting a row breaks the chain from that point, and re-chaining
+# everything after it no longer matches the signed checkpoints taken since.
+
+GENESIS = "0" * 64
+HEAD_ID = 1
+CHAIN_FIELDS = ["seq", "actor_user_id", "action", "entity_type", "entity_id", "ip", "details", "created_at"]
+MAX_REPORTED_BREAKS = 100
+
+def _canonical(record) -> bytes:
+    values = [record[f] for f in CHAIN_FIELDS]
+    values[-1] = values[-1].isoformat()
+    return json.dumps(values, separators=(",", ":"), ensure_ascii=False).encode()
+
+def link(prev_hash: str, record) -> str:
+    return hashlib.sha256(prev_hash.encode() + _canonical(record)).hexdigest()
+
+def install_audit_chain(conn: Connection) -> None:
+    # Adds the chain columns to an audit_logs table created before they existed, and the
+    # head row. Idempotent; run by the bootstrap after create_all.
+    columns = {c["name"] for c in inspect(conn).get_columns(AuditLog.__tablename__)}
+    if "seq" not in columns:
+        conn.execute(text("ALTER TABLE audit_logs ADD COLUMN seq BIGINT"))
+        conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS uq_audit_logs_seq ON audit_logs (seq)"))
+    if "chain_hash" not in columns:
+        conn.execute(text("ALTER TABLE audit_logs ADD COLUMN chain_hash VARCHAR(64)"))
+    if conn.execute(select(AuditChainHead.id)).first() is None:
+        conn.execute(insert(AuditChainHead).values(id=HEAD_ID, seq=0, chain_hash=GENESIS))
+
+def chain_records(db: Session, records: list[dict]) -> None:
+    # Sets seq/chain_hash on records about to be inserted in db's transaction. Called
+    # right before COMMIT; the head row stays locked until then, so concurrent writers
+    # append one batch at a time and seq has no gaps.
+    stmt = select(AuditChainHead.seq, AuditChainHead.chain_hash).where(AuditChainHead.id == HEAD_ID).with_for_update()
+    head = db.execute(stmt).first()
+    if head is None:
+        db.execute(upsert(db, AuditChainHead).values(id=HEAD_ID, seq=0, chain_hash=GENESIS).on_conflict_do_nothing())
+        head = db.execute(stmt).first()
+    seq, chain_hash = head
+    for record in records:
+        seq += 1
+        record["seq"] = seq
+        chain_hash = record["chain_hash"] = link(chain_hash, record)
+    db.execute(update(AuditChainHead).where(AuditChainHead.id == HEAD_ID).values(seq=seq, chain_hash=chain_hash))
+
+def sign(seq: int, chain_hash: str, created_at: datetime) -> str:
+    key = (settings.AUDIT_CHECKPOINT_KEY or settings.JWT_SECRET).encode()
+    return hmac.new(key, f"{seq}:{chain_hash}:{created_at.isoformat()}".encode(), hashlib.sha256).hexdigest()
+
+def signature_valid(cp) -> bool:
+    return hmac.compare_digest(cp.signature, sign(cp.seq, cp.chain_hash, cp.created_at))
+
+def create_checkpoint(db: Session, seq: int | None = None, chain_hash: str | None = None, verified: bool = False) -> AuditCheckpoint | None:
+    # Signs the current head (or the given position); the caller commits. Taken
+    # periodically (`python -m app.cli checkpoint-audit`), and by a passing verification.
+    if seq is None:
+        seq, chain_hash = db.execute(select(AuditChainHead.seq, AuditChainHead.chain_hash).where(AuditChainHead.id == HEAD_ID)).first() or (0, GENESIS)
+    if seq == 0:
+        return None
+    latest = db.scalars(select(AuditCheckpoint).order_by(AuditCheckpoint.seq.desc()).limit(1)).first()
+    if latest is not None and latest.seq == seq and latest.chain_hash == chain_hash:
+        return latest
+    now = datetime.utcnow()
+    cp = AuditCheckpoint(seq=seq, chain_hash=chain_hash, created_at=now, signature=sign(seq, chain_hash, now), verified_at=now if verified else None)
+    db.add(cp)
+    db.flush()
+    return cp
+
+@dataclass
+class ChainBreak:
+    seq: int
+    reason: str
+
+def _verify_chunk(bind: Engine, start: int, end: int, seed: str | None) -> tuple[int, list[ChainBreak]]:
+    # Checks rows start..end. Without a seed the chain starts from the stored hash of row
+    # start-1, which the neighbouring chunk checks, so chunks can run in any order.
+    # After a break the stored hash is used to carry on, so each damaged row is reported once.
+    breaks: list[ChainBreak] = []
+    rows = 0
+    with bind.connect() as conn:
+        if seed is None:
+            seed = conn.scalar(select(AuditLog.chain_hash).where(AuditLog.seq == start - 1))
+            if seed is None:
+                return 0, [ChainBreak(start - 1, "row missing")]
+        cols = [getattr(AuditLog, f) for f in CHAIN_FIELDS] + [AuditLog.chain_hash]
+        result = conn.execution_options(yield_per=settings.EXPORT_BATCH_SIZE).execute(
+            select(*cols).where(AuditLog.seq.between(start, end)).order_by(AuditLog.seq)
+        )
+        chain_hash, expected = seed, start
+        for row in result:
+            rows += 1
+            if row.seq != expected:
+                breaks.append(ChainBreak(expected, f"rows {expected}..{row.seq - 1} missing"))
+            elif link(chain_hash, row._mapping) != row.chain_hash:
+                breaks.append(ChainBreak(row.seq, "hash mismatch"))
+            chain_hash, expected = row.chain_hash, row.seq + 1
+        if expected <= end:
+            breaks.append(ChainBreak(expected, f"rows {expected}..{end} missing"))
+    return rows, breaks
+
+# Engine per database URL inside verification worker processes
+_worker_engines: dict[str, Engine] = {}
+
+def _verify_chunk_worker(url: str, start: int, end: int, seed: str | None) -> tuple[int, list[ChainBreak]]:
+    bind = _worker_engines.get(url)
+    if bind is None:
+        bind = _worker_engines[url] = create_engine(url, pool_pre_ping=True)
+    return _verify_chunk(bind, start, end, seed)
+
+def verify_chain(from_seq: int | None = None, to_seq: int | None = None, workers: int | None = None) -> dict:
+    # Without from_seq: incremental, from the newest verified checkpoint to the head, and
+    # on success the checkpoints passed are marked verified and a new one is signed at
+    # the end, so the next run only reads rows written after this one. With from_seq /
+    # to_seq: a check of that range only. Either way the range is split into chunks of
+    # AUDIT_VERIFY_CHUNK_ROWS checked in parallel, and every checkpoint inside it must
+    # carry a valid signature and match the stored hash at its seq.
+    started = time.perf_counter()
+    workers = min(workers or settings.AUDIT_VERIFY_WORKERS, os.cpu_count() or 1)
+    breaks: list[ChainBreak] = []
+    with read_connection() as conn:
+        bind = conn.engine  # every chunk reads the same database as the head below
+        head = conn.scalar(select(AuditChainHead.seq).where(AuditChainHead.id == HEAD_ID)) or 0
+        first = conn.scalar(select(AuditLog.seq).where(AuditLog.seq.is_not(None)).order_by(AuditLog.seq).limit(1))
+        checkpoints = conn.execute(select(AuditCheckpoint).order_by(AuditCheckpoint.seq)).all()
+
+    incremental = from_seq is None
+    seed = anchor = None
+    if incremental:
+        anchor = next((cp for cp in reversed(checkpoints) if cp.verified_at is not None), None)
+        from_seq, seed = (anchor.seq + 1, anchor.chain_hash) if anchor else (1, GENESIS)
+        if anchor is not None and not signature_valid(anchor):
+            breaks.append(ChainBreak(anchor.seq, "checkpoint signature invalid"))
+    elif from_seq <= 1:
+        from_seq, seed = 1, GENESIS
+    to_seq = head if to_seq is None else min(to_seq, head)
+
+    # Rows moved out by the archive job cannot be re-read; start at the oldest one left
+    unanchored_from = None
+    if first is not None and from_seq < first <= to_seq:
+        unanchored_from, from_seq, seed = first, first + 1, None
+
+    rows = 0
+    chunks = []
+    if from_seq <= to_seq and not breaks:
+        size = max(1, settings.AUDIT_VERIFY_CHUNK_ROWS)
+        chunks = [(s, min(s + size - 1, to_seq)) for s in range(from_seq, to_seq + 1, size)]
+        if workers > 1 and len(chunks) > 1:
+            # Hashing is CPU-bound, so chunks go to worker processes, each with its own connection
+            url = bind.url.render_as_string(hide_password=False)
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), mp_context=context) as pool:
+                futures = [pool.submit(_verify_chunk_worker, url, s, e, seed if i == 0 else None) for i, (s, e) in enumerate(chunks)]
+                results = [f.result() for f in futures]
+        else:
+            results = [_verify_chunk(bind, s, e, seed if i == 0 else None) for i, (s, e) in enumerate(chunks)]
+        for n, found in results:
+            rows += n
+            breaks += found
+
+        in_range = [cp for cp in checkpoints if from_seq - 1 <= cp.seq <= to_seq]
+        with bind.connect() as conn:
+            stored = dict(conn.execute(
+                select(AuditLog.seq, AuditLog.chain_hash).where(AuditLog.seq.in_([cp.seq for cp in in_range]))
+            ).all()) if in_range else {}
+        for cp in in_range:
+            if not signature_valid(cp):
+                breaks.append(ChainBreak(cp.seq, "checkpoint signature invalid"))
+            elif cp.seq in stored and stored[cp.seq] != cp.chain_hash:
+                breaks.append(ChainBreak(cp.seq, "does not match checkpoint"))
+
+    breaks.sort(key=lambda b: b.seq)
+    ok = not breaks
+    checkpoint = None
+    if ok and incremental and rows:
+        checkpoint = _record_verified(from_seq, to_seq, bind)
+    elif ok and anchor is not None:
+        checkpoint = checkpoint_dict(anchor)  # nothing new since the last verification
+    return {
+        "ok": ok,
+        "from_seq": from_seq,
+        "to_seq": to_seq,
+        "rows": rows,
+        "chunks": len(chunks),
+        "workers": workers,
+        "seconds": round(time.perf_counter() - started, 3),
+        "unanchored_from": unanchored_from,
+        "breaks": [asdict(b) for b in breaks[:MAX_REPORTED_BREAKS]],
+        "breaks_truncated": len(breaks) > MAX_REPORTED_BREAKS,
+        "checkpoint": checkpoint,
+    }
+
+def _record_verified(from_seq: int, to_seq: int, bind: Engine) -> dict:
+    with bind.connect() as conn:
+        chain_hash = conn.scalar(select(AuditLog.chain_hash).where(AuditLog.seq == to_seq))
+    with SessionLocal() as db:
+        db.execute(
+            update(AuditCheckpoint)
+            .where(AuditCheckpoint.seq.between(from_seq - 1, to_seq), AuditCheckpoint.verified_at.is_(None))
+            .values(verified_at=datetime.utcnow())
+        )
+        cp = create_checkpoint(db, to_seq, chain_hash, verified=True)
+        db.commit()
+        return checkpoint_dict(cp)
+
+def checkpoint_dict(cp) -> dict:
+    return {
+        "seq": cp.seq,
+        "chain_hash": cp.chain_hash,
+        "signature": cp.signature,
+        "created_at": cp.created_at,
+        "verified_at": cp.verified_at,
+    }
@@ -0,0 +1,102 @@
+import csv
+import io
+import json
+from itertools import islice
+from typing import Iterable, Iterator
+
+from fastapi import HTTPException, UploadFile
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.schemas.imports import ImportResult, ImportRowError
+
+CSV_TYPES = {"text/csv", "application/csv", "application/vnd.ms-excel"}
+NDJSON_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl", "application/json-lines"}
+
+def upload_format(upload: UploadFile) -> str:
+    name = (upload.filename or "").lower()
+    ctype = (upload.content_type or "").split(";")[0].strip().lower()
+    if ctype in NDJSON_TYPES or name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    if ctype in CSV_TYPES or name.endswith(".csv"):
+        return "csv"
+    raise HTTPException(status_code=415, detail="Upload must be CSV (.csv) or NDJSON (.ndjson/.jsonl)")
+
+def iter_upload_rows(upload: UploadFile, fmt: str) -> Iterator[tuple[int, dict | None, str | None]]:
+    # Yields (row_number, record, parse_error) one line at a time; the upload is already
+    # spooled to disk by Starlette, so memory does not grow with file size. The file is
+    # decoded in chunks, so a bad byte cannot be pinned to one row or skipped: the whole
+    # import is rejected (400) and the unit of work rolls back what was already staged.
+    try:
+        yield from _parse_rows(io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline=""), fmt)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Upload must be UTF-8 encoded")
+
+def _parse_rows(text: io.TextIOWrapper, fmt: str) -> Iterator[tuple[int, dict | None, str | None]]:
+    if fmt == "csv":
+        for n, row in enumerate(csv.DictReader(text), start=2):  # row 1 is the header
+            if None in row:
+                yield n, None, "Too many fields"
+                continue
+            yield n, {k: v for k, v in row.items() if v not in ("", None)}, None
+        return
+    for n, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield n, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield n, None, "Expected a JSON object"
+            continue
+        yield n, record, None
+
+def batched(rows: Iterable, size: int) -> Iterator[list]:
+    it = iter(rows)
+    while batch := list(islice(it, size)):
+        yield batch
+
+def upsert(db: Session, model):
+    # Dialect-specific INSERT so callers can use on_conflict_do_update / do_nothing
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    raise HTTPException(status_code=501, detail=f"Bulk import is not supported on {dialect}")
+
+class ImportTracker:
+    def __init__(self, fmt: str):
+        self.result = ImportResult(format=fmt)
+
+    def error(self, row: int, message: str) -> None:
+        self.result.failed += 1
+        if len(self.result.errors) < settings.IMPORT_MAX_REPORTED_ERRORS:
+            self.result.errors.append(ImportRowError(row=row, error=message))
+        else:
+            self.result.errors_truncated = True
+
+    def written(self, rows: int, written: int) -> None:
+        # `rows` valid rows were sent in one statement that wrote `written` of them; the
+        # rest were repeated within the batch or already present
+        self.result.imported += written
+        self.result.skipped += rows - written
+
+    def validated(self, rows: Iterable[tuple[int, dict | None, str | None]], schema: type[BaseModel]) -> Iterator[tuple[int, BaseModel]]:
+        for n, record, parse_error in rows:
+            self.result.received += 1
+            if parse_error:
+                self.error(n, parse_error)
+                continue
+            try:
+                yield n, schema.model_validate(record)
+            except ValidationError as e:
+                self.error(n, "; ".join(f"{'.'.join(map(str, err['loc'])) or 'row'}: {err['msg']}" for err in e.errors()))
+
+    def summary(self) -> str:
+        r = self.result
+        return f"format={r.format} received={r.received} imported={r.imported} skipped={r.skipped} failed={r.failed}"
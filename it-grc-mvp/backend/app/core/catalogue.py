@@ -0,0 +1,107 @@
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+
+from fastapi import Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.cache import RedisCache, TTLCache
+from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER, PageParams, decode_cursor, encode_cursor
+from app.core.versions import load_versions, table_versions
+from app.models.compliance import Control, Framework
+
+# Columns kept per catalogue table; rows are ordered by (name, id) like the list endpoints
+COLUMNS = {
+    Framework: (Framework.id, Framework.name),
+    Control: (Control.id, Control.name, Control.description),
+}
+
+@dataclass(frozen=True)
+class CatalogueTable:
+    rows: list[dict]
+    keys: list[tuple[str, int]]
+    by_id: dict[int, dict]
+    by_name: dict[str, int]
+
+    @classmethod
+    def build(cls, rows: list[dict]) -> "CatalogueTable":
+        return cls(
+            rows=rows,
+            keys=[(r["name"], r["id"]) for r in rows],
+            by_id={r["id"]: r for r in rows},
+            by_name={r["name"]: r["id"] for r in rows},
+        )
+
+# Entries are keyed by "<table>:<change version>", so a committed write to frameworks or
+# controls (which bumps the version, see app.core.versions) makes every worker load a new
+# snapshot on its next read; nothing has to be deleted. With the redis backend, workers
+# share snapshots and keep decoded copies locally for CATALOGUE_CACHE_LOCAL_TTL_SECONDS.
+if settings.CATALOGUE_CACHE_BACKEND == "redis":
+    shared_cache = RedisCache(settings.CATALOGUE_CACHE_REDIS_URL, "grc:catalogue:", settings.CATALOGUE_CACHE_TTL_SECONDS)
+    local_cache = TTLCache(maxsize=8, ttl=settings.CATALOGUE_CACHE_LOCAL_TTL_SECONDS)
+else:
+    shared_cache = None
+    local_cache = TTLCache(maxsize=8, ttl=settings.CATALOGUE_CACHE_TTL_SECONDS)
+
+def get_catalogue(db: Session, model) -> CatalogueTable:
+    table = model.__tablename__
+    key = f"{table}:{table_versions(db).get(table, 0)}"
+    catalogue = local_cache.get(key)
+    if catalogue is None:
+        # Key the snapshot by the version read before its rows through the same session:
+        # on a lagging replica it is then filed under the older version it reflects
+        key = f"{table}:{load_versions(db).get(table, 0)}"
+        rows = shared_cache.get(key) if shared_cache else None
+        if rows is None:
+            id_col, name_col = COLUMNS[model][:2]
+            stmt = select(*COLUMNS[model]).order_by(name_col, id_col)
+            rows = [dict(r._mapping) for r in db.execute(stmt)]
+            if shared_cache:
+                shared_cache.set(key, rows)
+        catalogue = CatalogueTable.build(rows)
+        local_cache.set(key, catalogue)
+    return catalogue
+
+def exists(db: Session, model, id: int) -> bool:
+    # A miss is re-checked in the database: the row may have been created moments ago
+    # by another worker whose version bump this one has not seen yet
+    return id in get_catalogue(db, model).by_id or db.get(model, id) is not None
+
+def resolve(db: Session, model, ids: set[int], names: set[str]) -> tuple[set[int], dict[str, int]]:
+    # Known ids and name -> id for a batch of references; only cache misses hit the database
+    catalogue = get_catalogue(db, model)
+    known_ids = {i for i in ids if i in catalogue.by_id}
+    by_name = {n: catalogue.by_name[n] for n in names if n in catalogue.by_name}
+    missing_ids, missing_names = ids - known_ids, names - by_name.keys()
+    if missing_ids:
+        known_ids |= set(db.scalars(select(model.id).where(model.id.in_(missing_ids))))
+    if missing_names:
+        by_name |= dict(db.execute(select(model.name, model.id).where(model.name.in_(missing_names))).all())
+    return known_ids, by_name
+
+def catalogue_page(
+    db: Session,
+    model,
+    page: PageParams,
+    response: Response,
+    name_prefix: str | None = None,
+) -> list[dict]:
+    # In-memory equivalent of keyset_page over (name, id), with the same cursor format
+    catalogue = get_catalogue(db, model)
+    id_col, name_col = COLUMNS[model][:2]
+    start = 0
+    if page.cursor:
+        start = bisect_right(catalogue.keys, tuple(decode_cursor(page.cursor, [name_col, id_col])))
+    if name_prefix:
+        start = max(start, bisect_left(catalogue.keys, (name_prefix,)))
+
+    rows = []
+    for row in catalogue.rows[start:start + page.limit + 1]:
+        if name_prefix and not row["name"].startswith(name_prefix):
+            break
+        rows.append(row)
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([rows[-1]["name"], rows[-1]["id"]])
+    return rows
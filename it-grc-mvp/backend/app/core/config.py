@@ -1,11 +1,155 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
     DATABASE_URL: str
+    # Async mode serves routers through AsyncSession (asyncpg / aiosqlite). The async URL
+    # defaults to DATABASE_URL with the driver swapped.
+    DB_ASYNC: bool = False
+    ASYNC_DATABASE_URL: str | None = None
+
+    # Read side: comma-separated replica URLs for the read-only session dependency,
+    # tried round-robin; a replica that fails to connect is skipped for
+    # REPLICA_RETRY_SECONDS and reads fall back to the primary. With no replicas the
+    # read side still gets its own pool on DATABASE_URL. A client that wrote within
+    # READ_YOUR_WRITES_SECONDS reads from the primary (0 disables).
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_RETRY_SECONDS: float = 30.0
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Connection pools, per engine: DB_* for the primary (read-write), READ_DB_* for each
+    # read-side engine. Ignored for in-memory SQLite.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_CONNECT_TIMEOUT_SECONDS: int = 10
+    READ_DB_POOL_SIZE: int = 5
+    READ_DB_MAX_OVERFLOW: int = 10
+    READ_DB_POOL_RECYCLE_SECONDS: int = 1800
+    READ_DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    READ_DB_CONNECT_TIMEOUT_SECONDS: int = 5
+
     JWT_SECRET: str
     JWT_ALG: str = "HS256"
     ACCESS_TOKEN_MINUTES: int = 60
 
+    # Password hashing: PBKDF2 rounds for new hashes (older hashes are upgraded on login),
+    # a dedicated process pool (0 = threads, for dev/tests), a cap on queued hashes,
+    # and per-account / per-IP login attempts allowed per window.
+    PASSWORD_HASH_ROUNDS: int = 29000
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    LOGIN_ATTEMPTS_PER_WINDOW: int = 10
+    LOGIN_WINDOW_SECONDS: int = 60
+
+    # Run the versioned bootstrap (create tables + seed) from the startup hook. After the
+    # first run this is one marker lookup; set to false in production and run
+    # `python -m app.cli bootstrap` once per deploy so workers never touch the DB at boot.
+    BOOTSTRAP_ON_STARTUP: bool = True
+
+    # Auth principal cache (token subject -> user id + permission set)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+
+    # Keyset pagination for list endpoints
+    PAGE_SIZE_DEFAULT: int = 100
+    PAGE_SIZE_MAX: int = 1000
+
+    # List endpoints select column tuples and encode them with orjson instead of
+    # validating ORM objects against the response model (false = the pydantic path)
+    FAST_LIST_JSON: bool = True
+
+    # Most decisions accepted by one POST /access-requests/decisions call
+    ACCESS_DECISION_BATCH_MAX: int = 1000
+
+    # Report exports: rows fetched per server-side cursor batch, bytes per streamed chunk
+    EXPORT_BATCH_SIZE: int = 2000
+    EXPORT_CHUNK_BYTES: int = 64 * 1024
+    # Arrow IPC / Parquet exports: rows per record batch (= Parquet row group), codec and level
+    EXPORT_COLUMNAR_BATCH_ROWS: int = 65536
+    EXPORT_COLUMNAR_COMPRESSION: Literal["zstd", "lz4", "none"] = "zstd"
+    EXPORT_COLUMNAR_COMPRESSION_LEVEL: int = 9
+
+    # Report snapshots: /reports/* serve the latest CSV under REPORT_SNAPSHOT_DIR. A new
+    # one is written when the report's tables change or the latest is older than
+    # REPORT_SNAPSHOT_MAX_AGE_HOURS: on the next request, or ahead of it every
+    # REPORT_SNAPSHOT_INTERVAL_SECONDS in process (0 = off) or by
+    # `python -m app.cli snapshot-reports`. Older snapshots are kept
+    # for REPORT_SNAPSHOT_RETENTION_DAYS, at most REPORT_SNAPSHOT_RETENTION_MAX per report.
+    REPORT_SNAPSHOT_DIR: str = "report_snapshots"
+    REPORT_SNAPSHOT_INTERVAL_SECONDS: float = 0
+    REPORT_SNAPSHOT_MAX_AGE_HOURS: float = 24
+    REPORT_SNAPSHOT_RETENTION_DAYS: int = 90
+    REPORT_SNAPSHOT_RETENTION_MAX: int = 500
+
+    # Audit pipeline. "transactional": rows join the caller's transaction and are
+    # inserted together at commit. "write_behind": rows go to a bounded in-process
+    # queue drained by a background writer in multi-row batches.
+    AUDIT_MODE: Literal["transactional", "write_behind"] = "transactional"
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 0.2
+    AUDIT_QUEUE_MAX: int = 10000
+    AUDIT_ENQUEUE_TIMEOUT_SECONDS: float = 1.0
+    AUDIT_WRITE_ATTEMPTS: int = 5
+
+    # Audit retention: rows older than the hot window are moved to monthly
+    # append-only gzip NDJSON segments under AUDIT_ARCHIVE_DIR
+    AUDIT_RETENTION_DAYS: int = 90
+    AUDIT_ARCHIVE_DIR: str = "audit_archive"
+    AUDIT_ARCHIVE_BATCH_SIZE: int = 5000
+
+    # Audit hash chain: checkpoints are HMAC-SHA256 signed with AUDIT_CHECKPOINT_KEY
+    # (defaults to JWT_SECRET); verification checks chunks of AUDIT_VERIFY_CHUNK_ROWS on
+    # up to AUDIT_VERIFY_WORKERS parallel connections
+    AUDIT_CHECKPOINT_KEY: str | None = None
+    AUDIT_VERIFY_CHUNK_ROWS: int = 50000
+    AUDIT_VERIFY_WORKERS: int = 4
+
+    # Request instrumentation: per-route latency / SQL metrics served at /metrics, and a
+    # slow-request log with the statement list (0 disables the log)
+    METRICS_ENABLED: bool = True
+    SLOW_REQUEST_MS: float = 0
+    SLOW_REQUEST_MAX_STATEMENTS: int = 50
+
+    # Seconds a worker reuses table change versions for list ETags before re-reading them
+    # (its own writes refresh them immediately)
+    ETAG_VERSION_TTL_SECONDS: float = 1.0
+
+    # Framework / control catalogue cache. "memory": per worker. "redis": snapshots shared
+    # through a Redis-compatible server, decoded copies kept locally for the local TTL.
+    CATALOGUE_CACHE_BACKEND: Literal["memory", "redis"] = "memory"
+    CATALOGUE_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    CATALOGUE_CACHE_TTL_SECONDS: int = 300
+    CATALOGUE_CACHE_LOCAL_TTL_SECONDS: float = 5.0
+
+    # /events change feed: one listener per process reads new audit rows (woken by
+    # NOTIFY on Postgres and by local commits, otherwise every poll interval) into a ring
+    # buffer of EVENTS_BUFFER_SIZE events shared by all clients. SSE streams send a
+    # heartbeat every EVENTS_HEARTBEAT_SECONDS and end after EVENTS_MAX_STREAM_SECONDS
+    # (clients reconnect with Last-Event-ID); long polls wait at most
+    # EVENTS_LONG_POLL_MAX_SECONDS. EVENTS_PAGE_MAX caps events per poll response / read.
+    EVENTS_ENABLED: bool = True
+    EVENTS_POLL_INTERVAL_SECONDS: float = 0.5
+    EVENTS_FETCH_BATCH: int = 1000
+    EVENTS_BUFFER_SIZE: int = 10000
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    EVENTS_MAX_STREAM_SECONDS: float = 300.0
+    EVENTS_LONG_POLL_MAX_SECONDS: float = 30.0
+    EVENTS_PAGE_MAX: int = 500
+    EVENTS_MAX_SUBSCRIBERS: int = 1000
+
+    # /search ranks at most this many of the newest matches per entity type
+    SEARCH_MAX_CANDIDATES: int = 5000
+
+    # Compliance coverage matrix cache (cleared on catalogue/mapping writes)
+    COVERAGE_CACHE_TTL_SECONDS: int = 300
+
+    # Bulk CSV/NDJSON imports
+    IMPORT_BATCH_SIZE: int = 1000
+    IMPORT_MAX_REPORTED_ERRORS: int = 1000
+
 settings = Settings()
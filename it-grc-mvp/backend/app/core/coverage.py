@@ -0,0 +1,73 @@
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.compliance import Control, ControlMapping, Framework
+from app.schemas.compliance import ControlCoverage, CoverageMatrix, FrameworkCoverage
+
+# Keyed by query parameters; writers clear it after commit, the TTL bounds
+# staleness for other worker processes.
+coverage_cache = TTLCache(maxsize=256, ttl=settings.COVERAGE_CACHE_TTL_SECONDS)
+
+def invalidate_coverage() -> None:
+    coverage_cache.clear()
+
+def compute_coverage(db: Session, framework_id: int | None = None, unmapped_only: bool = False) -> CoverageMatrix:
+    fw_stmt = select(Framework.id, Framework.name).order_by(Framework.name)
+    count_stmt = select(ControlMapping.framework_id, ControlMapping.status, func.count()).group_by(
+        ControlMapping.framework_id, ControlMapping.status
+    )
+    if framework_id is not None:
+        fw_stmt = fw_stmt.where(Framework.id == framework_id)
+        count_stmt = count_stmt.where(ControlMapping.framework_id == framework_id)
+
+    total_controls = db.scalar(select(func.count()).select_from(Control))
+    counts: dict[int, dict[str, int]] = {}
+    for fw_id, status, n in db.execute(count_stmt):
+        counts.setdefault(fw_id, {})[status] = n
+
+    frameworks = []
+    for fw_id, name in db.execute(fw_stmt):
+        status_counts = counts.get(fw_id, {})
+        mapped = sum(status_counts.values())
+        frameworks.append(FrameworkCoverage(
+            framework_id=fw_id,
+            framework=name,
+            total_controls=total_controls,
+            mapped=mapped,
+            unmapped=total_controls - mapped,
+            status_counts=status_counts,
+            compliant_pct=round(100 * status_counts.get("COMPLIANT", 0) / total_controls, 2) if total_controls else 0.0,
+        ))
+
+    # Sparse pivot: one LEFT JOIN row per (control, mapping); controls with no mapping
+    # (for the selected framework, if any) come back with empty statuses.
+    join_on = ControlMapping.control_id == Control.id
+    if framework_id is not None:
+        join_on = and_(join_on, ControlMapping.framework_id == framework_id)
+    pivot_stmt = (
+        select(Control.id, Control.name, ControlMapping.framework_id, ControlMapping.status)
+        .outerjoin(ControlMapping, join_on)
+        .order_by(Control.name, Control.id)
+    )
+    if unmapped_only:
+        pivot_stmt = pivot_stmt.where(ControlMapping.id.is_(None))
+
+    controls: dict[int, ControlCoverage] = {}
+    for control_id, control_name, fw_id, status in db.execute(pivot_stmt):
+        row = controls.get(control_id)
+        if row is None:
+            row = controls[control_id] = ControlCoverage(control_id=control_id, control=control_name, statuses={})
+        if fw_id is not None:
+            row.statuses[fw_id] = status
+
+    return CoverageMatrix(frameworks=frameworks, controls=list(controls.values()))
+
+def get_coverage(db: Session, framework_id: int | None = None, unmapped_only: bool = False) -> CoverageMatrix:
+    key = (framework_id, unmapped_only)
+    matrix = coverage_cache.get(key)
+    if matrix is None:
+        matrix = compute_coverage(db, framework_id, unmapped_only)
+        coverage_cache.set(key, matrix)
+    return matrix
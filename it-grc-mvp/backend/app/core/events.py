@@ -0,0 +1,257 @@
+import asyncio
+import logging
+import select as selectors
+import threading
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.rbac import Principal
+from app.db.session import engine, on_commit, read_connection
+from app.models.audit import AuditLog
+
+logger = logging.getLogger(__name__)
+
+# Change feed for /events. Every audit row written through write_audit gets the next
+# chain seq while holding the chain head lock until COMMIT, so rows become visible in
+# seq order and "seq > last seen" never skips one. One listener thread per process
+# reads new rows and fans them out to every connected client from a ring buffer; seq
+# doubles as the SSE event id for resuming.
+
+CHANNEL = "grc_events"
+EVENT_FIELDS = ["seq", "action", "entity_type", "entity_id", "actor_user_id", "details", "created_at"]
+
+# Entity types readable without audit:read, and the permission each one needs
+ENTITY_PERMISSIONS = {
+    "Risk": "risk:read",
+    "AccessRequest": "access:read",
+    "Framework": "compliance:read",
+    "Control": "compliance:read",
+    "ControlMapping": "compliance:read",
+}
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    seq: int
+    action: str
+    entity_type: str
+    entity_id: str
+    actor_user_id: int | None
+    details: str
+    created_at: datetime
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+@dataclass(frozen=True)
+class EventFilter:
+    entity_types: frozenset[str] | None
+    actions: frozenset[str] | None
+    # Entity types the caller may see; None = all (audit:read)
+    readable: frozenset[str] | None
+
+    def matches(self, e: ChangeEvent) -> bool:
+        return (
+            (self.readable is None or e.entity_type in self.readable)
+            and (self.entity_types is None or e.entity_type in self.entity_types)
+            and (self.actions is None or e.action in self.actions)
+        )
+
+def event_filter(user: Principal, entity_types: list[str] | None, actions: list[str] | None) -> EventFilter:
+    # Like /search: an explicitly requested entity type needs its read permission (403);
+    # otherwise the feed carries only the types the caller may read
+    readable = None
+    if "audit:read" not in user.permissions:
+        readable = frozenset(t for t, perm in ENTITY_PERMISSIONS.items() if perm in user.permissions)
+        if not readable:
+            raise HTTPException(status_code=403, detail="No readable event types")
+        denied = sorted(set(entity_types or ()) - readable)
+        if denied:
+            raise HTTPException(status_code=403, detail=f"Cannot read events for: {', '.join(denied)}")
+    return EventFilter(
+        frozenset(entity_types) if entity_types else None,
+        frozenset(actions) if actions else None,
+        readable,
+    )
+
+def _select_events():
+    return select(*[getattr(AuditLog, f) for f in EVENT_FIELDS])
+
+def load_events(after_seq: int, to_seq: int, flt: EventFilter, limit: int) -> list[ChangeEvent]:
+    # Resume path for clients further behind than the ring buffer: matching rows in
+    # (after_seq, to_seq]. From the primary, like the listener: a lagging replica would
+    # return too few rows and the client would skip the rest.
+    stmt = _select_events().where(AuditLog.seq > after_seq, AuditLog.seq <= to_seq)
+    if flt.readable is not None:
+        stmt = stmt.where(AuditLog.entity_type.in_(flt.readable))
+    if flt.entity_types is not None:
+        stmt = stmt.where(AuditLog.entity_type.in_(flt.entity_types))
+    if flt.actions is not None:
+        stmt = stmt.where(AuditLog.action.in_(flt.actions))
+    with read_connection(primary=True) as conn:
+        return [ChangeEvent(*row) for row in conn.execute(stmt.order_by(AuditLog.seq).limit(limit))]
+
+def announce(db: Session) -> None:
+    # Called in a transaction that inserts audit rows: wakes the listeners once it
+    # commits. NOTIFY reaches every worker on Postgres; on_commit wakes this one.
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SELECT pg_notify(:channel, '')"), {"channel": CHANNEL})
+    on_commit(db, event_hub.notify)
+
+class EventHub:
+    def __init__(self, buffer_size: int, poll_interval: float):
+        self.poll_interval = poll_interval
+        self.head = 0  # seq of the newest published event
+        self.subscribers = 0
+        self._buffer: deque[ChangeEvent] = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        with self._start_lock:
+            if self.running:
+                return
+            with engine.connect() as conn:
+                head = conn.scalar(select(func.max(AuditLog.seq))) or 0
+            with self._lock:
+                self.head = max(self.head, head)
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="event-listener", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                return
+            self._stop.set()
+            self._wake.set()
+            self._thread.join(timeout)
+            self._thread = None
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    def events_after(self, seq: int, limit: int) -> list[ChangeEvent] | None:
+        # Buffered events after seq, oldest first; None when seq is older than the buffer
+        with self._lock:
+            if seq >= self.head:
+                return []
+            if not self._buffer or seq < self._buffer[0].seq - 1:
+                return None
+            newer = []
+            for e in reversed(self._buffer):
+                if e.seq <= seq:
+                    break
+                newer.append(e)
+        newer.reverse()
+        return newer[:limit]
+
+    async def wait(self, after_seq: int, timeout: float) -> bool:
+        # True once an event newer than after_seq is published, False on timeout
+        ready = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), ready)
+        with self._lock:
+            if self.head > after_seq:
+                return True
+            self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+    def _publish(self, events: list[ChangeEvent]) -> None:
+        with self._lock:
+            self._buffer.extend(events)
+            self.head = events[-1].seq
+            waiters = list(self._waiters)
+        for loop, ready in waiters:
+            try:
+                loop.call_soon_threadsafe(ready.set)
+            except RuntimeError:  # loop already closed
+                pass
+
+    def _fetch(self) -> list[ChangeEvent]:
+        # From the primary: a replica may not have replayed the commit that woke us yet
+        stmt = _select_events().where(AuditLog.seq > self.head).order_by(AuditLog.seq).limit(settings.EVENTS_FETCH_BATCH)
+        with engine.connect() as conn:
+            return [ChangeEvent(*row) for row in conn.execute(stmt)]
+
+    def _listen(self):
+        # Dedicated LISTEN connection on Postgres (psycopg2), outside the pool
+        if engine.dialect.name != "postgresql" or engine.dialect.driver != "psycopg2":
+            return None
+        raw = engine.raw_connection()
+        raw.detach()
+        conn = raw.dbapi_connection
+        conn.rollback()  # the pre-ping may have opened a transaction
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute(f"LISTEN {CHANNEL}")
+        return conn
+
+    def _run(self) -> None:
+        listener = None
+        while not self._stop.is_set():
+            try:
+                events = self._fetch()
+                if events:
+                    self._publish(events)
+                    if len(events) == settings.EVENTS_FETCH_BATCH:
+                        continue  # more waiting
+                if listener is None:
+                    listener = self._listen()
+            except Exception:
+                logger.exception("Event listener failed; retrying")
+                listener = self._close(listener)
+            if listener is not None:
+                # NOTIFY from any worker; the timeout also catches rows from writers
+                # that do not announce (e.g. benchmarks/datagen.py)
+                try:
+                    if selectors.select([listener], [], [], self.poll_interval)[0]:
+                        listener.poll()
+                        listener.notifies.clear()
+                except Exception:
+                    logger.exception("Event LISTEN connection lost")
+                    listener = self._close(listener)
+            else:
+                self._wake.wait(self.poll_interval)
+            self._wake.clear()
+        self._close(listener)
+
+    @staticmethod
+    def _close(listener) -> None:
+        if listener is not None:
+            try:
+                listener.close()
+            except Exception:
+                pass
+        return None
+
+event_hub = EventHub(settings.EVENTS_BUFFER_SIZE, settings.EVENTS_POLL_INTERVAL_SECONDS)
+
+async def next_events(after_seq: int, flt: EventFilter, limit: int) -> tuple[list[ChangeEvent], int]:
+    # Matching events after after_seq, and the seq scanned up to (the resume point)
+    events = event_hub.events_after(after_seq, limit)
+    if events is None:
+        head = event_hub.head
+        events = await run_in_threadpool(load_events, after_seq, head, flt, limit)
+        return events, events[-1].seq if len(events) == limit else head
+    return [e for e in events if flt.matches(e)], events[-1].seq if events else after_seq
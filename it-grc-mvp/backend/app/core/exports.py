@@ -0,0 +1,210 @@
+import io
+import zlib
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+import orjson
+from fastapi import HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import BigInteger, Boolean, DateTime, Float, Integer
+
+from app.core.config import settings
+from app.core.reports import iter_csv
+
+# Export formats for report and audit exports, chosen by ?format= or the Accept header.
+# CSV stays the default. NDJSON is gzip-encoded for clients that accept it; Arrow IPC
+# and Parquet carry column types (int64 scores, UTC timestamps) and need pyarrow.
+
+@dataclass(frozen=True)
+class ExportFormat:
+    name: str
+    media_type: str
+    extension: str
+    # Other media types accepted for this format in Accept
+    aliases: tuple = ()
+    columnar: bool = False
+
+FORMATS = {
+    f.name: f
+    for f in (
+        ExportFormat("csv", "text/csv", "csv"),
+        ExportFormat("ndjson", "application/x-ndjson", "ndjson", ("application/ndjson", "application/jsonl")),
+        ExportFormat("arrow", "application/vnd.apache.arrow.stream", "arrows", columnar=True),
+        ExportFormat("parquet", "application/vnd.apache.parquet", "parquet", ("application/x-parquet",), columnar=True),
+    )
+}
+_BY_MEDIA_TYPE = {m: f.name for f in FORMATS.values() for m in (f.media_type, *f.aliases)}
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return None
+    return pyarrow
+
+def _accepted(header: str) -> list[tuple[float, str]]:
+    # (q, media type) pairs, most preferred first; ties keep header order
+    out = []
+    for i, part in enumerate(header.split(",")):
+        media, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for p in params:
+            if p.startswith("q="):
+                try:
+                    q = float(p[2:])
+                except ValueError:
+                    q = 0.0
+        if media and q > 0:
+            out.append((-q, i, media.lower()))
+    return [(-q, media) for q, _, media in sorted(out)]
+
+def negotiate(request: Request, requested: str | None) -> ExportFormat:
+    # ?format= wins over Accept. No Accept, or one that allows anything, gets CSV.
+    available = [n for n, f in FORMATS.items() if not f.columnar or _pyarrow() is not None]
+    if requested is not None:
+        if requested not in FORMATS:
+            raise HTTPException(status_code=400, detail=f"Unknown format; use one of {', '.join(FORMATS)}")
+        if requested not in available:
+            raise HTTPException(status_code=406, detail=f"{requested} exports need the pyarrow package")
+        return FORMATS[requested]
+    header = request.headers.get("accept")
+    if not header:
+        return FORMATS["csv"]
+    for _, media in _accepted(header):
+        if media in ("*/*", "text/*"):
+            return FORMATS["csv"]
+        name = _BY_MEDIA_TYPE.get(media)
+        if name in available:
+            return FORMATS[name]
+    raise HTTPException(status_code=406, detail=f"Supported: {', '.join(FORMATS[n].media_type for n in available)}")
+
+def accepts_gzip(request: Request) -> bool:
+    for _, coding in _accepted(request.headers.get("accept-encoding", "")):
+        if coding in ("gzip", "*"):
+            return True
+    return False
+
+def _rows(batches: Iterable[list]) -> Iterator[tuple]:
+    for batch in batches:
+        yield from batch
+
+def iter_ndjson(fieldnames: list[str], batches: Iterable[list], gzip: bool) -> Iterator[bytes]:
+    # One orjson-encoded object per line, one chunk per batch, optionally gzip-encoded
+    # incrementally so the whole export is never held in memory. Timestamps (naive UTC
+    # in the database) get a "Z", matching the UTC type of the columnar formats.
+    gz = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+    for batch in batches:
+        data = b"".join(orjson.dumps(dict(zip(fieldnames, row)), option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z) + b"\n" for row in batch)
+        if gz is not None:
+            data = gz.compress(data)
+        if data:
+            yield data
+    if gz is not None:
+        yield gz.flush()
+
+def arrow_schema(fieldnames: list[str], column_types: list):
+    # SQL column types -> Arrow types. Timestamps are stored as naive UTC.
+    pa = _pyarrow()
+    fields = []
+    for name, sql_type in zip(fieldnames, column_types):
+        if isinstance(sql_type, (Integer, BigInteger)):
+            t = pa.int64()
+        elif isinstance(sql_type, DateTime):
+            t = pa.timestamp("us", tz="UTC")
+        elif isinstance(sql_type, Boolean):
+            t = pa.bool_()
+        elif isinstance(sql_type, Float):
+            t = pa.float64()
+        else:
+            t = pa.string()
+        fields.append(pa.field(name, t))
+    return pa.schema(fields)
+
+class _Sink(io.RawIOBase):
+    # Write target for the pyarrow writers; bytes are handed out as they are written
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        self._pos += len(b)
+        return len(b)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def _record_batches(schema, batches: Iterable[list]) -> Iterator:
+    # Regroups fetch batches into record batches of EXPORT_COLUMNAR_BATCH_ROWS rows, so
+    # Parquet row groups and Arrow batches are large enough to compress well
+    pa = _pyarrow()
+    pending: list[tuple] = []
+    for batch in batches:
+        pending.extend(batch)
+        if len(pending) >= settings.EXPORT_COLUMNAR_BATCH_ROWS:
+            yield _to_record_batch(pa, schema, pending)
+            pending = []
+    if pending:
+        yield _to_record_batch(pa, schema, pending)
+
+def _to_record_batch(pa, schema, rows: list[tuple]):
+    columns = zip(*rows)
+    return pa.record_batch([pa.array(list(col), type=f.type) for col, f in zip(columns, schema)], schema=schema)
+
+def iter_columnar(fmt: ExportFormat, schema, batches: Iterable[list]) -> Iterator[bytes]:
+    pa = _pyarrow()
+    sink = _Sink()
+    codec, level = settings.EXPORT_COLUMNAR_COMPRESSION, settings.EXPORT_COLUMNAR_COMPRESSION_LEVEL
+    if fmt.name == "parquet":
+        # Ids, counts and timestamps are mostly increasing in export order, so they are
+        # delta-encoded; strings are dictionary-encoded (statuses, actions, names repeat)
+        numeric = [f.name for f in schema if pa.types.is_integer(f.type) or pa.types.is_timestamp(f.type)]
+        writer = pa.parquet.ParquetWriter(
+            sink, schema, compression=codec, compression_level=None if codec == "none" else level,
+            use_dictionary=[f.name for f in schema if f.name not in numeric],
+            column_encoding=dict.fromkeys(numeric, "DELTA_BINARY_PACKED"),
+        )
+    else:
+        compression = None if codec == "none" else pa.Codec(codec, compression_level=level)
+        writer = pa.ipc.new_stream(sink, schema, options=pa.ipc.IpcWriteOptions(compression=compression))
+    try:
+        for record_batch in _record_batches(schema, batches):
+            writer.write_batch(record_batch)
+            if data := sink.drain():
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+def export_response(
+    request: Request,
+    fmt: ExportFormat,
+    filename: str,
+    fieldnames: list[str],
+    column_types: list,
+    batches: Iterable[list],
+) -> StreamingResponse:
+    # filename without extension; batches are lists of row tuples in fieldnames order
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}.{fmt.extension}"',
+        "Vary": "Accept, Accept-Encoding",
+    }
+    if fmt.name == "csv":
+        body = iter_csv(fieldnames, _rows(batches))
+    elif fmt.name == "ndjson":
+        gzip = accepts_gzip(request)
+        if gzip:
+            headers["Content-Encoding"] = "gzip"
+        body = iter_ndjson(fieldnames, batches, gzip)
+    else:
+        body = iter_columnar(fmt, arrow_schema(fieldnames, column_types), batches)
+    return StreamingResponse(body, media_type=fmt.media_type, headers=headers)
@@ -0,0 +1,115 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from fastapi import HTTPException
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import hash_password, verify_and_upgrade
+
+class HashingService:
+    # PBKDF2 holds the GIL for its whole run, so hashing on request threads stalls every
+    # other request on the worker. This runs it in a separate process pool, rejects work
+    # beyond max_pending instead of queueing without bound, and rate-limits failed logins
+    # per key (account, client IP) before any hashing is done.
+    def __init__(self, workers: int, max_pending: int, attempts_per_window: int, window_seconds: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.attempts_per_window = attempts_per_window
+        self.window_seconds = window_seconds
+        self.rejected_busy = 0
+        self.rejected_rate = 0
+        self._pending = 0
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._attempts = TTLCache(maxsize=100_000, ttl=window_seconds)
+
+    def start(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.workers > 0:
+                    # spawn: forking a process that already runs threads is not safe
+                    self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="hashing")
+            return self._executor
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def _recent(self, key: str, now: float) -> deque:
+        attempts = self._attempts.get(key)
+        if attempts is None:
+            return deque()
+        while attempts and attempts[0] <= now - self.window_seconds:
+            attempts.popleft()
+        return attempts
+
+    def admit(self, *keys: str) -> None:
+        # Rejects the attempt if any key has used up its failures for the window; records
+        # nothing, so successful logins never count against a shared IP
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                attempts = self._recent(key, now)
+                if len(attempts) >= self.attempts_per_window:
+                    self.rejected_rate += 1
+                    retry = max(1, int(attempts[0] + self.window_seconds - now) + 1)
+                    raise HTTPException(status_code=429, detail="Too many login attempts", headers={"Retry-After": str(retry)})
+
+    def record_failure(self, *keys: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                attempts = self._recent(key, now)
+                attempts.append(now)
+                self._attempts.set(key, attempts)
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected_busy += 1
+                raise HTTPException(status_code=503, detail="Authentication service busy", headers={"Retry-After": "1"})
+            self._pending += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def _run(self, fn, *args):
+        executor = self.start()
+        self._acquire()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        finally:
+            self._release()
+
+    async def hash(self, pw: str) -> str:
+        return await self._run(hash_password, pw)
+
+    async def verify(self, pw: str, pw_hash: str) -> tuple[bool, str | None]:
+        return await self._run(verify_and_upgrade, pw, pw_hash)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                "rejected_busy": self.rejected_busy,
+                "rejected_rate": self.rejected_rate,
+            }
+
+hasher = HashingService(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    attempts_per_window=settings.LOGIN_ATTEMPTS_PER_WINDOW,
+    window_seconds=settings.LOGIN_WINDOW_SECONDS,
+)
@@ -0,0 +1,205 @@
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+UNMATCHED_ROUTE = "<unmatched>"
+
+@dataclass
+class RequestStats:
+    statements: int = 0
+    db_seconds: float = 0.0
+    rows: int = 0
+    phases: dict[str, float] = field(default_factory=dict)
+    # (sql, ms) per statement, only kept when the slow-request log is on
+    log: list[tuple[str, float]] | None = None
+
+# The stats object of the request being served. Sync endpoints and streaming bodies run
+# in worker threads with a copy of the request context, so they update the same object.
+current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+@contextmanager
+def span(name: str):
+    # Adds wall time to a named phase of the current request (e.g. "auth")
+    stats = current_request.get()
+    if stats is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.phases[name] = stats.phases.get(name, 0.0) + time.perf_counter() - t0
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_request.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request.get()
+    started = conn.info.get("query_started")
+    if stats is None or not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    stats.statements += 1
+    stats.db_seconds += elapsed
+    # As reported by the driver: psycopg2/asyncpg count SELECT rows, sqlite3 only DML
+    if cursor.rowcount > 0:
+        stats.rows += cursor.rowcount
+    if stats.log is not None and len(stats.log) < settings.SLOW_REQUEST_MAX_STATEMENTS:
+        stats.log.append((statement, round(elapsed * 1000, 3)))
+
+class Histogram:
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+@dataclass
+class RouteMetrics:
+    latency: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    statements: Histogram = field(default_factory=lambda: Histogram(STATEMENT_BUCKETS))
+    db_seconds: float = 0.0
+    rows: int = 0
+    phases: dict[str, float] = field(default_factory=dict)
+    responses: dict[str, int] = field(default_factory=dict)
+
+class MetricsRegistry:
+    def __init__(self):
+        self._routes: dict[tuple[str, str], RouteMetrics] = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+        with self._lock:
+            m = self._routes.get((method, route))
+            if m is None:
+                m = self._routes[(method, route)] = RouteMetrics()
+            m.latency.observe(seconds)
+            m.statements.observe(stats.statements)
+            m.db_seconds += stats.db_seconds
+            m.rows += stats.rows
+            for name, value in stats.phases.items():
+                m.phases[name] = m.phases.get(name, 0.0) + value
+            code = str(status)
+            m.responses[code] = m.responses.get(code, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def render(self) -> str:
+        # Prometheus text exposition format 0.0.4
+        with self._lock:
+            routes = sorted(self._routes.items())
+            out = [
+                "# HELP grc_http_requests_total Requests by route and status code.",
+                "# TYPE grc_http_requests_total counter",
+            ]
+            for (method, route), m in routes:
+                for code, n in sorted(m.responses.items()):
+                    out.append(f'grc_http_requests_total{{{_labels(method, route)},status="{code}"}} {n}')
+            out += _histogram("grc_http_request_duration_seconds", "Request latency, until the last body byte is sent.", routes, "latency")
+            out += _histogram("grc_http_request_db_statements", "SQL statements executed per request.", routes, "statements")
+            out += _counter("grc_http_request_db_seconds_total", "Time spent executing SQL.", routes, lambda m: m.db_seconds)
+            out += _counter("grc_http_request_db_rows_total", "Rows returned or affected, as reported by the driver.", routes, lambda m: m.rows)
+            out += [
+                "# HELP grc_http_request_phase_seconds_total Time spent in named request phases (auth = token decode + principal lookup).",
+                "# TYPE grc_http_request_phase_seconds_total counter",
+            ]
+            for (method, route), m in routes:
+                for name, value in sorted(m.phases.items()):
+                    out.append(f'grc_http_request_phase_seconds_total{{{_labels(method, route)},phase="{name}"}} {value:.6f}')
+        return "\n".join(out) + "\n"
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(method: str, route: str) -> str:
+    return f'method="{method}",route="{_escape(route)}"'
+
+def _counter(name: str, help_text: str, routes, value) -> list[str]:
+    out = [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+    out += [f"{name}{{{_labels(method, route)}}} {value(m):.6g}" for (method, route), m in routes]
+    return out
+
+def _histogram(name: str, help_text: str, routes, attr: str) -> list[str]:
+    out = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for (method, route), m in routes:
+        h: Histogram = getattr(m, attr)
+        labels = _labels(method, route)
+        cumulative = 0
+        for bound, n in zip(h.buckets, h.counts):
+            cumulative += n
+            out.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        total = cumulative + h.counts[-1]
+        out.append(f'{name}_bucket{{{labels},le="+Inf"}} {total}')
+        out.append(f"{name}_sum{{{labels}}} {h.sum:.6g}")
+        out.append(f"{name}_count{{{labels}}} {total}")
+    return out
+
+registry = MetricsRegistry()
+
+class MetricsMiddleware:
+    # Plain ASGI middleware (not BaseHTTPMiddleware) so streaming responses are not
+    # buffered and the per-request cost is a context variable plus one locked update.
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        slow_ms = settings.SLOW_REQUEST_MS
+        stats = RequestStats(log=[] if slow_ms > 0 else None)
+        token = current_request.set(stats)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            seconds = time.perf_counter() - started
+            current_request.reset(token)
+            route = scope.get("route")
+            path = getattr(route, "path", UNMATCHED_ROUTE)
+            registry.record(scope["method"], path, status, seconds, stats)
+            if slow_ms > 0 and seconds * 1000 >= slow_ms:
+                log_slow_request(scope["method"], path, status, seconds, stats)
+
+def log_slow_request(method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+    logger.warning("Slow request %s", json.dumps({
+        "method": method,
+        "route": route,
+        "status": status,
+        "ms": round(seconds * 1000, 3),
+        "db_ms": round(stats.db_seconds * 1000, 3),
+        "statements": stats.statements,
+        "rows": stats.rows,
+        "phases_ms": {k: round(v * 1000, 3) for k, v in stats.phases.items()},
+        "sql": [{"ms": ms, "statement": sql} for sql, ms in stats.log or []],
+    }))
@@ -0,0 +1,67 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import tuple_
+from sqlalchemy.orm import InstrumentedAttribute, Query as OrmQuery
+
+from app.core.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+class PageParams:
+    def __init__(
+        self,
+        limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+        cursor: str | None = Query(None, description=f"Opaque value from the {NEXT_CURSOR_HEADER} header"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+
+def _encode_value(v):
+    return v.isoformat() if isinstance(v, datetime) else v
+
+def _decode_value(v, column: InstrumentedAttribute):
+    if v is None:
+        return None
+    if column.type.python_type is datetime:
+        return datetime.fromisoformat(v)
+    return column.type.python_type(v)
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, columns: list[InstrumentedAttribute]) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor shape")
+        return [_decode_value(v, c) for v, c in zip(values, columns)]
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def keyset_page(
+    query: OrmQuery,
+    columns: list[InstrumentedAttribute],
+    page: PageParams,
+    response: Response,
+    descending: bool = False,
+) -> list:
+    # `columns` is the full sort key and must end in a unique column (normally id)
+    # so that the row-value comparison below resumes exactly after the last row.
+    if page.cursor:
+        key = tuple_(*columns)
+        after = decode_cursor(page.cursor, columns)
+        query = query.filter(key < tuple(after) if descending else key > tuple(after))
+
+    order = [c.desc() if descending else c.asc() for c in columns]
+    rows = query.order_by(*order).limit(page.limit + 1).all()
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(last, c.key) for c in columns])
+    return rows
@@ -1,15 +1,41 @@
+from dataclasses import dataclass
+
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from jose import JWTError
 
-from app.db.session import get_db
+from app.db.session import SessionLocal, get_async_db, get_db
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import span
 from app.core.security import decode_token
-from app.models.user import User
+from app.models.user import Role, User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    email: str
+    permissions: frozenset[str]
+
+# Keyed by token subject (email). Entries are dropped when role assignments or
+# role permissions change; the TTL bounds staleness across worker processes.
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+def invalidate_principal(email: str) -> None:
+    principal_cache.pop(email)
+
+def invalidate_all_principals() -> None:
+    principal_cache.clear()
+
+def get_token_subject(token: str) -> str:
     try:
         payload = decode_token(token)
         email = payload.get("sub")
@@ -17,27 +43,83 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_
             raise HTTPException(status_code=401, detail="Invalid token")
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    return email
 
-    user = db.query(User).filter(User.email == email).first()
+def load_principal(db: Session, email: str) -> Principal | None:
+    # Three statements (user, roles, permissions) however many roles the user has
+    user = (
+        db.query(User)
+        .options(selectinload(User.roles).selectinload(Role.permissions))
+        .filter(User.email == email)
+        .first()
+    )
     if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-    return user
+        return None
+    return Principal(id=user.id, email=user.email, permissions=frozenset(get_user_permission_codes(user)))
+
+def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> Principal:
+    with span("auth"):
+        email = get_token_subject(token)
+
+        principal = principal_cache.get(email)
+        if principal is None:
+            principal = load_principal(db, email)
+            if not principal:
+                raise HTTPException(status_code=401, detail="User not found")
+            principal_cache.set(email, principal)
+    return principal
+
+async def get_current_user_async(db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)) -> Principal:
+    # Installed as a dependency override for get_current_user when DB_ASYNC is on
+    with span("auth"):
+        email = get_token_subject(token)
+
+        principal = principal_cache.get(email)
+        if principal is None:
+            principal = await db.run_sync(load_principal, email)
+            if not principal:
+                raise HTTPException(status_code=401, detail="User not found")
+            principal_cache.set(email, principal)
+    return principal
+
+def _load_principal_detached(email: str) -> Principal | None:
+    with SessionLocal() as db:
+        return load_principal(db, email)
+
+async def get_streaming_user(token: str = Depends(oauth2_scheme)) -> Principal:
+    # For long-lived responses (event streams): a cache miss is loaded in a session that
+    # is closed straight away, instead of a request-scoped one that would keep its
+    # connection checked out until the stream ends
+    with span("auth"):
+        email = get_token_subject(token)
+
+        principal = principal_cache.get(email)
+        if principal is None:
+            principal = await run_in_threadpool(_load_principal_detached, email)
+            if not principal:
+                raise HTTPException(status_code=401, detail="User not found")
+            principal_cache.set(email, principal)
+    return principal
 
 def get_user_permission_codes(user: User) -> set[str]:
+    # Load roles -> permissions eagerly (see load_principal) or this issues a query per role
     codes: set[str] = set()
     for role in user.roles:
         for perm in role.permissions:
             codes.add(perm.code)
     return codes
 
+def check_permissions(user: Principal, *required: str) -> Principal:
+    missing = [r for r in required if r not in user.permissions]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Missing permissions: {', '.join(missing)}",
+        )
+    return user
+
 def require_permissions(*required: str):
-    def _dep(user: User = Depends(get_current_user)) -> User:
-        user_codes = get_user_permission_codes(user)
-        missing = [r for r in required if r not in user_codes]
-        if missing:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Missing permissions: {', '.join(missing)}",
-            )
-        return user
+    # async so the check runs on the event loop instead of taking a threadpool slot
+    async def _dep(user: Principal = Depends(get_current_user)) -> Principal:
+        return check_permissions(user, *required)
     return _dep
@@ -0,0 +1,283 @@
+import csv
+import hashlib
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from io import StringIO
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.versions import load_versions
+from app.db.session import read_connection
+from app.models.access import AccessRequest
+from app.models.compliance import Control, ControlMapping, Framework
+from app.models.risk import Risk
+
+logger = logging.getLogger(__name__)
+
+def _cell(v):
+    if isinstance(v, datetime):
+        return v.isoformat()
+    return "" if v is None else v
+
+def iter_csv(fieldnames: list[str], rows: Iterable[tuple]) -> Iterator[str]:
+    buf = StringIO()
+    writer = csv.writer(buf)
+    empty = True
+    for row in rows:
+        if empty:
+            writer.writerow(fieldnames)
+            empty = False
+        writer.writerow([_cell(v) for v in row])
+        if buf.tell() >= settings.EXPORT_CHUNK_BYTES:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    if empty:
+        writer.writerow(["no_data"])
+    yield buf.getvalue()
+
+def stream_rows(db, stmt) -> Iterator[tuple]:
+    # yield_per turns on server-side cursors where the driver supports them (psycopg2),
+    # so only one batch of rows is held in memory at a time. db is a Session or Connection.
+    result = db.execute(stmt.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+    try:
+        yield from result
+    finally:
+        result.close()
+
+def stream_batches(db, stmt) -> Iterator[list[tuple]]:
+    # Same as stream_rows, one fetch batch (EXPORT_BATCH_SIZE rows) at a time
+    result = db.execute(stmt.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+    try:
+        yield from result.partitions()
+    finally:
+        result.close()
+
+def read_batches(stmt, primary: bool = False) -> Iterator[list[tuple]]:
+    # For streamed responses: the read connection is opened when streaming starts and
+    # held until the last batch, not for the lifetime of the request
+    with read_connection(primary) as conn:
+        yield from stream_batches(conn, stmt)
+
+@dataclass(frozen=True)
+class Report:
+    name: str
+    fieldnames: list[str]
+    query: Callable[[], object]
+    # Tables the query reads; their change versions identify the data a snapshot holds
+    models: tuple
+
+    @property
+    def filename(self) -> str:
+        return self.name.replace("-", "_") + ".csv"
+
+def _access_reviews():
+    return select(
+        AccessRequest.id,
+        AccessRequest.resource,
+        AccessRequest.requested_role,
+        AccessRequest.status,
+        AccessRequest.requested_by_id,
+        AccessRequest.approved_by_id,
+        AccessRequest.created_at,
+        AccessRequest.decided_at,
+    ).order_by(AccessRequest.created_at.desc())
+
+def _risk_summary():
+    return select(
+        Risk.id,
+        Risk.title,
+        Risk.likelihood,
+        Risk.impact,
+        Risk.score,
+        Risk.owner_id,
+        Risk.updated_at,
+    ).order_by(Risk.score.desc(), Risk.updated_at.desc())
+
+def _compliance_gap():
+    return (
+        select(Framework.name, Control.name, ControlMapping.status, ControlMapping.notes)
+        .select_from(ControlMapping)
+        .join(Control, Control.id == ControlMapping.control_id)
+        .join(Framework, Framework.id == ControlMapping.framework_id)
+        .order_by(Framework.name.asc(), Control.name.asc())
+    )
+
+REPORTS = {
+    r.name: r
+    for r in (
+        Report("access-reviews", ["id", "resource", "requested_role", "status", "requested_by_id", "approved_by_id", "created_at", "decided_at"],
+               _access_reviews, (AccessRequest,)),
+        Report("risk-summary", ["id", "title", "likelihood", "impact", "score", "owner_id", "updated_at"], _risk_summary, (Risk,)),
+        Report("compliance-gap", ["framework", "control", "status", "notes"], _compliance_gap, (ControlMapping, Control, Framework)),
+    )
+}
+
+# Snapshots are immutable files <REPORT_SNAPSHOT_DIR>/<report>/<created>-<data key>.csv.
+# The id (file stem) sorts by creation time; the data key is a digest of the change
+# versions of the report's tables, so an unchanged key means no API write since.
+_SNAPSHOT_ID = re.compile(r"^(\d{8}T\d{6}\d{6}Z)-([0-9a-f]{12})$")
+
+@dataclass(frozen=True)
+class Snapshot:
+    report: str
+    id: str
+    path: Path
+    created_at: datetime
+    data_key: str
+    size: int
+
+def _report_dir(name: str) -> Path:
+    return Path(settings.REPORT_SNAPSHOT_DIR) / name
+
+def _as_snapshot(name: str, path: Path) -> Snapshot | None:
+    m = _SNAPSHOT_ID.match(path.stem)
+    if m is None or path.suffix != ".csv":
+        return None
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:  # pruned meanwhile
+        return None
+    return Snapshot(name, path.stem, path, datetime.strptime(m.group(1), "%Y%m%dT%H%M%S%fZ"), m.group(2), size)
+
+def list_snapshots(name: str) -> list[Snapshot]:
+    # Newest first
+    root = _report_dir(name)
+    if not root.is_dir():
+        return []
+    found = (_as_snapshot(name, p) for p in root.iterdir())
+    return sorted((s for s in found if s is not None), key=lambda s: s.id, reverse=True)
+
+def latest_snapshot(name: str) -> Snapshot | None:
+    snapshots = list_snapshots(name)
+    return snapshots[0] if snapshots else None
+
+def get_snapshot(name: str, snapshot_id: str) -> Snapshot | None:
+    if not _SNAPSHOT_ID.match(snapshot_id):  # also keeps ids from naming other paths
+        return None
+    return _as_snapshot(name, _report_dir(name) / f"{snapshot_id}.csv")
+
+def _data_key(report: Report, versions: dict[str, int]) -> str:
+    key = "|".join(f"{m.__tablename__}:{versions.get(m.__tablename__, 0)}" for m in sorted(report.models, key=lambda m: m.__tablename__))
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+# One writer per report within a process; requests that find no snapshot wait for it
+_write_locks = {name: threading.Lock() for name in REPORTS}
+
+def write_snapshot(name: str) -> Snapshot:
+    # Exports the report from the read side into a temporary file and renames it into
+    # place, so readers only ever see complete snapshots. Versions are read before the
+    # rows, so the key is never newer than the data in the file.
+    report = REPORTS[name]
+    root = _report_dir(name)
+    root.mkdir(parents=True, exist_ok=True)
+    created = datetime.utcnow()
+    with read_connection() as conn:
+        key = _data_key(report, load_versions(conn))
+        snapshot_id = f"{created:%Y%m%dT%H%M%S%fZ}-{key}"
+        tmp = root / f".{snapshot_id}.tmp"
+        try:
+            with open(tmp, "w", newline="", encoding="utf-8") as f:
+                for chunk in iter_csv(report.fieldnames, stream_rows(conn, report.query())):
+                    f.write(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+            path = root / f"{snapshot_id}.csv"
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+    return _as_snapshot(name, path)
+
+def _is_current(report: Report, snapshot: Snapshot | None, versions: dict[str, int]) -> bool:
+    return (
+        snapshot is not None
+        and snapshot.data_key == _data_key(report, versions)
+        and datetime.utcnow() - snapshot.created_at < timedelta(hours=settings.REPORT_SNAPSHOT_MAX_AGE_HOURS)
+    )
+
+def ensure_snapshot(name: str) -> Snapshot:
+    # Latest snapshot, rewritten first when the report's tables changed since it was taken
+    # or it is older than REPORT_SNAPSHOT_MAX_AGE_HOURS (retention is applied after each
+    # write). One versions query per call.
+    report = REPORTS[name]
+    versions = load_versions()
+    snapshot = latest_snapshot(name)
+    if _is_current(report, snapshot, versions):
+        return snapshot
+    with _write_locks[name]:
+        snapshot = latest_snapshot(name)  # another request may have written it meanwhile
+        if _is_current(report, snapshot, versions):
+            return snapshot
+        snapshot = write_snapshot(name)
+        prune_snapshots(name)
+        return snapshot
+
+def prune_snapshots(name: str, now: datetime | None = None) -> int:
+    # Keeps snapshots younger than REPORT_SNAPSHOT_RETENTION_DAYS, at most
+    # REPORT_SNAPSHOT_RETENTION_MAX of them, and always the latest one
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(days=settings.REPORT_SNAPSHOT_RETENTION_DAYS)
+    removed = 0
+    for i, s in enumerate(list_snapshots(name)):
+        if i == 0 or (i < settings.REPORT_SNAPSHOT_RETENTION_MAX and s.created_at >= cutoff):
+            continue
+        s.path.unlink(missing_ok=True)
+        removed += 1
+    return removed
+
+def refresh_snapshots(names: Iterable[str] | None = None, force: bool = False) -> dict:
+    # Writes a new snapshot of each report whose tables changed since its latest one, or
+    # whose latest one is older than REPORT_SNAPSHOT_MAX_AGE_HOURS, then applies retention
+    names = list(names or REPORTS)
+    versions = load_versions()
+    written, unchanged, pruned = [], [], 0
+    for name in names:
+        with _write_locks[name]:
+            if force or not _is_current(REPORTS[name], latest_snapshot(name), versions):
+                written.append(f"{name}/{write_snapshot(name).id}")
+            else:
+                unchanged.append(name)
+            pruned += prune_snapshots(name)
+    return {"written": written, "unchanged": unchanged, "pruned": pruned}
+
+class SnapshotRefresher:
+    # Optional in-process schedule (REPORT_SNAPSHOT_INTERVAL_SECONDS > 0). Checks are one
+    # versions query, so a short interval picks up data changes quickly; run it in one
+    # worker, or use `python -m app.cli snapshot-reports` from cron instead.
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="report-snapshots", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 30.0) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                result = refresh_snapshots()
+                if result["written"]:
+                    logger.info("Report snapshots written: %s", ", ".join(result["written"]))
+            except Exception:
+                logger.exception("Report snapshot refresh failed")
+            self._stop.wait(self.interval)
+
+snapshot_refresher = SnapshotRefresher(settings.REPORT_SNAPSHOT_INTERVAL_SECONDS)
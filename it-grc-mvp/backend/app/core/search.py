@@ -0,0 +1,185 @@
+import re
+from dataclasses import dataclass
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import DateTime, bindparam, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.schemas.search import SearchHit
+
+@dataclass(frozen=True)
+class SearchSource:
+    type: str
+    table: str
+    permission: str
+    # (column, weight): Postgres setweight labels A-D; SQLite bm25 column weights
+    columns: list[tuple[str, str]]
+    title: str          # SQL expression over the base table (alias t)
+    created: str | None  # timestamp column the date filters apply to
+    stemmed: bool       # english stemming (Postgres 'english' / FTS5 porter) vs plain tokens
+
+SOURCES = [
+    SearchSource(
+        type="risk", table="risks", permission="risk:read",
+        columns=[("title", "A"), ("description", "B"), ("mitigation_plan", "C")],
+        title="t.title", created="t.updated_at", stemmed=True,
+    ),
+    SearchSource(
+        type="control", table="controls", permission="compliance:read",
+        columns=[("name", "A"), ("description", "B")],
+        title="t.name", created=None, stemmed=True,
+    ),
+    SearchSource(
+        # key=value details such as "resource=payroll" are indexed as plain tokens
+        type="audit", table="audit_logs", permission="audit:read",
+        columns=[("action", "A"), ("entity_type", "B"), ("entity_id", "B"), ("details", "C")],
+        title="t.action || ' ' || t.entity_type || ' ' || t.entity_id", created="t.created_at", stemmed=False,
+    ),
+]
+
+BM25_WEIGHTS = {"A": "10.0", "B": "4.0", "C": "2.0", "D": "1.0"}
+
+def _pg_config(source: SearchSource) -> str:
+    return "english" if source.stemmed else "simple"
+
+def _pg_vector(source: SearchSource) -> str:
+    cfg = _pg_config(source)
+    return " || ".join(
+        f"setweight(to_tsvector('{cfg}', coalesce({col}, '')), '{weight}')" for col, weight in source.columns
+    )
+
+def install_search(conn: Connection) -> None:
+    # Full-text indexes, kept current by the database on every write (bulk imports, the
+    # audit writer and the retention job included):
+    #   Postgres: a stored generated tsvector column + GIN index per table.
+    #   SQLite:   an external-content FTS5 table per table, synced by triggers.
+    # Idempotent; run by the bootstrap. On Postgres the first run rewrites each table to
+    # fill the column, so schedule it like any other migration on large audit tables.
+    dialect = conn.dialect.name
+    for s in SOURCES:
+        cols = [c for c, _ in s.columns]
+        if dialect == "postgresql":
+            conn.execute(text(
+                f"ALTER TABLE {s.table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+                f"GENERATED ALWAYS AS ({_pg_vector(s)}) STORED"
+            ))
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{s.table}_search ON {s.table} USING GIN (search_vector)"))
+        elif dialect == "sqlite":
+            fts = f"{s.table}_fts"
+            exists = conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = :n"), {"n": fts}).first()
+            tokenize = "porter unicode61" if s.stemmed else "unicode61"
+            conn.execute(text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({', '.join(cols)}, "
+                f"content='{s.table}', content_rowid='id', tokenize='{tokenize}')"
+            ))
+            new_vals = ", ".join(f"new.{c}" for c in cols)
+            old_vals = ", ".join(f"old.{c}" for c in cols)
+            insert_new = f"INSERT INTO {fts}(rowid, {', '.join(cols)}) VALUES (new.id, {new_vals});"
+            delete_old = f"INSERT INTO {fts}({fts}, rowid, {', '.join(cols)}) VALUES ('delete', old.id, {old_vals});"
+            conn.execute(text(f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {s.table} BEGIN {insert_new} END"))
+            conn.execute(text(f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {s.table} BEGIN {delete_old} END"))
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {', '.join(cols)} ON {s.table} "
+                f"BEGIN {delete_old} {insert_new} END"
+            ))
+            if not exists:
+                conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+def fts5_query(q: str) -> str:
+    # Each word becomes a quoted FTS5 term (implicit AND), so user input cannot use or
+    # break FTS5 query syntax; a trailing * keeps prefix search
+    terms = []
+    for word, star in re.findall(r"(\w+)(\*?)", q):
+        terms.append(f'"{word}"' + star)
+    return " ".join(terms)
+
+def _filters(source: SearchSource, params: dict) -> str:
+    clauses = []
+    if source.created and params.get("created_from") is not None:
+        clauses.append(f"{source.created} >= :created_from")
+    if source.created and params.get("created_to") is not None:
+        clauses.append(f"{source.created} < :created_to")
+    return "".join(f" AND {c}" for c in clauses)
+
+# Ranking scores every match, which is what makes a very common term slow on millions of
+# rows. Only the newest :candidates matches per source that also pass the date filters
+# are ranked: the id of the oldest of them becomes a lower bound that the index applies
+# before scoring.
+
+def _pg_stmt(source: SearchSource, params: dict) -> str:
+    cfg = _pg_config(source)
+    document = " || ' ' || ".join(f"coalesce(t.{c}, '')" for c, _ in source.columns)
+    floor = (
+        f"(SELECT coalesce(min(id), 0) FROM (SELECT t.id FROM {source.table} t "
+        f"WHERE t.search_vector @@ websearch_to_tsquery('{cfg}', :q){_filters(source, params)} "
+        f"ORDER BY t.id DESC LIMIT :candidates) c)"
+    )
+    return (
+        f"SELECT t.id, {source.title} AS title, "
+        f"ts_headline('{cfg}', {document}, query, 'MaxFragments=1, MaxWords=20, MinWords=5, StartSel=[, StopSel=]') AS snippet, "
+        f"ts_rank_cd(t.search_vector, query) AS score "
+        f"FROM {source.table} t, websearch_to_tsquery('{cfg}', :q) query "
+        f"WHERE t.search_vector @@ query AND t.id >= {floor}{_filters(source, params)} "
+        f"ORDER BY score DESC, t.id DESC LIMIT :limit"
+    )
+
+def _sqlite_stmt(source: SearchSource, params: dict) -> str:
+    fts = f"{source.table}_fts"
+    weights = ", ".join(BM25_WEIGHTS[w] for _, w in source.columns)
+    # The base table is joined only when there are date filters to apply
+    join = f" JOIN {source.table} t ON t.id = {fts}.rowid" if _filters(source, params) else ""
+    floor = (
+        f"(SELECT coalesce(min(rowid), 0) FROM (SELECT {fts}.rowid AS rowid FROM {fts}{join} "
+        f"WHERE {fts} MATCH :q{_filters(source, params)} ORDER BY {fts}.rowid DESC LIMIT :candidates))"
+    )
+    # bm25() is lower-is-better; negate so higher scores rank first like ts_rank_cd
+    return (
+        f"SELECT t.id, {source.title} AS title, "
+        f"snippet({fts}, -1, '[', ']', '…', 12) AS snippet, "
+        f"-bm25({fts}, {weights}) AS score "
+        f"FROM {fts} JOIN {source.table} t ON t.id = {fts}.rowid "
+        f"WHERE {fts} MATCH :q AND {fts}.rowid >= {floor}{_filters(source, params)} "
+        f"ORDER BY bm25({fts}, {weights}), t.id DESC LIMIT :limit"
+    )
+
+def search(
+    db: Session,
+    q: str,
+    sources: list[SearchSource],
+    limit: int,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> list[SearchHit]:
+    # Top `limit` hits per source from the index, merged by score. Scores are comparable
+    # within a source; across sources they are only a rough ordering. Date filters apply
+    # to the candidate window too, so searching a past period still finds its matches.
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        build, query = _pg_stmt, q
+    elif dialect == "sqlite":
+        build, query = _sqlite_stmt, fts5_query(q)
+    else:
+        raise HTTPException(status_code=501, detail=f"Search is not supported on {dialect}")
+    if not query.strip():
+        return []
+
+    params = {
+        "q": query,
+        "limit": limit,
+        "candidates": settings.SEARCH_MAX_CANDIDATES,
+        "created_from": created_from,
+        "created_to": created_to,
+    }
+    hits = []
+    for source in sources:
+        stmt = text(build(source, params))
+        for name in ("created_from", "created_to"):
+            if f":{name}" in stmt.text:
+                stmt = stmt.bindparams(bindparam(name, type_=DateTime()))
+        for row in db.execute(stmt, params):
+            hits.append(SearchHit(type=source.type, id=row.id, title=row.title, snippet=row.snippet or "", score=round(float(row.score), 6)))
+    hits.sort(key=lambda h: h.score, reverse=True)
+    return hits[:limit]
@@ -3,8 +3,14 @@ from jose import jwt, JWTError
 from passlib.context import CryptContext
 from app.core.config import settings
 
-# Use PBKDF2 to avoid bcrypt backend issues on some Windows/Python builds
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+# Use PBKDF2 to avoid bcrypt backend issues on some Windows/Python builds.
+# Hashes below PASSWORD_HASH_ROUNDS report needs_update() and are re-hashed on login.
+pwd_context = CryptContext(
+    schemes=["pbkdf2_sha256"],
+    deprecated="auto",
+    pbkdf2_sha256__default_rounds=settings.PASSWORD_HASH_ROUNDS,
+    pbkdf2_sha256__min_rounds=settings.PASSWORD_HASH_ROUNDS,
+)
 
 def hash_password(pw: str) -> str:
     return pwd_context.hash(pw)
@@ -12,6 +18,14 @@ def hash_password(pw: str) -> str:
 def verify_password(pw: str, pw_hash: str) -> bool:
     return pwd_context.verify(pw, pw_hash)
 
+def verify_and_upgrade(pw: str, pw_hash: str) -> tuple[bool, str | None]:
+    # (valid, replacement hash if the stored one is below the current work factor)
+    if not pwd_context.verify(pw, pw_hash):
+        return False, None
+    if pwd_context.needs_update(pw_hash):
+        return True, pwd_context.hash(pw)
+    return True, None
+
 def create_access_token(subject: str, minutes: int | None = None) -> str:
     exp_minutes = minutes or settings.ACCESS_TOKEN_MINUTES
     now = datetime.now(timezone.utc)
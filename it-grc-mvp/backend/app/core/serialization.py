@@ -0,0 +1,37 @@
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+from sqlalchemy.orm import Query as OrmQuery, Session
+
+from app.core.config import settings
+
+# Set on the injected Response by FastAPI or Starlette, not by handlers/dependencies
+_OWN_HEADERS = {b"content-length", b"content-type"}
+
+def row_columns(schema: type[BaseModel], model) -> list:
+    # The model columns behind each field of an *Out schema, in field order
+    return [getattr(model, name) for name in schema.model_fields]
+
+def list_query(db: Session, schema: type[BaseModel], model) -> OrmQuery:
+    # Fast path: plain column tuples, no identity map or attribute instrumentation.
+    # Otherwise entities, validated by the route's response_model as before.
+    if settings.FAST_LIST_JSON:
+        return db.query(*row_columns(schema, model))
+    return db.query(model)
+
+def rows_response(schema: type[BaseModel], rows: list, response: Response):
+    # Encodes rows (tuples from list_query, or dicts keyed by the schema's fields) with
+    # orjson. The values come straight from columns typed like the schema, so
+    # response_model validation would only repeat what the database already guarantees.
+    # The route keeps its response_model, so the OpenAPI schema does not change; the
+    # returned Response replaces the injected one, so its headers (ETag, X-Next-Cursor)
+    # are carried over.
+    if not settings.FAST_LIST_JSON:
+        return rows
+    if rows and not isinstance(rows[0], dict):
+        names = list(schema.model_fields)
+        rows = [dict(zip(names, row)) for row in rows]
+    # OPT_UTC_Z: aware UTC datetimes as "...Z", like pydantic
+    out = Response(orjson.dumps(rows, option=orjson.OPT_UTC_Z), media_type="application/json")
+    out.raw_headers.extend((k, v) for k, v in response.raw_headers if k not in _OWN_HEADERS)
+    return out
@@ -0,0 +1,99 @@
+import hashlib
+
+from fastapi import HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.core.bulk import upsert
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.session import on_commit, read_connection, read_engines, reads_from_primary
+from app.models.meta import ChangeVersion
+
+# All table versions as one dict. Local commits clear it; the TTL bounds how long
+# other worker processes keep answering 304 after a write they did not see.
+version_cache = TTLCache(maxsize=1, ttl=settings.ETAG_VERSION_TTL_SECONDS)
+
+def mark_changed(db: Session, *models) -> None:
+    # Bump the change version of each model's table when this transaction commits
+    db.info.setdefault("changed_tables", set()).update(m.__tablename__ for m in models)
+
+@event.listens_for(Session, "before_commit")
+def _bump_versions(session: Session) -> None:
+    # Issued last, right before COMMIT, so the version row lock is held only briefly
+    tables = session.info.pop("changed_tables", None)
+    if not tables:
+        return
+    for table in sorted(tables):  # fixed order: concurrent writers cannot deadlock
+        stmt = upsert(session, ChangeVersion).values(table_name=table, version=1)
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=["table_name"], set_={"version": ChangeVersion.version + 1},
+        ))
+    on_commit(session, version_cache.clear)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_changed(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop("changed_tables", None)
+
+def load_versions(db: Session | None = None, primary: bool = False) -> dict[str, int]:
+    # Without a session, from the read side: a version is then never newer than the
+    # replica data the endpoint goes on to read
+    stmt = select(ChangeVersion.table_name, ChangeVersion.version)
+    if db is not None:
+        return dict(db.execute(stmt).all())
+    with read_connection(primary) as conn:
+        return dict(conn.execute(stmt).all())
+
+def _shareable(db: Session | None) -> bool:
+    # With replicas, versions read on the primary can be ahead of the data other clients
+    # read, so only read-side versions go into the shared cache
+    if db is None or not read_engines.replicas:
+        return True
+    return bool(db.info.get("read_only")) and not db.info.get("read_primary")
+
+def table_versions(db: Session | None = None) -> dict[str, int]:
+    # Read through the caller's session when it has one (works under async run_sync too).
+    # Sessions pinned to the primary by read-your-writes skip the cache.
+    if db is not None and db.info.get("read_primary"):
+        return load_versions(db)
+    versions = version_cache.get("all")
+    if versions is None:
+        versions = load_versions(db)
+        if _shareable(db):
+            version_cache.set("all", versions)
+    return versions
+
+async def current_versions(primary: bool = False) -> dict[str, int]:
+    if primary:  # read-your-writes: uncached, and not cached for other clients either
+        return await run_in_threadpool(load_versions, None, True)
+    versions = version_cache.get("all")
+    if versions is None:
+        versions = await run_in_threadpool(table_versions)
+    return versions
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison (RFC 9110 13.1.2): ignore the W/ prefix on either side
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+def conditional_get(*models):
+    # Dependency for list endpoints: the ETag covers the versions of the tables the
+    # endpoint reads plus the full query string (filters, limit, cursor). A matching
+    # If-None-Match is answered with 304 before the handler (and its query) runs.
+    # Declare it after the permission dependency so unauthorised callers still get 401/403.
+    tables = sorted(m.__tablename__ for m in models)
+
+    async def _dep(request: Request, response: Response) -> None:
+        versions = await current_versions(primary=reads_from_primary(request))
+        key = "|".join([f"{t}:{versions.get(t, 0)}" for t in tables] + [request.url.path, request.url.query])
+        etag = f'W/"{hashlib.sha1(key.encode()).hexdigest()[:20]}"'
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+    return _dep
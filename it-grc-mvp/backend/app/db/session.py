@@ -1,13 +1,264 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import hashlib
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from math import ceil
+from typing import Callable
+
+from fastapi import Depends, Request, Response
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from app.core.cache import TTLCache
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+logger = logging.getLogger(__name__)
+
+def pool_options(url: str, prefix: str) -> dict:
+    # Engine kwargs from the <prefix>_POOL_* / <prefix>_CONNECT_TIMEOUT_SECONDS settings
+    u = make_url(url)
+    options = {"pool_pre_ping": True}
+    if u.get_backend_name() == "sqlite" and u.database in (None, "", ":memory:"):
+        return options  # single-connection pools take no size options
+    options.update(
+        pool_size=getattr(settings, f"{prefix}_POOL_SIZE"),
+        max_overflow=getattr(settings, f"{prefix}_MAX_OVERFLOW"),
+        pool_recycle=getattr(settings, f"{prefix}_POOL_RECYCLE_SECONDS"),
+        pool_timeout=getattr(settings, f"{prefix}_POOL_TIMEOUT_SECONDS"),
+    )
+    connect_timeout = getattr(settings, f"{prefix}_CONNECT_TIMEOUT_SECONDS")
+    if u.get_backend_name() == "postgresql" and connect_timeout:
+        key = "timeout" if u.get_driver_name() == "asyncpg" else "connect_timeout"
+        options["connect_args"] = {key: connect_timeout}
+    return options
+
+def replica_urls() -> list[str]:
+    return [u.strip() for u in settings.DATABASE_REPLICA_URLS.split(",") if u.strip()]
+
+class ReadEngines:
+    # Read-side engines, tried round-robin. One that fails to connect is skipped for
+    # REPLICA_RETRY_SECONDS; when none is left, reads go to the primary.
+    def __init__(self, engines: list, replicas: bool):
+        self.engines = engines
+        self.replicas = replicas  # False: a separate pool on the primary itself
+        self._turn = itertools.count()
+        self._down_until: dict = {}
+
+    def candidates(self) -> list:
+        now = time.monotonic()
+        n = len(self.engines)
+        start = next(self._turn) % n if n else 0
+        ordered = [self.engines[(start + i) % n] for i in range(n)]
+        return [e for e in ordered if self._down_until.get(e, 0.0) <= now]
+
+    def mark_down(self, bind) -> None:
+        self._down_until[bind] = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+        logger.warning(
+            "Read engine %s is unavailable, skipping it for %ss",
+            bind.url.render_as_string(hide_password=True), settings.REPLICA_RETRY_SECONDS,
+        )
+
+engine = create_engine(settings.DATABASE_URL, **pool_options(settings.DATABASE_URL, "DB"))
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+read_engines = ReadEngines(
+    [create_engine(u, **pool_options(u, "READ_DB")) for u in replica_urls() or [settings.DATABASE_URL]],
+    replicas=bool(replica_urls()),
+)
+
+# Read-your-writes: after a mutation the client's reads go to the primary for
+# READ_YOUR_WRITES_SECONDS, so it never reads a replica that has not replayed its write
+# yet. The window travels in a cookie (any worker honours it) and is also kept per
+# Authorization header in this worker, for API clients that drop cookies.
+READ_PRIMARY_COOKIE = "grc_read_primary_until"
+recent_writers = TTLCache(maxsize=10000, ttl=settings.READ_YOUR_WRITES_SECONDS)
+
+def _client_key(request: Request) -> str | None:
+    auth = request.headers.get("authorization")
+    return hashlib.sha256(auth.encode()).hexdigest() if auth else None
+
+def mark_write(request: Request, response: Response) -> None:
+    window = settings.READ_YOUR_WRITES_SECONDS
+    if not read_engines.replicas or window <= 0:
+        return
+    until = time.time() + window
+    key = _client_key(request)
+    if key:
+        recent_writers.set(key, until)
+    response.set_cookie(READ_PRIMARY_COOKIE, f"{until:.3f}", max_age=ceil(window), httponly=True, samesite="lax")
+
+def reads_from_primary(request: Request | None) -> bool:
+    if request is None or not read_engines.replicas or settings.READ_YOUR_WRITES_SECONDS <= 0:
+        return False
+    key = _client_key(request)
+    if key and recent_writers.get(key) is not None:
+        return True
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
 def get_db():
+    # Read-write session on the primary
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+def open_read_session(request: Request | None = None) -> Session:
+    # Connects eagerly so an unreachable replica falls back here instead of failing the request
+    pinned = reads_from_primary(request)
+    for bind in [] if pinned else read_engines.candidates():
+        db = SessionLocal(bind=bind)
+        try:
+            db.connection()
+        except DBAPIError:
+            db.close()
+            read_engines.mark_down(bind)
+            continue
+        db.info["read_only"] = True
+        return db
+    db = SessionLocal()
+    db.info.update(read_only=True, read_primary=pinned)
+    return db
+
+def get_read_db(request: Request):
+    # Read-only session for list, dashboard and report endpoints: a replica (or the
+    # read pool) unless the client is inside its read-your-writes window
+    db = open_read_session(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+@contextmanager
+def read_connection(primary: bool = False):
+    # Short-lived read-side connection outside any request session
+    for bind in [] if primary else read_engines.candidates():
+        try:
+            conn = bind.connect()
+        except DBAPIError:
+            read_engines.mark_down(bind)
+            continue
+        break
+    else:
+        conn = engine.connect()
+    with conn:
+        yield conn
+
+@event.listens_for(Session, "before_flush")
+def _refuse_read_only_flush(session: Session, flush_context, instances) -> None:
+    if session.info.get("read_only") and (session.new or session.dirty or session.deleted):
+        raise RuntimeError("Write through a read-only session; mutating endpoints use get_uow")
+
+def get_uow(request: Request, response: Response, db: Session = Depends(get_db)):
+    # Unit of work for mutating endpoints: the handler only flushes, and everything
+    # it staged (entity changes + audit rows) is committed in one transaction once it
+    # returns. Declare with Depends(get_uow, scope="function") so the commit happens
+    # before the response is sent. Loaded state stays valid after commit, so handlers
+    # can return ORM objects without a refresh() round trip.
+    db.expire_on_commit = False
+    # Set up front: headers set after the handler returns are not sent
+    mark_write(request, response)
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+def async_database_url(url: str) -> str:
+    u = make_url(url)
+    driver = ASYNC_DRIVERS.get(u.get_backend_name())
+    if not driver:
+        raise ValueError(f"No async driver configured for {u.get_backend_name()}")
+    return u.set(drivername=f"{u.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+# Created on first use so sync deployments don't need the async drivers installed
+_async_engine: AsyncEngine | None = None
+_async_sessionmaker: async_sessionmaker[AsyncSession] | None = None
+_async_read_engines: ReadEngines | None = None
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine, _async_sessionmaker
+    if _async_engine is None:
+        url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+        _async_engine = create_async_engine(url, **pool_options(url, "DB"))
+        _async_sessionmaker = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+def get_async_read_engines() -> ReadEngines:
+    global _async_read_engines
+    if _async_read_engines is None:
+        urls = [async_database_url(u) for u in replica_urls()]
+        urls = urls or [settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)]
+        _async_read_engines = ReadEngines([create_async_engine(u, **pool_options(u, "READ_DB")) for u in urls], replicas=bool(replica_urls()))
+    return _async_read_engines
+
+async def dispose_async_engine() -> None:
+    global _async_engine, _async_sessionmaker, _async_read_engines
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = _async_sessionmaker = None
+    if _async_read_engines is not None:
+        for e in _async_read_engines.engines:
+            await e.dispose()
+        _async_read_engines = None
+
+async def get_async_db():
+    get_async_engine()
+    async with _async_sessionmaker() as db:
+        yield db
+
+async def get_async_read_db(request: Request):
+    # Async counterpart of get_read_db
+    engines = get_async_read_engines()
+    pinned = reads_from_primary(request)
+    db = None
+    for bind in [] if pinned else engines.candidates():
+        candidate = AsyncSession(bind=bind, autoflush=False, expire_on_commit=False)
+        try:
+            await candidate.connection()
+        except (DBAPIError, OSError):
+            await candidate.close()
+            engines.mark_down(bind)
+            continue
+        db = candidate
+        break
+    if db is None:
+        get_async_engine()
+        db = _async_sessionmaker()
+    db.sync_session.info.update(read_only=True, read_primary=pinned)
+    try:
+        yield db
+    finally:
+        await db.close()
+
+async def get_async_uow(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    # Async counterpart of get_uow
+    mark_write(request, response)
+    try:
+        yield db
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+def on_commit(db: Session, callback: Callable[[], None]) -> None:
+    # Run `callback` once the session's current transaction commits (dropped on rollback)
+    db.info.setdefault("on_commit", []).append(callback)
+
+@event.listens_for(Session, "after_commit")
+def _run_on_commit(session: Session) -> None:
+    for callback in session.info.pop("on_commit", []):
+        callback()
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_on_commit(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop("on_commit", None)
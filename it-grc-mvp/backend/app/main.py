@@ -1,8 +1,6 @@
 from fastapi import FastAPI
-from sqlalchemy.orm import Session
 
-from app.db.session import engine, SessionLocal
-from app.db.base import Base
+from app.db.session import dispose_async_engine
 
 # Import models so metadata is complete
 from app.models import user as _user
@@ -10,6 +8,7 @@ from app.models import access as _access
 from app.models import risk as _risk
 from app.models import compliance as _compliance
 from app.models import audit as _audit
+from app.models import meta as _meta
 
 from app.routers.auth import router as auth_router
 from app.routers.users import router as users_router
@@ -18,27 +17,58 @@ from app.routers.risks import router as risks_router
 from app.routers.compliance import router as compliance_router
 from app.routers.reports import router as reports_router
 from app.routers.audit import router as audit_router
+from app.routers.metrics import router as metrics_router
+from app.routers.search import router as search_router
+from app.routers.events import router as events_router
+from app.routers.async_mode import asyncify_router
 
-from app.seed import run_seed
+from app.core.audit import audit_writer
+from app.core.config import settings
+from app.core.events import event_hub
+from app.core.hashing import hasher
+from app.core.metrics import MetricsMiddleware
+from app.core.reports import snapshot_refresher
+from app.core.rbac import get_current_user, get_current_user_async
+from app.bootstrap import run_bootstrap
 
 app = FastAPI(title="IT Governance / Risk Management (GRC) MVP")
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
 
 @app.on_event("startup")
 def on_startup():
-    # Create tables (MVP approach; for production use Alembic migrations)
-    Base.metadata.create_all(bind=engine)
-
-    # Seed initial data
-    db: Session = SessionLocal()
-    try:
-        run_seed(db)
-    finally:
-        db.close()
-
-app.include_router(auth_router)
-app.include_router(users_router)
-app.include_router(access_router)
-app.include_router(risks_router)
-app.include_router(compliance_router)
+    # Create tables + seed once per bootstrap version (MVP approach; for production use Alembic migrations)
+    if settings.BOOTSTRAP_ON_STARTUP:
+        run_bootstrap()
+
+    if settings.AUDIT_MODE == "write_behind":
+        audit_writer.start()
+    hasher.start()
+    if settings.REPORT_SNAPSHOT_INTERVAL_SECONDS > 0:
+        snapshot_refresher.start()
+    if settings.EVENTS_ENABLED:
+        event_hub.start()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    # Drain queued audit records before the process exits
+    audit_writer.stop()
+    snapshot_refresher.stop()
+    event_hub.stop()
+    hasher.shutdown()
+    await dispose_async_engine()
+
+# Report exports stream rows from a server-side cursor after the handler returns,
+# so they stay on the sync engine in both modes.
+db_routers = [auth_router, users_router, access_router, risks_router, compliance_router, audit_router, search_router]
+if settings.DB_ASYNC:
+    app.dependency_overrides[get_current_user] = get_current_user_async
+    db_routers = [asyncify_router(r) for r in db_routers]
+
+for r in db_routers:
+    app.include_router(r)
 app.include_router(reports_router)
-app.include_router(audit_router)
+# The event feed holds no session while it waits; its listener uses the sync engine
+if settings.EVENTS_ENABLED:
+    app.include_router(events_router)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Integer, String, ForeignKey, DateTime
+from sqlalchemy import Integer, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
 
@@ -9,9 +9,9 @@ class AccessRequest(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     resource: Mapped[str] = mapped_column(String(255))
     requested_role: Mapped[str] = mapped_column(String(80))
-    status: Mapped[str] = mapped_column(String(30), default="PENDING")  # PENDING/APPROVED/DENIED
+    status: Mapped[str] = mapped_column(String(30), default="PENDING", index=True)  # PENDING/APPROVED/DENIED
 
-    requested_by_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    requested_by_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
     approved_by_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -19,3 +19,5 @@ class AccessRequest(Base):
 
     requested_by = relationship("User", foreign_keys=[requested_by_id])
     approved_by = relationship("User", foreign_keys=[approved_by_id])
+
+    __table_args__ = (Index("ix_access_requests_created_id", "created_at", "id"),)
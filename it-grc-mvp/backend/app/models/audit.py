@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import BigInteger, Integer, String, DateTime, Text, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
 
@@ -14,5 +14,33 @@ class AuditLog(Base):
     ip: Mapped[str] = mapped_column(String(80), default="")
     details: Mapped[str] = mapped_column(Text, default="")
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # Hash chain (app.core.audit_chain): position and sha256 over the previous row's hash
+    # + this row. NULL for rows inserted around write_audit (e.g. benchmark data).
+    seq: Mapped[int | None] = mapped_column(BigInteger, nullable=True, unique=True)
+    chain_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
 
     actor = relationship("User")
+
+    # Hot rows are read newest-first and archived oldest-first by created_at
+    __table_args__ = (Index("ix_audit_logs_created_id", "created_at", "id"),)
+
+class AuditChainHead(Base):
+    # Single row (id=1): the last chained seq and hash. Locked while a batch of audit rows
+    # is chained, which orders concurrent writers.
+    __tablename__ = "audit_chain_head"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    seq: Mapped[int] = mapped_column(BigInteger, default=0)
+    chain_hash: Mapped[str] = mapped_column(String(64))
+
+class AuditCheckpoint(Base):
+    # Signed statement that the chain had `chain_hash` at `seq` when it was taken.
+    # verified_at is set once verification has checked the chain up to it.
+    __tablename__ = "audit_checkpoints"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    seq: Mapped[int] = mapped_column(BigInteger, index=True)
+    chain_hash: Mapped[str] = mapped_column(String(64))
+    signature: Mapped[str] = mapped_column(String(64))
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    verified_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
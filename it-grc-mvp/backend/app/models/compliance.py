@@ -18,7 +18,7 @@ class ControlMapping(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
     control_id: Mapped[int] = mapped_column(ForeignKey("controls.id", ondelete="CASCADE"))
-    framework_id: Mapped[int] = mapped_column(ForeignKey("frameworks.id", ondelete="CASCADE"))
+    framework_id: Mapped[int] = mapped_column(ForeignKey("frameworks.id", ondelete="CASCADE"), index=True)
 
     status: Mapped[str] = mapped_column(String(30), default="PARTIAL")  # COMPLIANT/PARTIAL/NONCOMPLIANT
     notes: Mapped[str] = mapped_column(Text, default="")
@@ -0,0 +1,18 @@
+from datetime import datetime
+from sqlalchemy import Integer, String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+class SchemaMeta(Base):
+    __tablename__ = "schema_meta"
+
+    key: Mapped[str] = mapped_column(String(80), primary_key=True)
+    value: Mapped[str] = mapped_column(String(255))
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+class ChangeVersion(Base):
+    # One counter per entity table, bumped in the same transaction as any write to it
+    __tablename__ = "change_versions"
+
+    table_name: Mapped[str] = mapped_column(String(80), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Integer, String, ForeignKey, DateTime, Text
+from sqlalchemy import Integer, String, ForeignKey, DateTime, Text, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
 
@@ -13,10 +13,17 @@ class Risk(Base):
     impact: Mapped[int] = mapped_column(Integer)      # 1-3
     score: Mapped[int] = mapped_column(Integer)       # likelihood * impact
 
-    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
     mitigation_plan: Mapped[str] = mapped_column(Text, default="")
 
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
     owner = relationship("User")
+
+    __table_args__ = (
+        # Matches the /risks sort order so keyset pages are index range scans
+        Index("ix_risks_score_updated_id", "score", "updated_at", "id"),
+        # Covers the heatmap GROUP BY (index-only scan)
+        Index("ix_risks_likelihood_impact", "likelihood", "impact"),
+    )
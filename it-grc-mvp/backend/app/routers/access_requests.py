@@ -1,11 +1,19 @@
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Request
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import case, select, update
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_read_db, get_uow
 from app.models.access import AccessRequest
-from app.schemas.access import AccessRequestCreate, AccessRequestOut
+from app.schemas.access import (
+    AccessDecisionBatch, AccessDecisionOutcome, AccessDecisionResult, AccessRequestCreate, AccessRequestOut,
+)
+from app.core.config import settings
+from app.core.pagination import PageParams, keyset_page
+from app.core.serialization import list_query, rows_response
 from app.core.rbac import get_current_user, require_permissions
+from app.core.versions import mark_changed
 from app.core.audit import write_audit
 
 router = APIRouter(prefix="/access-requests", tags=["access_requests"])
@@ -14,7 +22,7 @@ router = APIRouter(prefix="/access-requests", tags=["access_requests"])
 def create_access_request(
     payload: AccessRequestCreate,
     request: Request,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow, scope="function"),
     user=Depends(get_current_user),
 ):
     ar = AccessRequest(
@@ -25,49 +33,107 @@ def create_access_request(
         approved_by_id=None,
     )
     db.add(ar)
-    db.commit()
-    db.refresh(ar)
+    db.flush()
+    mark_changed(db, AccessRequest)
 
     write_audit(db, user.id, "ACCESS_REQUEST_CREATE", "AccessRequest", str(ar.id), ip=request.client.host if request.client else "", details=f"resource={ar.resource}")
 
     return ar
 
 @router.get("", response_model=list[AccessRequestOut])
-def list_access_requests(db: Session = Depends(get_db), actor=Depends(require_permissions("access:read"))):
-    return db.query(AccessRequest).order_by(AccessRequest.created_at.desc()).all()
+def list_access_requests(
+    response: Response,
+    page: PageParams = Depends(),
+    status: Literal["PENDING", "APPROVED", "DENIED"] | None = None,
+    requested_by_id: int | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    db: Session = Depends(get_read_db),
+    actor=Depends(require_permissions("access:read")),
+):
+    q = list_query(db, AccessRequestOut, AccessRequest)
+    if status is not None:
+        q = q.filter(AccessRequest.status == status)
+    if requested_by_id is not None:
+        q = q.filter(AccessRequest.requested_by_id == requested_by_id)
+    if created_from is not None:
+        q = q.filter(AccessRequest.created_at >= created_from)
+    if created_to is not None:
+        q = q.filter(AccessRequest.created_at < created_to)
+    rows = keyset_page(q, [AccessRequest.created_at, AccessRequest.id], page, response, descending=True)
+    return rows_response(AccessRequestOut, rows, response)
 
-@router.post("/{req_id}/approve", response_model=AccessRequestOut)
-def approve(req_id: int, request: Request, db: Session = Depends(get_db), actor=Depends(require_permissions("access:approve"))):
-    ar = db.query(AccessRequest).filter(AccessRequest.id == req_id).first()
-    if not ar:
+def decide(db: Session, req_id: int, actor_id: int, status: str) -> AccessRequest:
+    # Conditional UPDATE ... RETURNING: only a PENDING request can be decided, so two
+    # approvers racing on the same request cannot both succeed.
+    ar = db.scalars(
+        update(AccessRequest)
+        .where(AccessRequest.id == req_id, AccessRequest.status == "PENDING")
+        .values(status=status, approved_by_id=actor_id, decided_at=datetime.utcnow())
+        .returning(AccessRequest)
+    ).first()
+    if ar:
+        mark_changed(db, AccessRequest)
+        return ar
+    if db.get(AccessRequest, req_id) is None:
         raise HTTPException(status_code=404, detail="Request not found")
-    if ar.status != "PENDING":
-        raise HTTPException(status_code=400, detail="Request already decided")
-
-    ar.status = "APPROVED"
-    ar.approved_by_id = actor.id
-    ar.decided_at = datetime.utcnow()
-    db.commit()
-    db.refresh(ar)
+    raise HTTPException(status_code=400, detail="Request already decided")
 
+@router.post("/{req_id}/approve", response_model=AccessRequestOut)
+def approve(req_id: int, request: Request, db: Session = Depends(get_uow, scope="function"), actor=Depends(require_permissions("access:approve"))):
+    ar = decide(db, req_id, actor.id, "APPROVED")
     write_audit(db, actor.id, "ACCESS_REQUEST_APPROVE", "AccessRequest", str(ar.id), ip=request.client.host if request.client else "")
-
     return ar
 
 @router.post("/{req_id}/deny", response_model=AccessRequestOut)
-def deny(req_id: int, request: Request, db: Session = Depends(get_db), actor=Depends(require_permissions("access:approve"))):
-    ar = db.query(AccessRequest).filter(AccessRequest.id == req_id).first()
-    if not ar:
-        raise HTTPException(status_code=404, detail="Request not found")
-    if ar.status != "PENDING":
-        raise HTTPException(status_code=400, detail="Request already decided")
+def deny(req_id: int, request: Request, db: Session = Depends(get_uow, scope="function"), actor=Depends(require_permissions("access:approve"))):
+    ar = decide(db, req_id, actor.id, "DENIED")
+    write_audit(db, actor.id, "ACCESS_REQUEST_DENY", "AccessRequest", str(ar.id), ip=request.client.host if request.client else "")
+    return ar
 
-    ar.status = "DENIED"
-    ar.approved_by_id = actor.id
-    ar.decided_at = datetime.utcnow()
-    db.commit()
-    db.refresh(ar)
+DECISION_STATUS = {"APPROVE": "APPROVED", "DENY": "DENIED"}
 
-    write_audit(db, actor.id, "ACCESS_REQUEST_DENY", "AccessRequest", str(ar.id), ip=request.client.host if request.client else "")
+@router.post("/decisions", response_model=AccessDecisionResult)
+def decide_batch(
+    payload: AccessDecisionBatch,
+    request: Request,
+    db: Session = Depends(get_uow, scope="function"),
+    actor=Depends(require_permissions("access:approve")),
+):
+    # A whole review queue in one request: one conditional UPDATE ... RETURNING sets each
+    # still-PENDING request to its own decision, so racing approvers (batch or single)
+    # never both decide a request. Ids it did not update are looked up once to tell
+    # "already decided" from "not found". Partial success is the normal case.
+    if len(payload.decisions) > settings.ACCESS_DECISION_BATCH_MAX:
+        raise HTTPException(status_code=422, detail=f"At most {settings.ACCESS_DECISION_BATCH_MAX} decisions per batch")
+    wanted = {d.id: DECISION_STATUS[d.decision] for d in payload.decisions}
+    if len(wanted) != len(payload.decisions):
+        raise HTTPException(status_code=422, detail="Each request id may appear only once")
 
-    return ar
+    decided = {}
+    if wanted:
+        decided = dict(db.execute(
+            update(AccessRequest)
+            .where(AccessRequest.id.in_(wanted), AccessRequest.status == "PENDING")
+            .values(status=case(wanted, value=AccessRequest.id), approved_by_id=actor.id, decided_at=datetime.utcnow())
+            .returning(AccessRequest.id, AccessRequest.status)
+            .execution_options(synchronize_session=False)
+        ).all())
+    if decided:
+        mark_changed(db, AccessRequest)
+    others = wanted.keys() - decided.keys()
+    current = dict(db.execute(select(AccessRequest.id, AccessRequest.status).where(AccessRequest.id.in_(others))).all()) if others else {}
+
+    ip = request.client.host if request.client else ""
+    results = []
+    for d in payload.decisions:
+        if d.id in decided:
+            status = decided[d.id]
+            # Queued on the session; all of them go in as one multi-row INSERT at commit
+            write_audit(db, actor.id, f"ACCESS_REQUEST_{d.decision}", "AccessRequest", str(d.id), ip=ip, details="batch")
+            results.append(AccessDecisionOutcome(id=d.id, outcome=status, status=status))
+        elif d.id in current:
+            results.append(AccessDecisionOutcome(id=d.id, outcome="already_decided", status=current[d.id]))
+        else:
+            results.append(AccessDecisionOutcome(id=d.id, outcome="not_found", status=None))
+    return AccessDecisionResult(decided=len(decided), skipped=len(results) - len(decided), results=results)
@@ -0,0 +1,69 @@
+import functools
+import inspect
+
+from fastapi import APIRouter, Depends, params
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_async_db, get_async_read_db, get_async_uow, get_db, get_read_db, get_uow
+
+ASYNC_DEPENDENCIES = {get_db: get_async_db, get_read_db: get_async_read_db, get_uow: get_async_uow}
+
+# Route attributes carried over when a route is re-registered
+ROUTE_OPTIONS = [
+    "response_model", "status_code", "tags", "dependencies", "summary", "description",
+    "response_description", "responses", "deprecated", "methods", "operation_id",
+    "response_model_include", "response_model_exclude", "response_model_by_alias",
+    "response_model_exclude_unset", "response_model_exclude_defaults", "response_model_exclude_none",
+    "include_in_schema", "response_class", "name", "openapi_extra",
+]
+
+def keep_sync(endpoint):
+    # Marks a handler that asyncify_router must leave alone. run_sync executes the whole
+    # handler body on the event loop, which is fine for handlers that mostly wait on the
+    # database but blocks every request on the worker for CPU-heavy ones (parsing and
+    # validating bulk uploads). Those keep the sync Session and run in the threadpool.
+    endpoint.keep_sync = True
+    return endpoint
+
+def asyncify_endpoint(endpoint):
+    # Turns a sync handler that takes a Session into an async one that takes an AsyncSession
+    # and runs the original body through AsyncSession.run_sync. The handler code is unchanged,
+    # but its database I/O awaits the async driver on the event loop instead of holding a
+    # threadpool thread for the whole request.
+    if inspect.iscoroutinefunction(endpoint) or getattr(endpoint, "keep_sync", False):
+        return endpoint
+    sig = inspect.signature(endpoint)
+    db_params = [
+        name for name, p in sig.parameters.items()
+        if isinstance(p.default, params.Depends) and p.default.dependency in ASYNC_DEPENDENCIES
+    ]
+    if not db_params:
+        return endpoint
+
+    new_params = []
+    for p in sig.parameters.values():
+        if p.name in db_params:
+            dep = p.default
+            p = p.replace(annotation=AsyncSession, default=Depends(ASYNC_DEPENDENCIES[dep.dependency], scope=dep.scope))
+        new_params.append(p)
+
+    @functools.wraps(endpoint)
+    async def wrapper(**kwargs):
+        db: AsyncSession = kwargs[db_params[0]]
+        return await db.run_sync(lambda sync_db: endpoint(**{**kwargs, **dict.fromkeys(db_params, sync_db)}))
+
+    wrapper.__signature__ = sig.replace(parameters=new_params)
+    return wrapper
+
+def asyncify_router(router: APIRouter) -> APIRouter:
+    # Handlers must not return lazily-evaluated results (e.g. streaming generators over a
+    # cursor); those routers stay on the sync engine.
+    out = APIRouter()
+    for route in router.routes:
+        if not isinstance(route, APIRoute):
+            out.routes.append(route)
+            continue
+        options = {k: getattr(route, k) for k in ROUTE_OPTIONS}
+        out.add_api_route(route.path, asyncify_endpoint(route.endpoint), **options)
+    return out
@@ -1,13 +1,121 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from itertools import islice
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
-from app.models.audit import AuditLog
-from app.schemas.audit import AuditOut
+from app.db.session import get_read_db, get_uow, reads_from_primary
+from app.models.audit import AuditCheckpoint, AuditLog
+from app.schemas.audit import AuditCheckpointOut, AuditOut, AuditVerification
+from app.core.audit_archive import iter_archived
+from app.core.audit_chain import create_checkpoint, verify_chain
+from app.core.exports import export_response, negotiate
+from app.core.pagination import PageParams, keyset_page
+from app.core.reports import read_batches
+from app.core.serialization import list_query, rows_response
 from app.core.rbac import require_permissions
 
 router = APIRouter(prefix="/audit", tags=["audit"])
 
 @router.get("", response_model=list[AuditOut])
-def list_audit(db: Session = Depends(get_db), actor=Depends(require_permissions("audit:read"))):
-    return db.query(AuditLog).order_by(AuditLog.created_at.desc()).limit(500).all()
+def list_audit(
+    response: Response,
+    page: PageParams = Depends(),
+    entity_type: str | None = None,
+    entity_id: str | None = None,
+    action: str | None = None,
+    actor_user_id: int | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    db: Session = Depends(get_read_db),
+    actor=Depends(require_permissions("audit:read")),
+):
+    q = list_query(db, AuditOut, AuditLog)
+    if entity_type is not None:
+        q = q.filter(AuditLog.entity_type == entity_type)
+    if entity_id is not None:
+        q = q.filter(AuditLog.entity_id == entity_id)
+    if action is not None:
+        q = q.filter(AuditLog.action == action)
+    if actor_user_id is not None:
+        q = q.filter(AuditLog.actor_user_id == actor_user_id)
+    if created_from is not None:
+        q = q.filter(AuditLog.created_at >= created_from)
+    if created_to is not None:
+        q = q.filter(AuditLog.created_at < created_to)
+    rows = keyset_page(q, [AuditLog.created_at, AuditLog.id], page, response, descending=True)
+    return rows_response(AuditOut, rows, response)
+
+# Columns of /audit/export, in file order
+EXPORT_FIELDS = ["id", "seq", "actor_user_id", "action", "entity_type", "entity_id", "ip", "details", "created_at", "chain_hash"]
+
+@router.get("/export")
+def export_audit(
+    request: Request,
+    entity_type: str | None = None,
+    entity_id: str | None = None,
+    action: str | None = None,
+    actor_user_id: int | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    format: Literal["csv", "ndjson", "arrow", "parquet"] | None = None,
+    actor=Depends(require_permissions("audit:read")),
+):
+    # The hot table, oldest first, streamed in fetch batches in the negotiated format
+    stmt = select(*[getattr(AuditLog, f) for f in EXPORT_FIELDS]).order_by(AuditLog.created_at, AuditLog.id)
+    if entity_type is not None:
+        stmt = stmt.where(AuditLog.entity_type == entity_type)
+    if entity_id is not None:
+        stmt = stmt.where(AuditLog.entity_id == entity_id)
+    if action is not None:
+        stmt = stmt.where(AuditLog.action == action)
+    if actor_user_id is not None:
+        stmt = stmt.where(AuditLog.actor_user_id == actor_user_id)
+    if created_from is not None:
+        stmt = stmt.where(AuditLog.created_at >= created_from)
+    if created_to is not None:
+        stmt = stmt.where(AuditLog.created_at < created_to)
+    fmt = negotiate(request, format)
+    return export_response(
+        request, fmt, "audit_log", EXPORT_FIELDS,
+        [c.type for c in stmt.selected_columns], read_batches(stmt, reads_from_primary(request)),
+    )
+
+@router.get("/archive", response_model=list[AuditOut])
+def list_archived_audit(
+    start: datetime,
+    end: datetime,
+    entity_type: str | None = None,
+    entity_id: str | None = None,
+    action: str | None = None,
+    limit: int = Query(1000, ge=1, le=10000),
+    actor=Depends(require_permissions("audit:read")),
+):
+    # Cold history moved out of audit_logs by the retention job, oldest first
+    return list(islice(iter_archived(start, end, entity_type, entity_id, action), limit))
+
+@router.post("/verify", response_model=AuditVerification)
+def verify_audit_chain(
+    from_seq: int | None = Query(None, ge=1),
+    to_seq: int | None = Query(None, ge=1),
+    actor=Depends(require_permissions("audit:verify")),
+):
+    # No range: everything written since the last verified checkpoint, which then moves
+    # forward. A range is checked as is, e.g. to re-check older history in slices.
+    return verify_chain(from_seq, to_seq)
+
+@router.get("/checkpoints", response_model=list[AuditCheckpointOut])
+def list_checkpoints(
+    limit: int = Query(20, ge=1, le=1000),
+    db: Session = Depends(get_read_db),
+    actor=Depends(require_permissions("audit:read")),
+):
+    return db.query(AuditCheckpoint).order_by(AuditCheckpoint.seq.desc(), AuditCheckpoint.id.desc()).limit(limit).all()
+
+@router.post("/checkpoints", response_model=AuditCheckpointOut)
+def take_checkpoint(db: Session = Depends(get_uow, scope="function"), actor=Depends(require_permissions("audit:verify"))):
+    cp = create_checkpoint(db)
+    if cp is None:
+        raise HTTPException(status_code=409, detail="No chained audit rows yet")
+    return cp
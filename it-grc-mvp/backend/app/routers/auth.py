@@ -1,29 +1,62 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, selectinload
 
 from app.db.session import get_db
-from app.core.security import verify_password, create_access_token
+from app.core.catalogue import local_cache as catalogue_cache
+from app.core.hashing import hasher
+from app.core.security import create_access_token
 from app.models.user import User
-from app.core.rbac import get_current_user, get_user_permission_codes
+from app.core.rbac import Principal, get_current_user, principal_cache, require_permissions
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+def _find_credentials(db: Session, email: str):
+    return db.execute(select(User.id, User.email, User.password_hash).where(User.email == email)).first()
+
+def _store_hash(db: Session, user_id: int, pw_hash: str) -> None:
+    db.execute(update(User).where(User.id == user_id).values(password_hash=pw_hash))
+    db.commit()
+
 @router.post("/login")
-def login(form: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == form.username).first()
-    if not user or not verify_password(form.password, user.password_hash):
+async def login(request: Request, form: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    # async so the request holds no threadpool thread while the hash runs in the hashing pool
+    limit_keys = (f"account:{form.username.lower()}", f"ip:{request.client.host if request.client else ''}")
+    hasher.admit(*limit_keys)
+
+    user = await run_in_threadpool(_find_credentials, db, form.username)
+    if not user:
+        hasher.record_failure(*limit_keys)
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    ok, upgraded_hash = await hasher.verify(form.password, user.password_hash)
+    if not ok:
+        hasher.record_failure(*limit_keys)
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    if upgraded_hash:
+        await run_in_threadpool(_store_hash, db, user.id, upgraded_hash)
 
     token = create_access_token(subject=user.email)
     return {"access_token": token, "token_type": "bearer"}
 
 @router.get("/me")
-def me(user: User = Depends(get_current_user)):
+def me(principal: Principal = Depends(get_current_user), db: Session = Depends(get_db)):
+    user = db.query(User).options(selectinload(User.roles)).filter(User.id == principal.id).first()
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
     return {
         "id": user.id,
         "email": user.email,
         "full_name": user.full_name,
         "roles": [r.name for r in user.roles],
-        "permissions": sorted(list(get_user_permission_codes(user))),
+        "permissions": sorted(principal.permissions),
+    }
+
+@router.get("/cache-stats")
+def cache_stats(actor=Depends(require_permissions("audit:read"))):
+    return {
+        "principal_cache": principal_cache.stats(),
+        "catalogue_cache": catalogue_cache.stats(),
+        "password_hashing": hasher.stats(),
     }
@@ -1,53 +1,115 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from typing import Literal
+from fastapi import APIRouter, Depends, File, HTTPException, Request, Response, UploadFile
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db, get_uow, on_commit
 from app.models.compliance import Framework, Control, ControlMapping
 from app.schemas.compliance import (
-    FrameworkCreate, ControlCreate, ControlMappingCreate,
-    FrameworkOut, ControlOut, ControlMappingOut
+    FrameworkCreate, ControlCreate, ControlMappingCreate, ControlMappingImport,
+    FrameworkOut, ControlOut, ControlMappingOut, CoverageMatrix
 )
+from app.schemas.imports import ImportResult
+from app.core.bulk import ImportTracker, batched, iter_upload_rows, upload_format, upsert
+from app.core.catalogue import catalogue_page, exists, resolve
+from app.core.config import settings
+from app.core.coverage import get_coverage, invalidate_coverage
+from app.core.pagination import PageParams, keyset_page
+from app.core.serialization import list_query, rows_response
 from app.core.rbac import require_permissions
+from app.core.versions import conditional_get, mark_changed
 from app.core.audit import write_audit
+from app.routers.async_mode import keep_sync
 
 router = APIRouter(prefix="/compliance", tags=["compliance"])
 
 @router.post("/frameworks", response_model=FrameworkOut)
-def create_framework(payload: FrameworkCreate, request: Request, db: Session = Depends(get_db), actor=Depends(require_permissions("compliance:write"))):
+def create_framework(payload: FrameworkCreate, request: Request, db: Session = Depends(get_uow, scope="function"), actor=Depends(require_permissions("compliance:write"))):
     if db.query(Framework).filter(Framework.name == payload.name).first():
         raise HTTPException(status_code=409, detail="Framework exists")
     f = Framework(name=payload.name)
     db.add(f)
-    db.commit()
-    db.refresh(f)
+    db.flush()
+    on_commit(db, invalidate_coverage)
+    mark_changed(db, Framework)
     write_audit(db, actor.id, "FRAMEWORK_CREATE", "Framework", str(f.id), ip=request.client.host if request.client else "")
     return f
 
+@router.post("/frameworks/import", response_model=ImportResult)
+@keep_sync
+def import_frameworks(request: Request, file: UploadFile = File(...), db: Session = Depends(get_uow, scope="function"), actor=Depends(require_permissions("compliance:write"))):
+    fmt = upload_format(file)
+    tracker = ImportTracker(fmt)
+    rows = tracker.validated(iter_upload_rows(file, fmt), FrameworkCreate)
+    for batch in batched(rows, settings.IMPORT_BATCH_SIZE):
+        names = {p.name for _, p in batch}
+        stmt = upsert(db, Framework).values([{"name": n} for n in names])
+        inserted = db.execute(stmt.on_conflict_do_nothing(index_elements=["name"]).returning(Framework.id)).all()
+        # Repeated names in the batch and frameworks that already exist are skipped
+        tracker.written(len(batch), len(inserted))
+
+    on_commit(db, invalidate_coverage)
+    mark_changed(db, Framework)
+    write_audit(db, actor.id, "FRAMEWORK_IMPORT", "Framework", "bulk", ip=request.client.host if request.client else "", details=tracker.summary())
+    return tracker.result
+
 @router.get("/frameworks", response_model=list[FrameworkOut])
-def list_frameworks(db: Session = Depends(get_db), actor=Depends(require_permissions("compliance:read"))):
-    return db.query(Framework).order_by(Framework.name.asc()).all()
+def list_frameworks(
+    response: Response,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_read_db),
+    actor=Depends(require_permissions("compliance:read")),
+    _etag=Depends(conditional_get(Framework)),
+):
+    return rows_response(FrameworkOut, catalogue_page(db, Framework, page, response), response)
 
 @router.post("/controls", response_model=ControlOut)
-def create_control(payload: ControlCreate, request: Request, db: Session = Depends(get_db), actor=Depends(require_permissions("compliance:write"))):
+def create_control(payload: ControlCreate, request: Request, db: Session = Depends(get_uow, scope="function"), actor=Depends(require_permissions("compliance:write"))):
     if db.query(Control).filter(Control.name == payload.name).first():
         raise HTTPException(status_code=409, detail="Control exists")
     c = Control(name=payload.name, description=payload.description)
     db.add(c)
-    db.commit()
-    db.refresh(c)
+    db.flush()
+    on_commit(db, invalidate_coverage)
+    mark_changed(db, Control)
     write_audit(db, actor.id, "CONTROL_CREATE", "Control", str(c.id), ip=request.client.host if request.client else "")
     return c
 
+@router.post("/controls/import", response_model=ImportResult)
+@keep_sync
+def import_controls(request: Request, file: UploadFile = File(...), db: Session = Depends(get_uow, scope="function"), actor=Depends(require_permissions("compliance:write"))):
+    fmt = upload_format(file)
+    tracker = ImportTracker(fmt)
+    rows = tracker.validated(iter_upload_rows(file, fmt), ControlCreate)
+    for batch in batched(rows, settings.IMPORT_BATCH_SIZE):
+        # A row may appear twice in one batch; the last one wins (ON CONFLICT can't touch a row twice)
+        by_name = {p.name: p.description for _, p in batch}
+        stmt = upsert(db, Control).values([{"name": n, "description": d} for n, d in by_name.items()])
+        db.execute(stmt.on_conflict_do_update(index_elements=["name"], set_={"description": stmt.excluded.description}))
+        tracker.written(len(batch), len(by_name))
+
+    on_commit(db, invalidate_coverage)
+    mark_changed(db, Control)
+    write_audit(db, actor.id, "CONTROL_IMPORT", "Control", "bulk", ip=request.client.host if request.client else "", details=tracker.summary())
+    return tracker.result
+
 @router.get("/controls", response_model=list[ControlOut])
-def list_controls(db: Session = Depends(get_db), actor=Depends(require_permissions("compliance:read"))):
-    return db.query(Control).order_by(Control.name.asc()).all()
+def list_controls(
+    response: Response,
+    page: PageParams = Depends(),
+    name_prefix: str | None = None,
+    db: Session = Depends(get_read_db),
+    actor=Depends(require_permissions("compliance:read")),
+    _etag=Depends(conditional_get(Control)),
+):
+    return rows_response(ControlOut, catalogue_page(db, Control, page, response, name_prefix), response)
 
 @router.post("/mappings", response_model=ControlMappingOut)
-def create_mapping(payload: ControlMappingCreate, request: Request, db: Session = Depends(get_db), actor=Depends(require_permissions("compliance:write"))):
+def create_mapping(payload: ControlMappingCreate, request: Request, db: Session = Depends(get_uow, scope="function"), actor=Depends(require_permissions("compliance:write"))):
     # basic existence checks
-    if not db.query(Control).filter(Control.id == payload.control_id).first():
+    if not exists(db, Control, payload.control_id):
         raise HTTPException(status_code=400, detail="Unknown control_id")
-    if not db.query(Framework).filter(Framework.id == payload.framework_id).first():
+    if not exists(db, Framework, payload.framework_id):
         raise HTTPException(status_code=400, detail="Unknown framework_id")
 
     m = ControlMapping(
@@ -58,15 +120,87 @@ def create_mapping(payload: ControlMappingCreate, request: Request, db: Session
     )
     db.add(m)
     try:
-        db.commit()
-    except Exception:
+        db.flush()
+    except IntegrityError:
         db.rollback()
         raise HTTPException(status_code=409, detail="Mapping already exists")
-    db.refresh(m)
 
+    on_commit(db, invalidate_coverage)
+    mark_changed(db, ControlMapping)
     write_audit(db, actor.id, "CONTROL_MAPPING_CREATE", "ControlMapping", str(m.id), ip=request.client.host if request.client else "")
     return m
 
+@router.post("/mappings/import", response_model=ImportResult)
+@keep_sync
+def import_mappings(request: Request, file: UploadFile = File(...), db: Session = Depends(get_uow, scope="function"), actor=Depends(require_permissions("compliance:write"))):
+    fmt = upload_format(file)
+    tracker = ImportTracker(fmt)
+    rows = tracker.validated(iter_upload_rows(file, fmt), ControlMappingImport)
+    for batch in batched(rows, settings.IMPORT_BATCH_SIZE):
+        control_ids, controls = resolve(
+            db, Control, {p.control_id for _, p in batch if p.control_id is not None}, {p.control for _, p in batch if p.control}
+        )
+        framework_ids, frameworks = resolve(
+            db, Framework, {p.framework_id for _, p in batch if p.framework_id is not None}, {p.framework for _, p in batch if p.framework}
+        )
+        by_key: dict[tuple[int, int], dict] = {}
+        accepted = 0
+        for n, p in batch:
+            control_id = p.control_id if p.control_id in control_ids else controls.get(p.control or "")
+            framework_id = p.framework_id if p.framework_id in framework_ids else frameworks.get(p.framework or "")
+            if control_id is None:
+                tracker.error(n, "Unknown control_id" if p.control_id is not None or not p.control else f"Unknown control {p.control!r}")
+                continue
+            if framework_id is None:
+                tracker.error(n, "Unknown framework_id" if p.framework_id is not None or not p.framework else f"Unknown framework {p.framework!r}")
+                continue
+            by_key[(control_id, framework_id)] = {
+                "control_id": control_id, "framework_id": framework_id, "status": p.status, "notes": p.notes,
+            }
+            accepted += 1
+        if by_key:
+            stmt = upsert(db, ControlMapping).values(list(by_key.values()))
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=["control_id", "framework_id"],
+                set_={"status": stmt.excluded.status, "notes": stmt.excluded.notes},
+            ))
+            tracker.written(accepted, len(by_key))
+
+    on_commit(db, invalidate_coverage)
+    mark_changed(db, ControlMapping)
+    write_audit(db, actor.id, "CONTROL_MAPPING_IMPORT", "ControlMapping", "bulk", ip=request.client.host if request.client else "", details=tracker.summary())
+    return tracker.result
+
 @router.get("/mappings", response_model=list[ControlMappingOut])
-def list_mappings(db: Session = Depends(get_db), actor=Depends(require_permissions("compliance:read"))):
-    return db.query(ControlMapping).order_by(ControlMapping.id.desc()).all()
+def list_mappings(
+    response: Response,
+    page: PageParams = Depends(),
+    status: Literal["COMPLIANT", "PARTIAL", "NONCOMPLIANT"] | None = None,
+    framework_id: int | None = None,
+    control_id: int | None = None,
+    db: Session = Depends(get_read_db),
+    actor=Depends(require_permissions("compliance:read")),
+    _etag=Depends(conditional_get(ControlMapping)),
+):
+    q = list_query(db, ControlMappingOut, ControlMapping)
+    if status is not None:
+        q = q.filter(ControlMapping.status == status)
+    if framework_id is not None:
+        q = q.filter(ControlMapping.framework_id == framework_id)
+    if control_id is not None:
+        q = q.filter(ControlMapping.control_id == control_id)
+    rows = keyset_page(q, [ControlMapping.id], page, response, descending=True)
+    return rows_response(ControlMappingOut, rows, response)
+
+@router.get("/coverage", response_model=CoverageMatrix)
+def coverage(
+    framework_id: int | None = None,
+    unmapped_only: bool = False,
+    db: Session = Depends(get_db),
+    actor=Depends(require_permissions("compliance:read")),
+):
+    # Per-framework status counts plus a sparse control x framework pivot.
+    # With framework_id + unmapped_only=true: the controls with no mapping for that framework.
+    # Computed on the primary: the result is cached for every client until the next write,
+    # and a lagging replica would leave it stale for the whole TTL.
+    return get_coverage(db, framework_id, unmapped_only)
@@ -0,0 +1,114 @@
+import time
+from contextlib import contextmanager
+from typing import AsyncIterator
+
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.events import EventFilter, ChangeEvent, event_filter, event_hub, next_events
+from app.core.rbac import Principal, get_streaming_user
+from app.schemas.event import EventPage
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+def filters(
+    entity_type: list[str] | None = Query(None, description="Repeatable, e.g. AccessRequest"),
+    action: list[str] | None = Query(None, description="Repeatable, e.g. ACCESS_REQUEST_CREATE"),
+    user: Principal = Depends(get_streaming_user),
+) -> EventFilter:
+    return event_filter(user, entity_type, action)
+
+def check_capacity() -> None:
+    if event_hub.subscribers >= settings.EVENTS_MAX_SUBSCRIBERS:
+        raise HTTPException(status_code=503, detail="Too many event subscribers", headers={"Retry-After": "5"})
+
+def reserve_subscriber() -> None:
+    check_capacity()
+    event_hub.subscribers += 1
+
+def release_subscriber() -> None:
+    event_hub.subscribers -= 1
+
+@contextmanager
+def subscriber():
+    reserve_subscriber()
+    try:
+        yield
+    finally:
+        release_subscriber()
+
+async def start_point(after: int | None) -> int:
+    # Without a resume point, clients get events committed from now on
+    if not event_hub.running:
+        await run_in_threadpool(event_hub.start)
+    return event_hub.head if after is None else after
+
+def sse_message(e: ChangeEvent) -> bytes:
+    return b"id: %d\ndata: %s\n\n" % (e.seq, orjson.dumps(e.to_dict()))
+
+async def sse_stream(request: Request, after: int, flt: EventFilter) -> AsyncIterator[bytes]:
+    # The caller checks capacity before the response starts, so a full server can still
+    # answer 503. The slot is taken on the first step: a client that leaves before the
+    # body starts never runs this generator, so it must not hold one.
+    event_hub.subscribers += 1
+    try:
+        deadline = time.monotonic() + settings.EVENTS_MAX_STREAM_SECONDS
+        yield b"retry: %d\n\n" % int(settings.EVENTS_POLL_INTERVAL_SECONDS * 1000 + 1000)
+        while True:
+            events, scanned = await next_events(after, flt, settings.EVENTS_PAGE_MAX)
+            if events:
+                yield b"".join(sse_message(e) for e in events)
+            if scanned > after:
+                after = scanned
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or await request.is_disconnected():
+                return
+            if not await event_hub.wait(after, min(settings.EVENTS_HEARTBEAT_SECONDS, remaining)):
+                # Keeps proxies from timing out the connection; the id moves the
+                # client's resume point past events it was not sent
+                yield b": keepalive\nid: %d\n\n" % after
+    finally:
+        release_subscriber()
+
+@router.get("", response_class=StreamingResponse, responses={200: {"content": {"text/event-stream": {}}}})
+async def stream_events(
+    request: Request,
+    flt: EventFilter = Depends(filters),
+    last_event_id: int | None = Header(None, description="Resume after this event (sent by EventSource on reconnect)"),
+    after: int | None = Query(None, description="Same as Last-Event-ID, for clients that cannot set headers"),
+):
+    # Server-sent events, one per audit row (risk, access request, compliance and user
+    # changes) as it commits. The stream ends after EVENTS_MAX_STREAM_SECONDS; EventSource
+    # reconnects with Last-Event-ID and misses nothing.
+    start = await start_point(last_event_id if last_event_id is not None else after)
+    check_capacity()
+    return StreamingResponse(
+        sse_stream(request, start, flt),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/poll", response_model=EventPage)
+async def poll_events(
+    flt: EventFilter = Depends(filters),
+    after: int | None = Query(None, ge=0, description="last_event_id of the previous poll; omitted = from now"),
+    timeout: float = Query(25.0, ge=0),
+    limit: int = Query(100, ge=1),
+):
+    # Long-poll fallback: answers as soon as matching events exist after `after`, or
+    # with none after `timeout` seconds
+    after = await start_point(after)
+    limit = min(limit, settings.EVENTS_PAGE_MAX)
+    deadline = time.monotonic() + min(timeout, settings.EVENTS_LONG_POLL_MAX_SECONDS)
+    with subscriber():
+        while True:
+            events, after = await next_events(after, flt, limit)
+            remaining = deadline - time.monotonic()
+            if events or remaining <= 0:
+                return {"events": [e.to_dict() for e in events], "last_event_id": after}
+            if event_hub.head <= after:
+                await event_hub.wait(after, remaining)
@@ -1,74 +1,104 @@
-import csv
-from io import StringIO
-from fastapi import APIRouter, Depends
-from fastapi.responses import Response
-from sqlalchemy.orm import Session
+import calendar
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import FileResponse
 
-from app.db.session import get_db
+from app.db.session import reads_from_primary
 from app.core.rbac import require_permissions
-from app.models.access import AccessRequest
-from app.models.risk import Risk
-from app.models.compliance import ControlMapping, Control, Framework
+from app.core.exports import FORMATS, export_response, negotiate
+from app.core.reports import REPORTS, Snapshot, ensure_snapshot, get_snapshot, iter_csv, list_snapshots, read_batches, stream_rows
+from app.core.versions import etag_matches
+from app.schemas.report import ReportSnapshotOut
+
+__all__ = ["router", "iter_csv", "stream_rows"]
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
-def csv_response(filename: str, rows: list[dict]):
-    buf = StringIO()
-    if not rows:
-        writer = csv.writer(buf)
-        writer.writerow(["no_data"])
-    else:
-        writer = csv.DictWriter(buf, fieldnames=list(rows[0].keys()))
-        writer.writeheader()
-        writer.writerows(rows)
-    return Response(
-        content=buf.getvalue(),
-        media_type="text/csv",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+ReportName = Literal["access-reviews", "risk-summary", "compliance-gap"]
+ExportFormatName = Literal["csv", "ndjson", "arrow", "parquet"]
+
+def not_modified(request: Request, etag: str, snapshot: Snapshot) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    since = request.headers.get("if-modified-since")
+    if since is None:
+        return False
+    try:
+        since_ts = parsedate_to_datetime(since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    return int(calendar.timegm(snapshot.created_at.timetuple())) <= since_ts
+
+def snapshot_response(request: Request, snapshot: Snapshot, filename: str) -> Response:
+    # Snapshots never change once written, so the id is a strong validator. FileResponse
+    # answers Range / If-Range requests from the file.
+    etag = f'"{snapshot.id}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(calendar.timegm(snapshot.created_at.timetuple()), usegmt=True),
+        "Cache-Control": "private, no-cache",
+        "X-Snapshot-Id": snapshot.id,
+    }
+    if not_modified(request, etag, snapshot):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(snapshot.path, media_type="text/csv", filename=filename, headers=headers)
+
+def serve_report(request: Request, name: str, fresh: bool, format: str | None) -> Response:
+    # CSV comes from the latest snapshot (written on first use when none exists yet).
+    # fresh=true, and the other formats, stream from the live tables in fetch batches.
+    report = REPORTS[name]
+    fmt = negotiate(request, format)
+    if fmt is FORMATS["csv"] and not fresh:
+        response = snapshot_response(request, ensure_snapshot(name), report.filename)
+        response.headers["Vary"] = "Accept, Accept-Encoding"
+        return response
+    stmt = report.query()
+    response = export_response(
+        request, fmt, report.filename.removesuffix(".csv"), report.fieldnames,
+        [c.type for c in stmt.selected_columns], read_batches(stmt, reads_from_primary(request)),
     )
+    response.headers["Cache-Control"] = "no-store"
+    return response
 
 @router.get("/access-reviews")
-def access_reviews(db: Session = Depends(get_db), actor=Depends(require_permissions("report:export"))):
-    q = db.query(AccessRequest).order_by(AccessRequest.created_at.desc()).all()
-    rows = [{
-        "id": a.id,
-        "resource": a.resource,
-        "requested_role": a.requested_role,
-        "status": a.status,
-        "requested_by_id": a.requested_by_id,
-        "approved_by_id": a.approved_by_id,
-        "created_at": a.created_at.isoformat(),
-        "decided_at": a.decided_at.isoformat() if a.decided_at else "",
-    } for a in q]
-    return csv_response("access_reviews.csv", rows)
+def access_reviews(
+    request: Request,
+    fresh: bool = False,
+    format: ExportFormatName | None = None,
+    actor=Depends(require_permissions("report:export")),
+):
+    return serve_report(request, "access-reviews", fresh, format)
 
 @router.get("/risk-summary")
-def risk_summary(db: Session = Depends(get_db), actor=Depends(require_permissions("report:export"))):
-    q = db.query(Risk).order_by(Risk.score.desc(), Risk.updated_at.desc()).all()
-    rows = [{
-        "id": r.id,
-        "title": r.title,
-        "likelihood": r.likelihood,
-        "impact": r.impact,
-        "score": r.score,
-        "owner_id": r.owner_id or "",
-        "updated_at": r.updated_at.isoformat(),
-    } for r in q]
-    return csv_response("risk_summary.csv", rows)
+def risk_summary(
+    request: Request,
+    fresh: bool = False,
+    format: ExportFormatName | None = None,
+    actor=Depends(require_permissions("report:export")),
+):
+    return serve_report(request, "risk-summary", fresh, format)
 
 @router.get("/compliance-gap")
-def compliance_gap(db: Session = Depends(get_db), actor=Depends(require_permissions("report:export"))):
-    q = (
-        db.query(ControlMapping, Control, Framework)
-        .join(Control, Control.id == ControlMapping.control_id)
-        .join(Framework, Framework.id == ControlMapping.framework_id)
-        .order_by(Framework.name.asc(), Control.name.asc())
-        .all()
-    )
-    rows = [{
-        "framework": f.name,
-        "control": c.name,
-        "status": m.status,
-        "notes": m.notes,
-    } for (m, c, f) in q]
-    return csv_response("compliance_gap.csv", rows)
+def compliance_gap(
+    request: Request,
+    fresh: bool = False,
+    format: ExportFormatName | None = None,
+    actor=Depends(require_permissions("report:export")),
+):
+    return serve_report(request, "compliance-gap", fresh, format)
+
+@router.get("/snapshots", response_model=list[ReportSnapshotOut])
+def report_snapshots(report: ReportName | None = None, actor=Depends(require_permissions("report:export"))):
+    # Retained snapshots, newest first, for point-in-time evidence
+    names = [report] if report else list(REPORTS)
+    return [s for name in names for s in list_snapshots(name)]
+
+@router.get("/{report}/snapshots/{snapshot_id}")
+def download_snapshot(request: Request, report: ReportName, snapshot_id: str, actor=Depends(require_permissions("report:export"))):
+    snapshot = get_snapshot(report, snapshot_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    stem = REPORTS[report].filename.removesuffix(".csv")
+    return snapshot_response(request, snapshot, f"{stem}-{snapshot.id}.csv")
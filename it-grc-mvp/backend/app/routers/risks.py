@@ -1,12 +1,22 @@
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Request
+from typing import Literal
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from sqlalchemy import case, func, insert, select
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_read_db, get_uow
 from app.models.risk import Risk
-from app.schemas.risk import RiskCreate, RiskOut, RiskUpdate
-from app.core.rbac import get_current_user, require_permissions
+from app.models.user import User
+from app.schemas.imports import ImportResult
+from app.schemas.risk import RiskCreate, RiskOut, RiskUpdate, RiskHeatmap, RiskHeatmapCell, RiskRollupRow
+from app.core.bulk import ImportTracker, batched, iter_upload_rows, upload_format
+from app.core.config import settings
+from app.core.pagination import PageParams, keyset_page
+from app.core.serialization import list_query, rows_response
+from app.core.rbac import check_permissions, get_current_user, require_permissions
+from app.core.versions import conditional_get, mark_changed
 from app.core.audit import write_audit
+from app.routers.async_mode import keep_sync
 
 router = APIRouter(prefix="/risks", tags=["risks"])
 
@@ -17,8 +27,16 @@ def validate_scale(v: int, field: str):
     if v < 1 or v > 3:
         raise HTTPException(status_code=400, detail=f"{field} must be 1..3")
 
+SCALE = range(1, 4)
+
+# Score bands over the 3x3 matrix (possible scores 1, 2, 3, 4, 6, 9)
+SCORE_BANDS = [("LOW", 1, 2), ("MEDIUM", 3, 4), ("HIGH", 6, 9)]
+
+def score_band():
+    return case(*[(Risk.score.between(lo, hi), name) for name, lo, hi in SCORE_BANDS], else_="UNSCORED")
+
 @router.post("", response_model=RiskOut)
-def create_risk(payload: RiskCreate, request: Request, db: Session = Depends(get_db), actor=Depends(require_permissions("risk:write"))):
+def create_risk(payload: RiskCreate, request: Request, db: Session = Depends(get_uow, scope="function"), actor=Depends(require_permissions("risk:write"))):
     validate_scale(payload.likelihood, "likelihood")
     validate_scale(payload.impact, "impact")
     r = Risk(
@@ -32,22 +50,111 @@ def create_risk(payload: RiskCreate, request: Request, db: Session = Depends(get
         updated_at=datetime.utcnow(),
     )
     db.add(r)
-    db.commit()
-    db.refresh(r)
+    db.flush()
+    mark_changed(db, Risk)
 
     write_audit(db, actor.id, "RISK_CREATE", "Risk", str(r.id), ip=request.client.host if request.client else "", details=f"score={r.score}")
     return r
 
+@router.post("/import", response_model=ImportResult)
+@keep_sync
+def import_risks(
+    request: Request,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_uow, scope="function"),
+    actor=Depends(require_permissions("risk:write")),
+):
+    fmt = upload_format(file)
+    tracker = ImportTracker(fmt)
+    now = datetime.utcnow()
+    rows = tracker.validated(iter_upload_rows(file, fmt), RiskCreate)
+    for batch in batched(rows, settings.IMPORT_BATCH_SIZE):
+        owner_ids = {p.owner_id for _, p in batch if p.owner_id is not None}
+        known_owners = set(db.scalars(select(User.id).where(User.id.in_(owner_ids)))) if owner_ids else set()
+        values = []
+        for n, p in batch:
+            bad = [f for f in ("likelihood", "impact") if not 1 <= getattr(p, f) <= 3]
+            if bad:
+                tracker.error(n, "; ".join(f"{f} must be 1..3" for f in bad))
+                continue
+            if p.owner_id is not None and p.owner_id not in known_owners:
+                tracker.error(n, f"Unknown owner_id {p.owner_id}")
+                continue
+            values.append({
+                **p.model_dump(),
+                "score": compute_score(p.likelihood, p.impact),
+                "created_at": now,
+                "updated_at": now,
+            })
+        if values:
+            db.execute(insert(Risk), values)
+            tracker.result.imported += len(values)
+
+    mark_changed(db, Risk)
+    write_audit(db, actor.id, "RISK_IMPORT", "Risk", "bulk", ip=request.client.host if request.client else "", details=tracker.summary())
+    return tracker.result
+
+@router.get("/heatmap", response_model=RiskHeatmap)
+def risk_heatmap(owner_id: int | None = None, db: Session = Depends(get_read_db), actor=Depends(require_permissions("risk:read"))):
+    stmt = select(Risk.likelihood, Risk.impact, func.count()).group_by(Risk.likelihood, Risk.impact)
+    if owner_id is not None:
+        stmt = stmt.where(Risk.owner_id == owner_id)
+    counts = {(likelihood, impact): n for likelihood, impact, n in db.execute(stmt)}
+    cells = [
+        RiskHeatmapCell(
+            likelihood=likelihood, impact=impact,
+            score=compute_score(likelihood, impact), count=counts.get((likelihood, impact), 0),
+        )
+        for likelihood in SCALE for impact in SCALE
+    ]
+    return RiskHeatmap(total=sum(counts.values()), cells=cells)
+
+@router.get("/rollup", response_model=list[RiskRollupRow])
+def risk_rollup(by: Literal["owner", "band"] = "band", db: Session = Depends(get_read_db), actor=Depends(require_permissions("risk:read"))):
+    key = Risk.owner_id if by == "owner" else score_band()
+    stmt = (
+        select(key.label("key"), func.count(), func.avg(Risk.score), func.max(Risk.score))
+        .group_by(key)
+        .order_by(func.max(Risk.score).desc(), func.count().desc())
+    )
+    return [
+        RiskRollupRow(key="unassigned" if k is None else str(k), count=n, avg_score=round(float(avg), 2), max_score=mx)
+        for k, n, avg, mx in db.execute(stmt)
+    ]
+
 @router.get("", response_model=list[RiskOut])
-def list_risks(db: Session = Depends(get_db), actor=Depends(require_permissions("risk:read"))):
-    return db.query(Risk).order_by(Risk.score.desc(), Risk.updated_at.desc()).all()
+def list_risks(
+    response: Response,
+    page: PageParams = Depends(),
+    owner_id: int | None = None,
+    min_score: int | None = Query(None, ge=1, le=9),
+    max_score: int | None = Query(None, ge=1, le=9),
+    updated_from: datetime | None = None,
+    updated_to: datetime | None = None,
+    db: Session = Depends(get_read_db),
+    actor=Depends(require_permissions("risk:read")),
+    _etag=Depends(conditional_get(Risk)),
+):
+    q = list_query(db, RiskOut, Risk)
+    if owner_id is not None:
+        q = q.filter(Risk.owner_id == owner_id)
+    if min_score is not None:
+        q = q.filter(Risk.score >= min_score)
+    if max_score is not None:
+        q = q.filter(Risk.score <= max_score)
+    if updated_from is not None:
+        q = q.filter(Risk.updated_at >= updated_from)
+    if updated_to is not None:
+        q = q.filter(Risk.updated_at < updated_to)
+    rows = keyset_page(q, [Risk.score, Risk.updated_at, Risk.id], page, response, descending=True)
+    return rows_response(RiskOut, rows, response)
 
 @router.patch("/{risk_id}", response_model=RiskOut)
 def update_risk(
     risk_id: int,
     payload: RiskUpdate,
     request: Request,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow, scope="function"),
     user=Depends(get_current_user),
 ):
     r = db.query(Risk).filter(Risk.id == risk_id).first()
@@ -58,7 +165,7 @@ def update_risk(
     # If not owner, require risk:write
     if r.owner_id != user.id:
         # This will 403 if missing
-        require_permissions("risk:write")(user)
+        check_permissions(user, "risk:write")
 
     if payload.likelihood is not None:
         validate_scale(payload.likelihood, "likelihood")
@@ -77,9 +184,8 @@ def update_risk(
 
     r.score = compute_score(r.likelihood, r.impact)
     r.updated_at = datetime.utcnow()
-
-    db.commit()
-    db.refresh(r)
+    db.flush()
+    mark_changed(db, Risk)
 
     write_audit(db, user.id, "RISK_UPDATE", "Risk", str(r.id), ip=request.client.host if request.client else "", details=f"score={r.score}")
     return r
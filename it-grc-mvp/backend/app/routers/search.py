@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.db.session import get_read_db
+from app.core.rbac import Principal, check_permissions, get_current_user
+from app.core.search import SOURCES, search
+from app.schemas.search import SearchHit
+
+router = APIRouter(tags=["search"])
+
+@router.get("/search", response_model=list[SearchHit])
+def search_all(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to match; `word*` matches a prefix"),
+    types: list[Literal["risk", "control", "audit"]] | None = Query(None, alias="type"),
+    limit: int = Query(20, ge=1, le=100),
+    created_from: datetime | None = Query(None, description="Risks: updated_at; audit: created_at"),
+    created_to: datetime | None = None,
+    db: Session = Depends(get_read_db),
+    user: Principal = Depends(get_current_user),
+):
+    # Explicitly requested types need their *:read permission (403 otherwise);
+    # without `type`, every type the caller may read is searched.
+    if types:
+        sources = [s for s in SOURCES if s.type in types]
+        for s in sources:
+            check_permissions(user, s.permission)
+    else:
+        sources = [s for s in SOURCES if s.permission in user.permissions]
+    return search(db, q, sources, limit, created_from, created_to)
@@ -1,37 +1,61 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, selectinload
 
-from app.db.session import get_db
+from app.db.session import get_read_db, get_uow, on_commit
 from app.models.user import User, Role
 from app.schemas.user import UserCreate, UserOut, RoleAssign
-from app.core.security import hash_password
-from app.core.rbac import require_permissions
+from app.core.hashing import hasher
+from app.core.pagination import PageParams, keyset_page
+from app.core.serialization import rows_response
+from app.core.rbac import invalidate_principal, require_permissions
 from app.core.audit import write_audit
 
 router = APIRouter(prefix="/users", tags=["users"])
 
-@router.post("", response_model=UserOut)
-def create_user(payload: UserCreate, db: Session = Depends(get_db), actor=Depends(require_permissions("user:write"))):
-    if db.query(User).filter(User.email == payload.email).first():
-        raise HTTPException(status_code=409, detail="Email already exists")
+def _email_taken(db: Session, email: str) -> bool:
+    return db.query(User.id).filter(User.email == email).first() is not None
 
-    u = User(email=payload.email, full_name=payload.full_name, password_hash=hash_password(payload.password))
+def _insert_user(db: Session, actor_id: int, payload: UserCreate, password_hash: str) -> UserOut:
+    u = User(email=payload.email, full_name=payload.full_name, password_hash=password_hash, roles=[])
     db.add(u)
-    db.commit()
-    db.refresh(u)
+    db.flush()
 
-    write_audit(db, actor.id, "USER_CREATE", "User", str(u.id), details=f"email={u.email}")
+    write_audit(db, actor_id, "USER_CREATE", "User", str(u.id), details=f"email={u.email}")
 
     return UserOut(id=u.id, email=u.email, full_name=u.full_name, roles=[r.name for r in u.roles])
 
+@router.post("", response_model=UserOut)
+async def create_user(
+    payload: UserCreate,
+    actor=Depends(require_permissions("user:write")),
+    db: Session = Depends(get_uow, scope="function"),
+):
+    # async so the request holds no threadpool thread while the hash runs in the hashing
+    # pool; hashed only once the caller is authorised and the email is free
+    if await run_in_threadpool(_email_taken, db, payload.email):
+        raise HTTPException(status_code=409, detail="Email already exists")
+    password_hash = await hasher.hash(payload.password)
+    return await run_in_threadpool(_insert_user, db, actor.id, payload, password_hash)
+
 @router.get("", response_model=list[UserOut])
-def list_users(db: Session = Depends(get_db), actor=Depends(require_permissions("user:read"))):
-    users = db.query(User).all()
-    return [UserOut(id=u.id, email=u.email, full_name=u.full_name, roles=[r.name for r in u.roles]) for u in users]
+def list_users(
+    response: Response,
+    page: PageParams = Depends(),
+    email_prefix: str | None = None,
+    db: Session = Depends(get_read_db),
+    actor=Depends(require_permissions("user:read")),
+):
+    q = db.query(User).options(selectinload(User.roles))
+    if email_prefix:
+        q = q.filter(User.email.startswith(email_prefix, autoescape=True))
+    users = keyset_page(q, [User.id], page, response)
+    rows = [{"id": u.id, "email": u.email, "full_name": u.full_name, "roles": [r.name for r in u.roles]} for u in users]
+    return rows_response(UserOut, rows, response)
 
 @router.post("/{user_id}/roles", response_model=UserOut)
-def assign_roles(user_id: int, payload: RoleAssign, db: Session = Depends(get_db), actor=Depends(require_permissions("user:write"))):
-    u = db.query(User).filter(User.id == user_id).first()
+def assign_roles(user_id: int, payload: RoleAssign, db: Session = Depends(get_uow, scope="function"), actor=Depends(require_permissions("user:write"))):
+    u = db.query(User).options(selectinload(User.roles)).filter(User.id == user_id).first()
     if not u:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -42,8 +66,8 @@ def assign_roles(user_id: int, payload: RoleAssign, db: Session = Depends(get_db
         raise HTTPException(status_code=400, detail=f"Unknown roles: {missing}")
 
     u.roles = roles
-    db.commit()
-    db.refresh(u)
+    db.flush()
+    on_commit(db, lambda: invalidate_principal(u.email))
 
     write_audit(db, actor.id, "USER_ROLE_ASSIGN", "User", str(u.id), details="roles=" + ",".join(payload.roles))
 
@@ -1,3 +1,4 @@
+from typing import Literal
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -17,3 +18,21 @@ class AccessRequestOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+class AccessDecision(BaseModel):
+    id: int
+    decision: Literal["APPROVE", "DENY"]
+
+class AccessDecisionBatch(BaseModel):
+    decisions: list[AccessDecision]
+
+class AccessDecisionOutcome(BaseModel):
+    id: int
+    # APPROVED / DENIED: decided by this batch; already_decided: someone else got there first
+    outcome: Literal["APPROVED", "DENIED", "already_decided", "not_found"]
+    status: str | None  # the request's status after the batch
+
+class AccessDecisionResult(BaseModel):
+    decided: int
+    skipped: int
+    results: list[AccessDecisionOutcome]
@@ -13,3 +13,31 @@ class AuditOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+class AuditCheckpointOut(BaseModel):
+    seq: int
+    chain_hash: str
+    signature: str
+    created_at: datetime
+    verified_at: datetime | None
+
+    class Config:
+        from_attributes = True
+
+class AuditChainBreak(BaseModel):
+    seq: int
+    reason: str
+
+class AuditVerification(BaseModel):
+    ok: bool
+    from_seq: int
+    to_seq: int
+    rows: int
+    chunks: int
+    workers: int
+    seconds: float
+    # Set when the range began in rows already archived: checking starts at this seq
+    unanchored_from: int | None
+    breaks: list[AuditChainBreak]
+    breaks_truncated: bool
+    checkpoint: AuditCheckpointOut | None
@@ -13,6 +13,15 @@ class ControlMappingCreate(BaseModel):
     status: str = "PARTIAL"
     notes: str = ""
 
+class ControlMappingImport(BaseModel):
+    # Reference the control/framework by id or by name
+    control_id: int | None = None
+    framework_id: int | None = None
+    control: str | None = None
+    framework: str | None = None
+    status: str = "PARTIAL"
+    notes: str = ""
+
 class FrameworkOut(BaseModel):
     id: int
     name: str
@@ -34,3 +43,21 @@ class ControlMappingOut(BaseModel):
     notes: str
     class Config:
         from_attributes = True
+
+class FrameworkCoverage(BaseModel):
+    framework_id: int
+    framework: str
+    total_controls: int
+    mapped: int
+    unmapped: int
+    status_counts: dict[str, int]
+    compliant_pct: float
+
+class ControlCoverage(BaseModel):
+    control_id: int
+    control: str
+    statuses: dict[int, str]  # framework_id -> status; frameworks without a mapping are omitted
+
+class CoverageMatrix(BaseModel):
+    frameworks: list[FrameworkCoverage]
+    controls: list[ControlCoverage]
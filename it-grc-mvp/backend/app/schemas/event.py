@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from datetime import datetime
+
+class ChangeEventOut(BaseModel):
+    # seq of the audit row; the SSE event id
+    seq: int
+    action: str
+    entity_type: str
+    entity_id: str
+    actor_user_id: int | None
+    details: str
+    created_at: datetime
+
+class EventPage(BaseModel):
+    events: list[ChangeEventOut]
+    # Pass back as `after` on the next poll (covers events filtered out too)
+    last_event_id: int
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+class ImportResult(BaseModel):
+    format: str
+    received: int = 0
+    imported: int = 0
+    # Valid rows not written: duplicates within the upload, or (frameworks) names that already exist
+    skipped: int = 0
+    failed: int = 0
+    errors: list[ImportRowError] = []
+    errors_truncated: bool = False
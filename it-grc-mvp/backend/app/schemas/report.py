@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from datetime import datetime
+
+class ReportSnapshotOut(BaseModel):
+    report: str
+    id: str
+    created_at: datetime
+    size: int
+    # Digest of the report tables' change versions; equal keys hold the same data
+    data_key: str
+
+    class Config:
+        from_attributes = True
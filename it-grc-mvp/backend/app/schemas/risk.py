@@ -31,3 +31,19 @@ class RiskOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+class RiskHeatmapCell(BaseModel):
+    likelihood: int
+    impact: int
+    score: int
+    count: int
+
+class RiskHeatmap(BaseModel):
+    total: int
+    cells: list[RiskHeatmapCell]
+
+class RiskRollupRow(BaseModel):
+    key: str
+    count: int
+    avg_score: float
+    max_score: int
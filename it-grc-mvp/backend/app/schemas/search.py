@@ -0,0 +1,10 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+class SearchHit(BaseModel):
+    type: Literal["risk", "control", "audit"]
+    id: int
+    title: str
+    snippet: str
+    score: float
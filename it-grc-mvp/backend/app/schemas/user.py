@@ -7,7 +7,7 @@ class UserCreate(BaseModel):
 
 class UserOut(BaseModel):
     id: int
-    email: EmailStr
+    email: str  # validated on input; the seeded demo accounts use a bare `@local` domain
     full_name: str
     roles: list[str]
 
@@ -1,130 +1,108 @@
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
+from app.core.bulk import upsert
+from app.core.rbac import invalidate_all_principals
+from app.core.versions import mark_changed
 from app.core.security import hash_password
-from app.models.user import User, Role, Permission
+from app.models.user import User, Role, Permission, role_permissions, user_roles
 from app.models.compliance import Framework, Control, ControlMapping
 
-def ensure_role(db: Session, name: str) -> Role:
-    r = db.query(Role).filter(Role.name == name).first()
-    if not r:
-        r = Role(name=name)
-        db.add(r)
-        db.commit()
-        db.refresh(r)
-    return r
+DEMO_PASSWORD = "ChangeMe123!"
 
-def ensure_perm(db: Session, code: str) -> Permission:
-    p = db.query(Permission).filter(Permission.code == code).first()
-    if not p:
-        p = Permission(code=code)
-        db.add(p)
-        db.commit()
-        db.refresh(p)
-    return p
-
-def attach_perms(db: Session, role: Role, perm_codes: list[str]):
-    perms = [ensure_perm(db, c) for c in perm_codes]
-    role.permissions = perms
-    db.commit()
-
-def ensure_user(db: Session, email: str, full_name: str, password: str) -> User:
-    u = db.query(User).filter(User.email == email).first()
-    if not u:
-        u = User(email=email, full_name=full_name, password_hash=hash_password(password))
-        db.add(u)
-        db.commit()
-        db.refresh(u)
-    return u
-
-def ensure_framework(db: Session, name: str) -> Framework:
-    f = db.query(Framework).filter(Framework.name == name).first()
-    if not f:
-        f = Framework(name=name)
-        db.add(f)
-        db.commit()
-        db.refresh(f)
-    return f
-
-def ensure_control(db: Session, name: str, desc: str) -> Control:
-    c = db.query(Control).filter(Control.name == name).first()
-    if not c:
-        c = Control(name=name, description=desc)
-        db.add(c)
-        db.commit()
-        db.refresh(c)
-    return c
-
-def ensure_mapping(db: Session, control_id: int, framework_id: int, status: str, notes: str):
-    m = db.query(ControlMapping).filter(
-        ControlMapping.control_id == control_id,
-        ControlMapping.framework_id == framework_id
-    ).first()
-    if not m:
-        m = ControlMapping(control_id=control_id, framework_id=framework_id, status=status, notes=notes)
-        db.add(m)
-        db.commit()
-        db.refresh(m)
-    return m
-
-def run_seed(db: Session):
-    # Roles
-    admin = ensure_role(db, "Admin")
-    manager = ensure_role(db, "Manager")
-    auditor = ensure_role(db, "Auditor")
-    employee = ensure_role(db, "Employee")
-
-    # Permissions
-    attach_perms(db, admin, [
+ROLE_PERMISSIONS = {
+    "Admin": [
         "user:read", "user:write",
         "access:read", "access:approve",
         "risk:read", "risk:write",
         "compliance:read", "compliance:write",
-        "audit:read",
+        "audit:read", "audit:verify",
         "report:export",
-    ])
-    attach_perms(db, manager, [
+    ],
+    "Manager": [
         "access:read", "access:approve",
         "risk:read", "risk:write",
         "compliance:read", "compliance:write",
         "report:export",
-    ])
-    attach_perms(db, auditor, [
+    ],
+    "Auditor": [
         "user:read",
         "access:read",
         "risk:read",
         "compliance:read",
-        "audit:read",
+        "audit:read", "audit:verify",
         "report:export",
-    ])
-    attach_perms(db, employee, [
+    ],
+    "Employee": [
         "access:read",
         "risk:read",
         "compliance:read",
-    ])
+    ],
+}
+
+# email, full name, role
+USERS = [
+    ("admin@local", "System Admin", "Admin"),
+    ("manager@local", "IT Manager", "Manager"),
+    ("auditor@local", "Security Auditor", "Auditor"),
+    ("employee@local", "Employee", "Employee"),
+]
+
+FRAMEWORKS = ["ISO 27001", "SOC 2", "GDPR"]
+
+CONTROLS = [
+    ("Access Reviews", "Periodic review of user access entitlements."),
+    ("MFA Enabled", "Multi-factor authentication required for privileged access."),
+    ("Audit Logging", "Security-relevant events are logged and monitored."),
+]
 
-    # Users
-    admin_user = ensure_user(db, "admin@local", "System Admin", "ChangeMe123!")
-    mgr_user = ensure_user(db, "manager@local", "IT Manager", "ChangeMe123!")
-    aud_user = ensure_user(db, "auditor@local", "Security Auditor", "ChangeMe123!")
-    emp_user = ensure_user(db, "employee@local", "Employee", "ChangeMe123!")
+# control, framework, status, notes
+MAPPINGS = [
+    ("Access Reviews", "ISO 27001", "COMPLIANT", "Quarterly reviews scheduled."),
+    ("MFA Enabled", "SOC 2", "COMPLIANT", "MFA enforced for admin roles."),
+    ("Audit Logging", "GDPR", "PARTIAL", "Logging enabled; retention policy in progress."),
+]
 
-    admin_user.roles = [admin]
-    mgr_user.roles = [manager]
-    aud_user.roles = [auditor]
-    emp_user.roles = [employee]
-    db.commit()
+def _ids(db: Session, model, key, names) -> dict[str, int]:
+    return dict(db.execute(select(key, model.id).where(key.in_(list(names)))).all())
+
+def run_seed(db: Session):
+    # Idempotent bulk upserts: a fixed number of statements regardless of what already
+    # exists. Role permissions and the demo users' role assignments are reset to the
+    # values above. The caller commits.
+    perm_codes = sorted({c for codes in ROLE_PERMISSIONS.values() for c in codes})
+    db.execute(upsert(db, Role).values([{"name": n} for n in ROLE_PERMISSIONS]).on_conflict_do_nothing(index_elements=["name"]))
+    db.execute(upsert(db, Permission).values([{"code": c} for c in perm_codes]).on_conflict_do_nothing(index_elements=["code"]))
+    roles = _ids(db, Role, Role.name, ROLE_PERMISSIONS)
+    perms = _ids(db, Permission, Permission.code, perm_codes)
+
+    db.execute(delete(role_permissions).where(role_permissions.c.role_id.in_(list(roles.values()))))
+    db.execute(role_permissions.insert(), [
+        {"role_id": roles[r], "permission_id": perms[c]} for r, codes in ROLE_PERMISSIONS.items() for c in codes
+    ])
 
-    # Frameworks
-    iso = ensure_framework(db, "ISO 27001")
-    soc2 = ensure_framework(db, "SOC 2")
-    gdpr = ensure_framework(db, "GDPR")
+    # Hash the demo password once, and only if some demo user is missing
+    emails = [e for e, _, _ in USERS]
+    existing = set(db.scalars(select(User.email).where(User.email.in_(emails))))
+    if len(existing) < len(emails):
+        pw_hash = hash_password(DEMO_PASSWORD)
+        db.execute(upsert(db, User).values([
+            {"email": e, "full_name": n, "password_hash": pw_hash} for e, n, _ in USERS if e not in existing
+        ]).on_conflict_do_nothing(index_elements=["email"]))
+    users = _ids(db, User, User.email, emails)
+    db.execute(delete(user_roles).where(user_roles.c.user_id.in_(list(users.values()))))
+    db.execute(user_roles.insert(), [{"user_id": users[e], "role_id": roles[r]} for e, _, r in USERS])
 
-    # Controls
-    c1 = ensure_control(db, "Access Reviews", "Periodic review of user access entitlements.")
-    c2 = ensure_control(db, "MFA Enabled", "Multi-factor authentication required for privileged access.")
-    c3 = ensure_control(db, "Audit Logging", "Security-relevant events are logged and monitored.")
+    db.execute(upsert(db, Framework).values([{"name": n} for n in FRAMEWORKS]).on_conflict_do_nothing(index_elements=["name"]))
+    db.execute(upsert(db, Control).values([
+        {"name": n, "description": d} for n, d in CONTROLS
+    ]).on_conflict_do_nothing(index_elements=["name"]))
+    frameworks = _ids(db, Framework, Framework.name, FRAMEWORKS)
+    controls = _ids(db, Control, Control.name, [n for n, _ in CONTROLS])
+    db.execute(upsert(db, ControlMapping).values([
+        {"control_id": controls[c], "framework_id": frameworks[f], "status": s, "notes": notes}
+        for c, f, s, notes in MAPPINGS
+    ]).on_conflict_do_nothing(index_elements=["control_id", "framework_id"]))
 
-    # Mappings
-    ensure_mapping(db, c1.id, iso.id, "COMPLIANT", "Quarterly reviews scheduled.")
-    ensure_mapping(db, c2.id, soc2.id, "COMPLIANT", "MFA enforced for admin roles.")
-    ensure_mapping(db, c3.id, gdpr.id, "PARTIAL", "Logging enabled; retention policy in progress.")
+    mark_changed(db, Framework, Control, ControlMapping)
+    invalidate_all_principals()
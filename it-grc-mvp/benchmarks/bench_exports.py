@@ -0,0 +1,63 @@
+"""Size and time of report/audit exports per format (CSV, gzip NDJSON, Arrow IPC, Parquet).
+
+    python benchmarks/bench_exports.py --rows 100000
+
+Uses DATABASE_URL when set (e.g. a local Postgres), otherwise a temporary SQLite file.
+Generates `--rows` risks, access requests and audit rows with datagen.py (or reuses the
+database with `--skip-generate`), then downloads each export once per format. Sizes are
+bytes on the wire (gzip NDJSON before decoding); ratio is CSV size / format size.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("JWT_SECRET", "bench")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.seed import DEMO_PASSWORD  # noqa: E402
+from datagen import generate  # noqa: E402
+
+ENDPOINTS = ["/audit/export", "/reports/risk-summary?fresh=true", "/reports/access-reviews?fresh=true"]
+FORMATS = ["csv", "ndjson", "arrow", "parquet"]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000, help="Rows generated per table")
+    parser.add_argument("--skip-generate", action="store_true", help="Benchmark DATABASE_URL as it is")
+    args = parser.parse_args()
+
+    results = {}
+    with TestClient(app) as client:  # startup bootstraps the schema + seed data
+        if not args.skip_generate:
+            with SessionLocal() as db:
+                generate(db, risks=args.rows, access_requests=args.rows, audit_rows=args.rows)
+        token = client.post("/auth/login", data={"username": "admin@local", "password": DEMO_PASSWORD}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}", "Accept-Encoding": "gzip"}
+        for path in ENDPOINTS:
+            out = {}
+            for fmt in FORMATS:
+                sep = "&" if "?" in path else "?"
+                t0 = time.perf_counter()
+                with client.stream("GET", f"{path}{sep}format={fmt}", headers=headers) as resp:
+                    resp.raise_for_status()
+                    for _ in resp.iter_raw():
+                        pass
+                    size = resp.num_bytes_downloaded
+                out[fmt] = {"bytes": size, "ms": round((time.perf_counter() - t0) * 1000, 1)}
+            for fmt in FORMATS:
+                out[fmt]["ratio"] = round(out["csv"]["bytes"] / out[fmt]["bytes"], 2)
+            results[path] = out
+
+    print(json.dumps({"database": engine.url.get_backend_name(), "endpoints": results}, indent=2))
+
+if __name__ == "__main__":
+    main()
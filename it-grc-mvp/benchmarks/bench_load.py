@@ -0,0 +1,154 @@
+"""In-process load test: throughput and p50/p95/p99 latency per route on a generated dataset.
+
+    python benchmarks/bench_load.py --concurrency 16 --requests 400 --output results.json
+    python benchmarks/bench_load.py --skip-generate --compare baseline.json   # reuse an existing DATABASE_URL
+
+Uses DATABASE_URL when set (e.g. a local Postgres), otherwise a temporary SQLite file.
+The dataset is built with datagen.py (same size flags), then the app is driven through
+httpx's ASGI transport by `--concurrency` clients, each cycling through ROUTES as one of
+the demo users. `--compare` reports the change in p95 against an earlier result file and
+exits non-zero when any route regressed by more than `--max-regression` percent.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("JWT_SECRET", "bench")
+
+import httpx  # noqa: E402
+from datagen import add_arguments, generate_from_args  # noqa: E402
+
+from app.db.session import engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.seed import DEMO_PASSWORD  # noqa: E402
+
+# (user, method, path): read-heavy mix over the list, dashboard and report endpoints
+ROUTES = [
+    ("admin@local", "GET", "/risks"),
+    ("admin@local", "GET", "/risks?min_score=6"),
+    ("admin@local", "GET", "/risks/heatmap"),
+    ("admin@local", "GET", "/risks/rollup?by=owner"),
+    ("manager@local", "GET", "/access-requests?status=PENDING"),
+    ("auditor@local", "GET", "/audit"),
+    ("auditor@local", "GET", "/users"),
+    ("auditor@local", "GET", "/compliance/mappings"),
+    ("auditor@local", "GET", "/compliance/coverage"),
+    ("employee@local", "GET", "/auth/me"),
+]
+
+def percentile(sorted_ms: list[float], p: float) -> float:
+    # nearest-rank
+    if not sorted_ms:
+        return 0.0
+    k = max(0, min(len(sorted_ms) - 1, round(p / 100 * len(sorted_ms) + 0.5) - 1))
+    return round(sorted_ms[k], 3)
+
+def summarize(latencies: list[float], errors: int, seconds: float) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / seconds, 1) if seconds else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+    }
+
+async def login(client: httpx.AsyncClient, email: str) -> dict:
+    resp = await client.post("/auth/login", data={"username": email, "password": DEMO_PASSWORD})
+    resp.raise_for_status()
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+async def run_load(concurrency: int, requests_per_client: int, warmup: int) -> dict:
+    samples = {f"{m} {p}": [] for _, m, p in ROUTES}
+    errors = dict.fromkeys(samples, 0)
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)  # count 500s as errors
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            headers = {email: await login(client, email) for email in {u for u, _, _ in ROUTES}}
+
+            async def worker(n: int, record: bool):
+                count = requests_per_client if record else warmup
+                for i in range(count):
+                    email, method, path = ROUTES[(n + i) % len(ROUTES)]
+                    t0 = time.perf_counter()
+                    resp = await client.request(method, path, headers=headers[email])
+                    elapsed = (time.perf_counter() - t0) * 1000
+                    if record:
+                        samples[f"{method} {path}"].append(elapsed)
+                        if resp.status_code >= 400:
+                            errors[f"{method} {path}"] += 1
+
+            await asyncio.gather(*(worker(n, False) for n in range(concurrency)))
+            started = time.perf_counter()
+            await asyncio.gather(*(worker(n, True) for n in range(concurrency)))
+            seconds = time.perf_counter() - started
+
+    all_ms = [ms for values in samples.values() for ms in values]
+    return {
+        "seconds": round(seconds, 3),
+        "total": summarize(all_ms, sum(errors.values()), seconds),
+        "routes": {route: summarize(values, errors[route], seconds) for route, values in samples.items()},
+    }
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=Path(__file__).parent)
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+def compare(result: dict, baseline: dict, max_regression: float) -> tuple[dict, bool]:
+    deltas, regressed = {}, False
+    for route, stats in result["routes"].items():
+        before = baseline.get("routes", {}).get(route)
+        if not before or not before["p95_ms"]:
+            continue
+        change = round((stats["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100, 1)
+        deltas[route] = {"p95_ms_before": before["p95_ms"], "p95_ms_after": stats["p95_ms"], "change_pct": change}
+        regressed |= change > max_regression
+    return deltas, regressed
+
+def main():
+    parser = argparse.ArgumentParser()
+    add_arguments(parser)
+    parser.add_argument("--skip-generate", action="store_true", help="Benchmark DATABASE_URL as it is")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per client")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per client")
+    parser.add_argument("--output", help="Write the JSON result to this file as well as stdout")
+    parser.add_argument("--compare", help="Earlier result file to compare p95 against")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="Allowed p95 increase in percent")
+    args = parser.parse_args()
+
+    dataset = None if args.skip_generate else generate_from_args(args)
+    result = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "database": engine.url.get_backend_name(),
+        "dataset": dataset,
+        "concurrency": args.concurrency,
+        **asyncio.run(run_load(args.concurrency, args.requests, args.warmup)),
+    }
+    regressed = False
+    if args.compare:
+        result["comparison"], regressed = compare(result, json.loads(Path(args.compare).read_text()), args.max_regression)
+
+    text = json.dumps(result, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    print(text)
+    sys.exit(1 if regressed else 0)
+
+if __name__ == "__main__":
+    main()
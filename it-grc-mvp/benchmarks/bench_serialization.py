@@ -0,0 +1,73 @@
+"""Rows/sec of large list responses: pydantic response_model path vs the fast JSON path.
+
+    python benchmarks/bench_serialization.py --rows 50000 --repeat 5
+
+Uses DATABASE_URL when set (e.g. a local Postgres), otherwise a temporary SQLite file.
+Generates `--rows` risks, access requests and audit rows with datagen.py (or reuses the
+database with `--skip-generate`), then requests one `--rows`-sized page per list endpoint
+with FAST_LIST_JSON off and on. Times are whole requests (query + serialization),
+median of `--repeat` runs after one warm-up request.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("JWT_SECRET", "bench")
+# One page holds the whole result
+os.environ.setdefault("PAGE_SIZE_MAX", "1000000")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.seed import DEMO_PASSWORD  # noqa: E402
+from datagen import generate  # noqa: E402
+
+ENDPOINTS = ["/risks", "/access-requests", "/audit"]
+
+def timed(client: TestClient, path: str, headers: dict, repeat: int) -> tuple[float, int]:
+    client.get(path, headers=headers).raise_for_status()
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        resp = client.get(path, headers=headers)
+        samples.append(time.perf_counter() - t0)
+        resp.raise_for_status()
+    return statistics.median(samples), len(resp.json())
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000, help="Rows generated per table and requested per page")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-generate", action="store_true", help="Benchmark DATABASE_URL as it is")
+    args = parser.parse_args()
+
+    results = {}
+    with TestClient(app) as client:  # startup bootstraps the schema + seed data
+        if not args.skip_generate:
+            with SessionLocal() as db:
+                generate(db, risks=args.rows, access_requests=args.rows, audit_rows=args.rows)
+        token = client.post("/auth/login", data={"username": "admin@local", "password": DEMO_PASSWORD}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        for path in ENDPOINTS:
+            page = f"{path}?limit={args.rows}"
+            out = {}
+            for mode, fast in (("pydantic", False), ("fast", True)):
+                settings.FAST_LIST_JSON = fast
+                seconds, rows = timed(client, page, headers, args.repeat)
+                out[mode] = {"rows": rows, "ms": round(seconds * 1000, 1), "rows_per_sec": round(rows / seconds)}
+            out["speedup"] = round(out["pydantic"]["ms"] / out["fast"]["ms"], 2)
+            results[path] = out
+
+    print(json.dumps({"database": engine.url.get_backend_name(), "endpoints": results}, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Worker startup cost: first bootstrap vs. restarts with the version marker vs. bootstrap disabled.
+
+    python benchmarks/bench_startup.py --restarts 20
+
+Uses DATABASE_URL when set (e.g. a local Postgres), otherwise a temporary SQLite file.
+Each scenario runs the app's startup hook and records wall time and SQL statements.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("JWT_SECRET", "bench")
+
+from sqlalchemy import event  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.main import on_startup  # noqa: E402
+
+statements = 0
+
+def _count(*args):
+    global statements
+    statements += 1
+
+def run_startup() -> tuple[float, int]:
+    global statements
+    statements = 0
+    t0 = time.perf_counter()
+    on_startup()
+    return (time.perf_counter() - t0) * 1000, statements
+
+def summarize(samples: list[tuple[float, int]]) -> dict:
+    times = [t for t, _ in samples]
+    return {
+        "runs": len(samples),
+        "median_ms": round(statistics.median(times), 3),
+        "max_ms": round(max(times), 3),
+        "statements": samples[-1][1],
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--restarts", type=int, default=20)
+    args = parser.parse_args()
+
+    event.listen(engine, "before_cursor_execute", _count)
+    result = {"database": engine.url.get_backend_name(), "first_boot": summarize([run_startup()])}
+    result["restart_with_marker"] = summarize([run_startup() for _ in range(args.restarts)])
+    settings.BOOTSTRAP_ON_STARTUP = False
+    result["bootstrap_disabled"] = summarize([run_startup() for _ in range(args.restarts)])
+    print(json.dumps(result, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Round trips and latency of a risk write: legacy commit/refresh/audit-commit vs unit of work.
+
+    python benchmarks/bench_uow.py --iterations 500
+
+Uses DATABASE_URL when set (e.g. a local Postgres), otherwise a temporary SQLite file.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("JWT_SECRET", "bench")
+
+from sqlalchemy import event  # noqa: E402
+
+from app.core.audit import write_audit  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402,F401  (imports all models)
+from app.models.audit import AuditLog  # noqa: E402
+from app.models.risk import Risk  # noqa: E402
+
+class RoundTrips:
+    def __init__(self):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._stmt)
+        event.listen(engine, "commit", self._commit)
+
+    def _stmt(self, *args):
+        self.count += 1
+
+    def _commit(self, *args):
+        self.count += 1
+
+def new_risk(i: int) -> Risk:
+    return Risk(title=f"bench {i}", likelihood=2, impact=3, score=6, updated_at=datetime.utcnow())
+
+def legacy_write(i: int) -> None:
+    db = SessionLocal()
+    try:
+        r = new_risk(i)
+        db.add(r)
+        db.commit()
+        db.refresh(r)
+        db.add(AuditLog(actor_user_id=None, action="RISK_CREATE", entity_type="Risk", entity_id=str(r.id), details=f"score={r.score}"))
+        db.commit()
+    finally:
+        db.close()
+
+def uow_write(i: int) -> None:
+    db = SessionLocal(expire_on_commit=False)
+    try:
+        r = new_risk(i)
+        db.add(r)
+        db.flush()
+        write_audit(db, None, "RISK_CREATE", "Risk", str(r.id), details=f"score={r.score}")
+        db.commit()
+    finally:
+        db.close()
+
+def measure(fn, iterations: int, trips: RoundTrips) -> dict:
+    fn(-1)  # warm the pool
+    start_trips = trips.count
+    latencies = []
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        fn(i)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    latencies.sort()
+    return {
+        "round_trips_per_write": (trips.count - start_trips) / iterations,
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p99_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], 3),
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    trips = RoundTrips()
+    result = {
+        "database": engine.url.get_backend_name(),
+        "iterations": args.iterations,
+        "legacy": measure(legacy_write, args.iterations, trips),
+        "unit_of_work": measure(uow_write, args.iterations, trips),
+    }
+    print(json.dumps(result, indent=2))
+
+if __name__ == "__main__":
+    main()
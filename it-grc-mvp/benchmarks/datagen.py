@@ -0,0 +1,219 @@
+"""Synthetic dataset generator for benchmarks, built on the app models.
+
+    python benchmarks/datagen.py --users 1000 --risks 50000 --access-requests 20000 \\
+        --frameworks 10 --controls 500 --audit-rows 2000000
+
+Uses DATABASE_URL when set (e.g. a local Postgres), otherwise a temporary SQLite file.
+Bootstraps the schema + seed data first, then appends rows with batched Core inserts, so
+it can be run repeatedly against the same database to grow it. Generated users are
+`bench-user-<n>@example.com` with the demo password.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("JWT_SECRET", "bench")
+
+from sqlalchemy import func, insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.bootstrap import run_bootstrap  # noqa: E402
+from app.core.security import hash_password  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.models.access import AccessRequest  # noqa: E402
+from app.models.audit import AuditLog  # noqa: E402
+from app.models.compliance import Control, ControlMapping, Framework  # noqa: E402
+from app.models.risk import Risk  # noqa: E402
+from app.models.user import Role, User, user_roles  # noqa: E402
+from app.routers.risks import compute_score  # noqa: E402
+from app.seed import DEMO_PASSWORD  # noqa: E402
+
+USER_EMAIL = "bench-user-{}@example.com"
+# Most generated users are employees; the weights mirror a typical organisation
+ROLE_WEIGHTS = {"Employee": 85, "Manager": 10, "Auditor": 4, "Admin": 1}
+ACCESS_STATUSES = {"PENDING": 30, "APPROVED": 55, "DENIED": 15}
+MAPPING_STATUSES = {"COMPLIANT": 50, "PARTIAL": 35, "NONCOMPLIANT": 15}
+AUDIT_EVENTS = [
+    ("RISK_CREATE", "Risk"), ("RISK_UPDATE", "Risk"),
+    ("ACCESS_REQUEST_CREATE", "AccessRequest"), ("ACCESS_REQUEST_APPROVE", "AccessRequest"),
+    ("ACCESS_REQUEST_DENY", "AccessRequest"), ("USER_CREATE", "User"), ("USER_ROLE_ASSIGN", "User"),
+    ("CONTROL_MAPPING_CREATE", "ControlMapping"),
+]
+
+def _weighted(rng: random.Random, weights: dict[str, int]) -> str:
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+def _next_id(db: Session, model) -> int:
+    return (db.scalar(select(func.max(model.id))) or 0) + 1
+
+def _insert(db: Session, table, rows, batch_size: int) -> int:
+    # executemany per batch: one round trip per batch and bounded memory for millions of rows
+    count = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            db.execute(insert(table), batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        db.execute(insert(table), batch)
+        count += len(batch)
+    return count
+
+def _when(rng: random.Random, now: datetime, days: int) -> datetime:
+    return now - timedelta(seconds=rng.randrange(max(1, days * 86400)))
+
+def generate(
+    db: Session,
+    users: int = 0,
+    risks: int = 0,
+    access_requests: int = 0,
+    frameworks: int = 0,
+    controls: int = 0,
+    mapping_density: float = 0.3,
+    audit_rows: int = 0,
+    history_days: int = 365,
+    batch_size: int = 5000,
+    seed: int = 42,
+) -> dict:
+    # Appends rows and commits after each table. Requires a bootstrapped database
+    # (roles from the seed). Returns the number of rows inserted per table.
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    counts = {}
+
+    roles = dict(db.execute(select(Role.name, Role.id)).all())
+    # Ids come from the database (no explicit ids, so Postgres sequences stay in step);
+    # new rows are found again by id range + name pattern.
+    first_user = _next_id(db, User)
+    n0 = db.scalar(select(func.count()).where(User.email.like(USER_EMAIL.format("%"))))
+    pw_hash = hash_password(DEMO_PASSWORD)  # one hash shared by all generated users
+    counts["users"] = _insert(db, User, (
+        {"email": USER_EMAIL.format(n0 + i), "full_name": f"Bench User {n0 + i}", "password_hash": pw_hash}
+        for i in range(users)
+    ), batch_size)
+    new_users = db.scalars(select(User.id).where(User.id >= first_user, User.email.like(USER_EMAIL.format("%"))))
+    _insert(db, user_roles, (
+        {"user_id": uid, "role_id": roles[_weighted(rng, ROLE_WEIGHTS)]} for uid in new_users.all()
+    ), batch_size)
+    db.commit()
+    user_ids = list(db.scalars(select(User.id)))
+
+    def risk_rows():
+        for i in range(risks):
+            likelihood, impact = rng.randint(1, 3), rng.randint(1, 3)
+            created = _when(rng, now, history_days)
+            yield {
+                "title": f"Risk {i}: {rng.choice(['Vendor', 'Patch', 'Backup', 'Access', 'Phishing'])} exposure",
+                "description": "Generated for benchmarking.",
+                "likelihood": likelihood,
+                "impact": impact,
+                "score": compute_score(likelihood, impact),
+                "owner_id": rng.choice(user_ids),
+                "mitigation_plan": "",
+                "created_at": created,
+                "updated_at": min(now, created + timedelta(days=rng.randrange(30))),
+            }
+    counts["risks"] = _insert(db, Risk, risk_rows(), batch_size)
+    db.commit()
+
+    def access_rows():
+        for i in range(access_requests):
+            status = _weighted(rng, ACCESS_STATUSES)
+            created = _when(rng, now, history_days)
+            decided = status != "PENDING"
+            yield {
+                "resource": f"app-{rng.randrange(200)}",
+                "requested_role": rng.choice(["reader", "editor", "owner"]),
+                "status": status,
+                "requested_by_id": rng.choice(user_ids),
+                "approved_by_id": rng.choice(user_ids) if decided else None,
+                "created_at": created,
+                "decided_at": min(now, created + timedelta(hours=rng.randrange(1, 72))) if decided else None,
+            }
+    counts["access_requests"] = _insert(db, AccessRequest, access_rows(), batch_size)
+    db.commit()
+
+    fw0 = db.scalar(select(func.count()).select_from(Framework))
+    ctl0 = db.scalar(select(func.count()).select_from(Control))
+    fw_names = [f"Bench Framework {fw0 + i}" for i in range(frameworks)]
+    ctl_names = [f"Bench Control {ctl0 + i}" for i in range(controls)]
+    counts["frameworks"] = _insert(db, Framework, ({"name": n} for n in fw_names), batch_size)
+    counts["controls"] = _insert(db, Control, (
+        {"name": n, "description": "Generated for benchmarking."} for n in ctl_names
+    ), batch_size)
+    fw_ids = list(db.scalars(select(Framework.id).where(Framework.name.in_(fw_names)))) if fw_names else []
+    ctl_ids = []
+    for names in (ctl_names[i:i + batch_size] for i in range(0, len(ctl_names), batch_size)):
+        ctl_ids += db.scalars(select(Control.id).where(Control.name.in_(names))).all()
+    counts["control_mappings"] = _insert(db, ControlMapping, (
+        {"control_id": c, "framework_id": f, "status": _weighted(rng, MAPPING_STATUSES), "notes": ""}
+        for c in ctl_ids for f in fw_ids if rng.random() < mapping_density
+    ), batch_size)
+    db.commit()
+
+    def log_rows():
+        for _ in range(audit_rows):
+            action, entity_type = rng.choice(AUDIT_EVENTS)
+            yield {
+                "actor_user_id": rng.choice(user_ids),
+                "action": action,
+                "entity_type": entity_type,
+                "entity_id": str(rng.randrange(1, max(2, risks, access_requests))),
+                "ip": f"10.0.{rng.randrange(256)}.{rng.randrange(256)}",
+                "details": "",
+                "created_at": _when(rng, now, history_days),
+            }
+    counts["audit_logs"] = _insert(db, AuditLog, log_rows(), batch_size)
+    db.commit()
+    return counts
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--risks", type=int, default=5000)
+    parser.add_argument("--access-requests", type=int, default=5000)
+    parser.add_argument("--frameworks", type=int, default=5)
+    parser.add_argument("--controls", type=int, default=200)
+    parser.add_argument("--mapping-density", type=float, default=0.3, help="Share of framework x control pairs mapped")
+    parser.add_argument("--audit-rows", type=int, default=50000)
+    parser.add_argument("--history-days", type=int, default=365)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+
+def generate_from_args(args: argparse.Namespace) -> dict:
+    run_bootstrap()
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        counts = generate(
+            db,
+            users=args.users,
+            risks=args.risks,
+            access_requests=args.access_requests,
+            frameworks=args.frameworks,
+            controls=args.controls,
+            mapping_density=args.mapping_density,
+            audit_rows=args.audit_rows,
+            history_days=args.history_days,
+            batch_size=args.batch_size,
+            seed=args.seed,
+        )
+    return {"rows": counts, "seconds": round(time.perf_counter() - started, 3)}
+
+def main():
+    parser = argparse.ArgumentParser()
+    add_arguments(parser)
+    args = parser.parse_args()
+    result = {"database": engine.url.get_backend_name(), **generate_from_args(args)}
+    print(json.dumps(result, indent=2))
+
+if __name__ == "__main__":
+    main()
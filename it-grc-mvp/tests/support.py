@@ -0,0 +1,55 @@
+import os
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+# Settings are read at import time, so point the app at a throwaway SQLite DB first.
+_TMP = tempfile.mkdtemp(prefix="itgrc-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_TMP}/test.db")
+os.environ.setdefault("JWT_SECRET", "test-secret")
+os.environ.setdefault("REPORT_SNAPSHOT_DIR", f"{_TMP}/report_snapshots")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+
+from app.main import app  # noqa: E402
+
+DEMO_PASSWORD = "ChangeMe123!"
+
+def make_client() -> TestClient:
+    client = TestClient(app)
+    client.__enter__()  # runs startup (create tables + seed)
+    return client
+
+def auth_headers(client: TestClient, email: str = "admin@local", password: str = DEMO_PASSWORD) -> dict:
+    resp = client.post("/auth/login", data={"username": email, "password": password})
+    resp.raise_for_status()
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+class QueryCounter:
+    def __init__(self):
+        self.statements: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, *args):
+        # The /events listener polls in the background whatever the request does
+        if threading.current_thread().name != "event-listener":
+            self.statements.append(statement)
+
+@contextmanager
+def count_queries():
+    # Counts SQL statements on every engine (sync, async and replicas) inside the block
+    counter = QueryCounter()
+    event.listen(Engine, "before_cursor_execute", counter._record)
+    try:
+        yield counter
+    finally:
+        event.remove(Engine, "before_cursor_execute", counter._record)
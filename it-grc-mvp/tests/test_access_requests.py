@@ -0,0 +1,75 @@
+import unittest
+
+from support import auth_headers, count_queries, make_client
+
+from app.db.session import SessionLocal
+from app.models.audit import AuditLog
+
+class AccessDecisionTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = make_client()
+        cls.headers = auth_headers(cls.client)
+
+    def _create(self) -> int:
+        resp = self.client.post("/access-requests", headers=self.headers, json={"resource": "vpn", "requested_role": "user"})
+        self.assertEqual(resp.status_code, 200)
+        return resp.json()["id"]
+
+    def _audit_actions(self, req_id: int) -> list[str]:
+        db = SessionLocal()
+        try:
+            rows = db.query(AuditLog).filter(AuditLog.entity_type == "AccessRequest", AuditLog.entity_id == str(req_id))
+            return sorted(a.action for a in rows)
+        finally:
+            db.close()
+
+    def test_decision_commits_with_its_audit_row(self):
+        req_id = self._create()
+        resp = self.client.post(f"/access-requests/{req_id}/approve", headers=self.headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["status"], "APPROVED")
+        self.assertEqual(self._audit_actions(req_id), ["ACCESS_REQUEST_APPROVE", "ACCESS_REQUEST_CREATE"])
+
+    def test_second_decision_is_rejected_without_audit(self):
+        req_id = self._create()
+        self.client.post(f"/access-requests/{req_id}/deny", headers=self.headers)
+        resp = self.client.post(f"/access-requests/{req_id}/approve", headers=self.headers)
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(self._audit_actions(req_id), ["ACCESS_REQUEST_CREATE", "ACCESS_REQUEST_DENY"])
+
+    def test_unknown_request(self):
+        self.assertEqual(self.client.post("/access-requests/999999/approve", headers=self.headers).status_code, 404)
+
+    def test_batch_decisions(self):
+        approve, deny, done = self._create(), self._create(), self._create()
+        self.client.post(f"/access-requests/{done}/deny", headers=self.headers)
+        body = {"decisions": [
+            {"id": approve, "decision": "APPROVE"},
+            {"id": deny, "decision": "DENY"},
+            {"id": done, "decision": "APPROVE"},
+            {"id": 999999, "decision": "DENY"},
+        ]}
+        with count_queries() as queries:
+            resp = self.client.post("/access-requests/decisions", headers=self.headers, json=body)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json(), {"decided": 2, "skipped": 2, "results": [
+            {"id": approve, "outcome": "APPROVED", "status": "APPROVED"},
+            {"id": deny, "outcome": "DENIED", "status": "DENIED"},
+            {"id": done, "outcome": "already_decided", "status": "DENIED"},
+            {"id": 999999, "outcome": "not_found", "status": None},
+        ]})
+        # UPDATE, lookup of the rest, one audit INSERT (+ auth and commit bookkeeping)
+        self.assertEqual(sum(s.lstrip().upper().startswith("UPDATE ACCESS_REQUESTS") for s in queries.statements), 1)
+        self.assertEqual(sum(s.lstrip().upper().startswith("INSERT INTO AUDIT_LOGS") for s in queries.statements), 1)
+        self.assertEqual(self._audit_actions(approve), ["ACCESS_REQUEST_APPROVE", "ACCESS_REQUEST_CREATE"])
+        self.assertEqual(self._audit_actions(deny), ["ACCESS_REQUEST_CREATE", "ACCESS_REQUEST_DENY"])
+        self.assertEqual(self._audit_actions(done), ["ACCESS_REQUEST_CREATE", "ACCESS_REQUEST_DENY"])
+
+    def test_batch_rejects_duplicate_ids(self):
+        req_id = self._create()
+        body = {"decisions": [{"id": req_id, "decision": "APPROVE"}, {"id": req_id, "decision": "DENY"}]}
+        self.assertEqual(self.client.post("/access-requests/decisions", headers=self.headers, json=body).status_code, 422)
+
+if __name__ == "__main__":
+    unittest.main()
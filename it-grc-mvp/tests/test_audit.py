@@ -0,0 +1,98 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from support import make_client
+
+from app.core.audit import AuditWriter, write_audit
+from app.core.audit_archive import archive_audit, iter_archived
+from app.db.session import SessionLocal
+from app.models.audit import AuditLog
+
+def _count(action: str) -> int:
+    db = SessionLocal()
+    try:
+        return db.query(AuditLog).filter(AuditLog.action == action).count()
+    finally:
+        db.close()
+
+class AuditPipelineTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = make_client()
+
+    def test_write_behind_batches_and_drains_on_stop(self):
+        writer = AuditWriter(SessionLocal, batch_size=100, flush_interval=0.05, max_queue=1000, enqueue_timeout=1)
+        for i in range(250):
+            self.assertTrue(writer.submit({
+                "actor_user_id": None, "action": "TEST_WRITE_BEHIND", "entity_type": "Test",
+                "entity_id": str(i), "ip": "", "details": "", "created_at": datetime.utcnow(),
+            }))
+        writer.stop()
+        self.assertEqual(writer.pending(), 0)
+        self.assertEqual(writer.written, 250)
+        self.assertLessEqual(writer.batches, 5)
+        self.assertEqual(_count("TEST_WRITE_BEHIND"), 250)
+
+    def test_bad_record_is_dropped_without_stalling_the_queue(self):
+        writer = AuditWriter(SessionLocal, batch_size=100, flush_interval=0.05, max_queue=1000, enqueue_timeout=1, max_attempts=2)
+        records = [{
+            "actor_user_id": None, "action": None if i == 1 else "TEST_POISON_BATCH", "entity_type": "Test",
+            "entity_id": str(i), "ip": "", "details": "", "created_at": datetime.utcnow(),
+        } for i in range(3)]
+        with mock.patch("app.core.audit.time.sleep") as sleep, self.assertLogs("app.core.audit", "ERROR"):
+            for record in records:
+                writer.submit(record)
+            writer.stop()
+        self.assertEqual(sleep.call_count, 1)  # one backoff for the batch, none per record
+        self.assertEqual((writer.written, writer.dropped), (2, 1))
+        self.assertEqual(_count("TEST_POISON_BATCH"), 2)
+
+    def test_transactional_rows_roll_back_with_caller(self):
+        db = SessionLocal()
+        try:
+            db.query(AuditLog).first()
+            db.info.setdefault("pending_audit", []).append({
+                "actor_user_id": None, "action": "TEST_ROLLED_BACK", "entity_type": "Test",
+                "entity_id": "1", "ip": "", "details": "", "created_at": datetime.utcnow(),
+            })
+            db.rollback()
+            write_audit(db, None, "TEST_COMMITTED", "Test", "2")
+            db.commit()
+        finally:
+            db.close()
+        self.assertEqual(_count("TEST_ROLLED_BACK"), 0)
+        self.assertEqual(_count("TEST_COMMITTED"), 1)
+
+class AuditArchiveTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = make_client()
+
+    def test_old_rows_move_to_segments_and_stay_queryable(self):
+        archive_dir = tempfile.mkdtemp()
+        old = datetime(2020, 1, 15, 12, 0)
+        db = SessionLocal()
+        try:
+            db.add_all([
+                AuditLog(action="TEST_ARCHIVE", entity_type="Risk", entity_id=str(i), created_at=old + timedelta(days=i * 31))
+                for i in range(3)
+            ])
+            db.commit()
+            result = archive_audit(db, datetime(2021, 1, 1), archive_dir)
+            again = archive_audit(db, datetime(2021, 1, 1), archive_dir)
+        finally:
+            db.close()
+
+        self.assertEqual(result["archived"], 3)
+        self.assertEqual(result["segments"], ["audit-2020-01.ndjson.gz", "audit-2020-02.ndjson.gz", "audit-2020-03.ndjson.gz"])
+        self.assertEqual(again["archived"], 0)
+        self.assertEqual(_count("TEST_ARCHIVE"), 0)
+
+        feb = list(iter_archived(datetime(2020, 2, 1), datetime(2020, 3, 1), action="TEST_ARCHIVE", archive_dir=archive_dir))
+        self.assertEqual([r["entity_id"] for r in feb], ["1"])
+        self.assertEqual(feb[0]["created_at"], old + timedelta(days=31))
+
+if __name__ == "__main__":
+    unittest.main()
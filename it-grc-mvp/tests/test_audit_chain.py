@@ -0,0 +1,105 @@
+import unittest
+from unittest import mock
+
+from support import auth_headers, make_client
+from sqlalchemy import select, update
+
+from app.core.audit_chain import link
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.audit import AuditChainHead, AuditLog
+
+class AuditChainTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = make_client()
+        cls.headers = auth_headers(cls.client, "auditor@local")
+        cls.admin = auth_headers(cls.client)
+
+    def verify(self, **params) -> dict:
+        resp = self.client.post("/audit/verify", headers=self.headers, params=params)
+        self.assertEqual(resp.status_code, 200)
+        return resp.json()
+
+    def write(self, n: int) -> None:
+        for i in range(n):
+            resp = self.client.post("/risks", headers=self.admin, json={"title": f"chain {i}", "likelihood": 1, "impact": 1})
+            self.assertEqual(resp.status_code, 200)
+
+    def rechain(self, seq: int, details: str) -> None:
+        # What someone with write access to the table would do to hide an edit
+        db = SessionLocal()
+        try:
+            db.execute(update(AuditLog).where(AuditLog.seq == seq).values(details=details))
+            prev = db.scalar(select(AuditLog.chain_hash).where(AuditLog.seq == seq - 1))
+            cols = [AuditLog.seq, AuditLog.actor_user_id, AuditLog.action, AuditLog.entity_type,
+                    AuditLog.entity_id, AuditLog.ip, AuditLog.details, AuditLog.created_at]
+            for row in db.execute(select(*cols).where(AuditLog.seq >= seq).order_by(AuditLog.seq)).all():
+                prev = link(prev, row._mapping)
+                db.execute(update(AuditLog).where(AuditLog.seq == row.seq).values(chain_hash=prev))
+            db.execute(update(AuditChainHead).values(chain_hash=prev))
+            db.commit()
+        finally:
+            db.close()
+
+    def test_incremental_verification_reads_only_new_rows(self):
+        first = self.verify()
+        self.assertTrue(first["ok"], first["breaks"])
+        self.write(3)
+        second = self.verify()
+        self.assertTrue(second["ok"], second["breaks"])
+        self.assertEqual(second["from_seq"], first["to_seq"] + 1)
+        self.assertEqual(second["rows"], 3)
+        self.assertEqual(second["checkpoint"]["seq"], second["to_seq"])
+        self.assertIsNotNone(second["checkpoint"]["verified_at"])
+        self.assertEqual(self.verify()["rows"], 0)
+
+    def test_parallel_chunks(self):
+        self.write(5)
+        with mock.patch.object(settings, "AUDIT_VERIFY_CHUNK_ROWS", 2):
+            result = self.verify(from_seq=1)
+        self.assertTrue(result["ok"], result["breaks"])
+        self.assertGreater(result["chunks"], 2)
+        self.assertEqual(result["rows"], result["to_seq"])
+
+    def test_edited_row_is_reported(self):
+        self.write(2)
+        db = SessionLocal()
+        try:
+            seq, details = db.execute(select(AuditLog.seq, AuditLog.details).order_by(AuditLog.seq.desc()).limit(1)).one()
+            db.execute(update(AuditLog).where(AuditLog.seq == seq - 1).values(details="edited"))
+            db.commit()
+            result = self.verify(from_seq=1)
+            self.assertFalse(result["ok"])
+            self.assertEqual(result["breaks"], [{"seq": seq - 1, "reason": "hash mismatch"}])
+        finally:
+            db.execute(update(AuditLog).where(AuditLog.seq == seq - 1).values(details=details))
+            db.commit()
+            db.close()
+        self.assertTrue(self.verify(from_seq=1)["ok"])
+
+    def test_rechained_history_contradicts_checkpoint(self):
+        self.write(2)
+        self.assertEqual(self.client.post("/audit/checkpoints", headers=self.headers).status_code, 200)
+        cp = self.client.get("/audit/checkpoints?limit=1", headers=self.headers).json()[0]
+        db = SessionLocal()
+        try:
+            original = db.scalar(select(AuditLog.details).where(AuditLog.seq == cp["seq"] - 1))
+        finally:
+            db.close()
+
+        self.rechain(cp["seq"] - 1, "rewritten")
+        try:
+            result = self.verify(from_seq=1)
+            self.assertFalse(result["ok"])
+            self.assertIn({"seq": cp["seq"], "reason": "does not match checkpoint"}, result["breaks"])
+        finally:
+            self.rechain(cp["seq"] - 1, original)
+        self.assertTrue(self.verify(from_seq=1)["ok"])
+
+    def test_requires_verify_permission(self):
+        employee = auth_headers(self.client, "employee@local")
+        self.assertEqual(self.client.post("/audit/verify", headers=employee).status_code, 403)
+
+if __name__ == "__main__":
+    unittest.main()
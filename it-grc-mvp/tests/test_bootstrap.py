@@ -0,0 +1,42 @@
+import unittest
+
+from sqlalchemy import inspect, text
+
+from support import make_client
+
+from app.bootstrap import BOOTSTRAP_VERSION, run_bootstrap
+from app.db.base import Base
+from app.db.session import engine
+
+# Indexes added to existing tables after the first release; a database created then has none
+LATER_INDEXES = {
+    "access_requests": ["ix_access_requests_created_id", "ix_access_requests_requested_by_id", "ix_access_requests_status"],
+    "audit_logs": ["ix_audit_logs_created_id"],
+    "control_mappings": ["ix_control_mappings_framework_id"],
+    "risks": ["ix_risks_likelihood_impact", "ix_risks_owner_id", "ix_risks_score_updated_id"],
+}
+
+def _index_names(table: str) -> set[str]:
+    with engine.connect() as conn:
+        return {i["name"] for i in inspect(conn).get_indexes(table)}
+
+class BootstrapUpgradeTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        make_client()
+
+    def test_upgrade_creates_indexes_on_existing_tables(self):
+        with engine.begin() as conn:
+            for names in LATER_INDEXES.values():
+                for name in names:
+                    conn.execute(text(f"DROP INDEX {name}"))
+            conn.execute(text("UPDATE schema_meta SET value = '4' WHERE key = 'bootstrap_version'"))
+
+        self.assertEqual(run_bootstrap()["status"], "applied")
+        for table in Base.metadata.sorted_tables:
+            with self.subTest(table=table.name):
+                self.assertTrue({i.name for i in table.indexes} <= _index_names(table.name))
+        self.assertEqual(run_bootstrap(), {"status": "current", "version": BOOTSTRAP_VERSION})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+
+from support import auth_headers, count_queries, make_client
+
+from app.db.session import SessionLocal
+from app.models.compliance import Control
+
+class CoverageMatrixTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = make_client()
+        cls.headers = auth_headers(cls.client)
+        frameworks = cls.client.get("/compliance/frameworks", headers=cls.headers).json()
+        cls.soc2 = next(f["id"] for f in frameworks if f["name"] == "SOC 2")
+
+    def _coverage(self, **params):
+        resp = self.client.get("/compliance/coverage", headers=self.headers, params=params)
+        self.assertEqual(resp.status_code, 200)
+        return resp.json()
+
+    def test_counts_and_pivot_agree(self):
+        matrix = self._coverage()
+        for fw in matrix["frameworks"]:
+            cells = [c for c in matrix["controls"] if str(fw["framework_id"]) in c["statuses"]]
+            self.assertEqual(fw["mapped"], len(cells))
+            self.assertEqual(fw["mapped"] + fw["unmapped"], fw["total_controls"])
+        self.assertEqual(len(matrix["controls"]), matrix["frameworks"][0]["total_controls"])
+
+    def test_unmapped_for_framework_and_invalidation(self):
+        unmapped = self._coverage(framework_id=self.soc2, unmapped_only=True)
+        names = {c["control"]: c["control_id"] for c in unmapped["controls"]}
+        self.assertIn("Access Reviews", names)
+        self.assertNotIn("MFA Enabled", names)
+
+        resp = self.client.post("/compliance/mappings", headers=self.headers, json={
+            "control_id": names["Access Reviews"], "framework_id": self.soc2, "status": "NONCOMPLIANT",
+        })
+        self.assertEqual(resp.status_code, 200)
+        after = self._coverage(framework_id=self.soc2, unmapped_only=True)
+        self.assertNotIn("Access Reviews", {c["control"] for c in after["controls"]})
+        self.assertEqual(after["frameworks"][0]["unmapped"], unmapped["frameworks"][0]["unmapped"] - 1)
+
+class CatalogueCacheTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = make_client()
+        cls.headers = auth_headers(cls.client)
+        for i in range(5):
+            cls.client.post("/compliance/controls", headers=cls.headers, json={"name": f"Catalogue {i}"})
+
+    def _list(self, path: str, **params) -> list:
+        resp = self.client.get(path, headers=self.headers, params=params)
+        self.assertEqual(resp.status_code, 200)
+        return resp
+
+    def test_lists_served_from_memory(self):
+        self._list("/compliance/controls")
+        self._list("/compliance/frameworks")
+        with count_queries() as queries:
+            self._list("/compliance/controls")
+            self._list("/compliance/frameworks")
+        self.assertEqual(len(queries), 0)
+
+    def test_prefix_pages_and_write_invalidation(self):
+        names, cursor = [], None
+        while True:
+            resp = self._list("/compliance/controls", name_prefix="Catalogue ", limit=2, **({"cursor": cursor} if cursor else {}))
+            names += [c["name"] for c in resp.json()]
+            cursor = resp.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        self.assertEqual(names, sorted(names))
+        self.assertEqual(len(names), len(set(names)))
+        self.assertTrue({f"Catalogue {i}" for i in range(5)} <= set(names))
+
+        self.client.post("/compliance/controls", headers=self.headers, json={"name": "Catalogue new"})
+        self.assertIn("Catalogue new", [c["name"] for c in self._list("/compliance/controls", name_prefix="Catalogue n").json()])
+
+    def test_reference_check_falls_back_to_database(self):
+        # Written behind the API's back: not in the cached snapshot, still a valid reference
+        with SessionLocal() as db:
+            c = Control(name="Catalogue direct", description="")
+            db.add(c)
+            db.commit()
+            control_id = c.id
+        framework_id = self._list("/compliance/frameworks").json()[0]["id"]
+        resp = self.client.post("/compliance/mappings", headers=self.headers, json={"control_id": control_id, "framework_id": framework_id})
+        self.assertEqual(resp.status_code, 200)
+        resp = self.client.post("/compliance/mappings", headers=self.headers, json={"control_id": 10**9, "framework_id": framework_id})
+        self.assertEqual(resp.status_code, 400)
+
+if __name__ == "__main__":
+    unittest.main()
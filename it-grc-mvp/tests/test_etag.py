@@ -0,0 +1,54 @@
+import unittest
+
+from support import auth_headers, count_queries, make_client
+
+from app.core.versions import etag_matches
+
+class EtagMatchTest(unittest.TestCase):
+    def test_weak_comparison(self):
+        self.assertTrue(etag_matches('"a", W/"b"', 'W/"b"'))
+        self.assertTrue(etag_matches('"b"', 'W/"b"'))
+        self.assertTrue(etag_matches("*", 'W/"b"'))
+        self.assertFalse(etag_matches('W/"c"', 'W/"b"'))
+        self.assertFalse(etag_matches(None, 'W/"b"'))
+
+class ConditionalGetTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = make_client()
+        cls.headers = auth_headers(cls.client)
+
+    def get(self, path: str, etag: str | None = None):
+        headers = {**self.headers, **({"If-None-Match": etag} if etag else {})}
+        return self.client.get(path, headers=headers)
+
+    def test_not_modified_skips_query(self):
+        etag = self.get("/risks").headers["ETag"]
+        with count_queries() as queries:
+            resp = self.get("/risks", etag)
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp.headers["ETag"], etag)
+        self.assertEqual(resp.content, b"")
+        self.assertEqual(len(queries), 0)
+
+        # Other filters/pages of the same table have their own tag
+        self.assertNotEqual(self.get("/risks?limit=1").headers["ETag"], etag)
+
+    def test_write_changes_etag(self):
+        risks = self.get("/risks").headers["ETag"]
+        controls = self.get("/compliance/controls").headers["ETag"]
+        resp = self.client.post("/risks", headers=self.headers, json={"title": "etag", "likelihood": 1, "impact": 2})
+        self.assertEqual(resp.status_code, 200)
+
+        resp = self.get("/risks", risks)
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp.headers["ETag"], risks)
+        self.assertEqual(self.get("/compliance/controls", controls).status_code, 304)
+
+    def test_unauthorised_still_rejected(self):
+        etag = self.get("/compliance/frameworks").headers["ETag"]
+        resp = self.client.get("/compliance/frameworks", headers={"If-None-Match": etag})
+        self.assertEqual(resp.status_code, 401)
+
+if __name__ == "__main__":
+    unittest.main()
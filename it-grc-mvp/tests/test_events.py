@@ -0,0 +1,130 @@
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+import httpx
+from support import auth_headers, make_client
+
+from app.core import events
+from app.core.config import settings
+from app.core.events import event_hub
+from app.main import app
+
+class EventFeedTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = make_client()
+        cls.headers = auth_headers(cls.client)
+
+    def head(self) -> int:
+        return self.client.get("/events/poll?timeout=0", headers=self.headers).json()["last_event_id"]
+
+    def create_risk(self, title: str) -> None:
+        resp = self.client.post("/risks", headers=self.headers, json={"title": title, "likelihood": 2, "impact": 2})
+        self.assertEqual(resp.status_code, 200)
+
+    def poll(self, after: int, headers=None, **params) -> dict:
+        resp = self.client.get("/events/poll", headers=headers or self.headers, params={"after": after, "timeout": 5, **params})
+        self.assertEqual(resp.status_code, 200)
+        return resp.json()
+
+    def test_long_poll_filters_and_resumes(self):
+        start = self.head()
+        self.create_risk("event feed risk")
+        self.client.post("/access-requests", headers=self.headers, json={"resource": "siem", "requested_role": "reader"})
+
+        page = self.poll(start, entity_type="AccessRequest")
+        self.assertEqual([e["action"] for e in page["events"]], ["ACCESS_REQUEST_CREATE"])
+        every = self.poll(start)
+        self.assertEqual([e["action"] for e in every["events"]], ["RISK_CREATE", "ACCESS_REQUEST_CREATE"])
+        self.assertEqual(every["last_event_id"], every["events"][-1]["seq"])
+        self.assertEqual(self.poll(every["last_event_id"], timeout=0)["events"], [])
+
+    def test_sse_stream_resumes_from_last_event_id(self):
+        start = self.head()
+        self.create_risk("streamed 1")
+        self.create_risk("streamed 2")
+        with mock.patch.object(settings, "EVENTS_MAX_STREAM_SECONDS", 0.3):
+            resp = self.client.get("/events", headers={**self.headers, "Last-Event-ID": str(start)})
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.headers["content-type"].startswith("text/event-stream"))
+        messages = [m for m in resp.text.split("\n\n") if "data: " in m]
+        ids = [int(m.split("id: ")[1].split("\n")[0]) for m in messages]
+        data = [json.loads(m.split("data: ")[1]) for m in messages]
+        self.assertEqual([d["details"] for d in data], ["score=4", "score=4"])
+        self.assertEqual(ids, [start + 1, start + 2])
+
+    def test_resume_older_than_buffer_reads_database(self):
+        start = self.head()
+        self.create_risk("before the buffer")
+        self.assertEqual(len(self.poll(start)["events"]), 1)
+        with event_hub._lock:
+            event_hub._buffer.clear()
+        with mock.patch.object(events, "load_events", wraps=events.load_events) as load:
+            page = self.poll(start)
+        load.assert_called()
+        self.assertEqual([e["seq"] for e in page["events"]], [start + 1])
+
+    def test_permissions_scope_the_feed(self):
+        employee = auth_headers(self.client, "employee@local")
+        start = self.head()
+        self.client.post("/users", headers=self.headers, json={"email": "events@example.com", "full_name": "E", "password": "ChangeMe123!"})
+        self.create_risk("visible to employees")
+        page = self.poll(start, headers=employee)
+        self.assertEqual([e["entity_type"] for e in page["events"]], ["Risk"])
+        resp = self.client.get("/events/poll", headers=employee, params={"entity_type": "User", "timeout": 0})
+        self.assertEqual(resp.status_code, 403)
+
+    def test_subscriber_cap_answers_503(self):
+        with mock.patch.object(settings, "EVENTS_MAX_SUBSCRIBERS", 0):
+            for path in ("/events", "/events/poll?timeout=0"):
+                with self.subTest(path=path):
+                    resp = self.client.get(path, headers=self.headers)
+                    self.assertEqual(resp.status_code, 503)
+                    self.assertIn("Retry-After", resp.headers)
+        with mock.patch.object(settings, "EVENTS_MAX_STREAM_SECONDS", 0):
+            self.assertEqual(self.client.get("/events", headers=self.headers).status_code, 200)
+        self.assertEqual(event_hub.subscribers, 0)
+
+    def test_disconnect_before_body_frees_no_slot(self):
+        async def run():
+            async def receive():
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    raise OSError("client went away")
+
+            scope = {
+                "type": "http", "asgi": {"version": "3.0", "spec_version": "2.4"}, "http_version": "1.1",
+                "method": "GET", "scheme": "http", "path": "/events", "raw_path": b"/events", "query_string": b"",
+                "root_path": "", "server": ("test", 80), "client": ("127.0.0.1", 1234),
+                "headers": [(b"host", b"test"), (b"authorization", self.headers["Authorization"].encode())],
+            }
+            for _ in range(3):
+                with self.assertRaises(Exception):
+                    await app(scope, receive, send)
+
+        before = event_hub.subscribers
+        asyncio.run(run())
+        self.assertEqual(event_hub.subscribers, before)
+
+    def test_one_listener_fans_out_to_waiting_clients(self):
+        async def run():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                after = (await client.get("/events/poll?timeout=0", headers=self.headers)).json()["last_event_id"]
+                polls = [client.get("/events/poll", headers=self.headers, params={"after": after, "timeout": 5}) for _ in range(20)]
+                waiting = asyncio.gather(*polls)
+                await asyncio.sleep(0.2)
+                await client.post("/risks", headers=self.headers, json={"title": "fan out", "likelihood": 1, "impact": 1})
+                return await waiting
+
+        with mock.patch.object(events, "load_events", wraps=events.load_events) as load:
+            pages = asyncio.run(run())
+        load.assert_not_called()  # every client was served from the shared buffer
+        self.assertEqual({tuple(e["action"] for e in p.json()["events"]) for p in pages}, {("RISK_CREATE",)})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import csv
+import gzip
+import io
+import json
+import unittest
+from unittest import mock
+
+from support import auth_headers, make_client
+
+from app.core.config import settings
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+class ExportFormatTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = make_client()
+        cls.headers = auth_headers(cls.client)
+        for i in range(3):
+            cls.client.post("/risks", headers=cls.headers, json={"title": f"export {i}", "likelihood": 3, "impact": i + 1})
+
+    def get(self, path: str, **headers):
+        return self.client.get(path, headers={**self.headers, **headers})
+
+    def test_csv_stays_the_default(self):
+        for accept in (None, "*/*", "text/html,application/xhtml+xml,*/*;q=0.8"):
+            with self.subTest(accept=accept):
+                resp = self.get("/reports/risk-summary", **({"Accept": accept} if accept else {}))
+                self.assertTrue(resp.headers["content-type"].startswith("text/csv"))
+
+    def test_ndjson_is_gzip_encoded(self):
+        resp = self.get("/audit/export?action=RISK_CREATE", Accept="application/x-ndjson", **{"Accept-Encoding": "gzip"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.headers["content-encoding"], "gzip")
+        self.assertEqual(resp.headers["content-type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in resp.text.splitlines()]  # httpx decodes gzip
+        self.assertTrue(rows)
+        self.assertEqual({r["action"] for r in rows}, {"RISK_CREATE"})
+        self.assertTrue(rows[0]["created_at"].endswith("Z"))
+        self.assertIsInstance(rows[0]["seq"], int)
+
+    def test_ndjson_gzip_stream_is_one_valid_member(self):
+        from app.core.exports import iter_ndjson
+        batches = [[(i, f"row {i}") for i in range(start, start + 50)] for start in range(0, 200, 50)]
+        raw = b"".join(iter_ndjson(["id", "name"], batches, gzip=True))
+        lines = gzip.decompress(raw).decode().splitlines()
+        self.assertEqual(len(lines), 200)
+        self.assertEqual(json.loads(lines[-1]), {"id": 199, "name": "row 199"})
+
+    def test_format_param_and_unacceptable_accept(self):
+        resp = self.get("/reports/compliance-gap?format=csv", Accept="application/xml")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self.get("/reports/compliance-gap", Accept="application/xml").status_code, 406)
+        self.assertEqual(self.get("/reports/compliance-gap?format=xlsx").status_code, 422)
+
+    def test_fresh_csv_streams_in_batches(self):
+        with mock.patch.object(settings, "EXPORT_BATCH_SIZE", 1):
+            rows = list(csv.DictReader(io.StringIO(self.get("/reports/risk-summary?fresh=true").text)))
+        self.assertIn("export 2", [r["title"] for r in rows])
+
+    @unittest.skipIf(pyarrow is None, "pyarrow not installed")
+    def test_parquet_keeps_types(self):
+        with mock.patch.object(settings, "EXPORT_COLUMNAR_BATCH_ROWS", 2), mock.patch.object(settings, "EXPORT_BATCH_SIZE", 1):
+            resp = self.get("/reports/risk-summary", Accept="application/vnd.apache.parquet")
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.headers["content-disposition"].endswith('risk_summary.parquet"'))
+        parquet = pyarrow.parquet.ParquetFile(io.BytesIO(resp.content))
+        self.assertGreater(parquet.num_row_groups, 1)  # written batch by batch
+        table = parquet.read()
+        self.assertEqual(table.schema.field("score").type, pyarrow.int64())
+        self.assertEqual(table.schema.field("updated_at").type, pyarrow.timestamp("us", tz="UTC"))
+        self.assertIn("export 2", table.column("title").to_pylist())
+
+    @unittest.skipIf(pyarrow is None, "pyarrow not installed")
+    def test_arrow_stream(self):
+        resp = self.get("/audit/export?format=arrow&entity_type=Risk")
+        self.assertEqual(resp.headers["content-type"], "application/vnd.apache.arrow.stream")
+        table = pyarrow.ipc.open_stream(resp.content).read_all()
+        self.assertEqual(table.schema.field("created_at").type, pyarrow.timestamp("us", tz="UTC"))
+        self.assertEqual(set(table.column("entity_type").to_pylist()), {"Risk"})
+
+if __name__ == "__main__":
+    unittest.main()
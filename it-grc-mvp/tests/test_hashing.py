@@ -0,0 +1,88 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from fastapi import HTTPException
+from passlib.hash import pbkdf2_sha256
+
+from support import DEMO_PASSWORD, auth_headers, make_client
+
+from app.core.hashing import HashingService, hasher
+from app.db.session import SessionLocal
+from app.models.user import User
+
+class HashingServiceTest(unittest.TestCase):
+    def test_rate_limit_per_key(self):
+        service = HashingService(workers=0, max_pending=4, attempts_per_window=2, window_seconds=60)
+        for _ in range(5):
+            service.admit("account:a", "ip:1")  # admitted attempts alone never count
+        service.record_failure("account:a", "ip:1")
+        service.record_failure("account:a", "ip:1")
+        with self.assertRaises(HTTPException) as ctx:
+            service.admit("account:a", "ip:2")
+        self.assertEqual(ctx.exception.status_code, 429)
+        self.assertIn("Retry-After", ctx.exception.headers)
+        service.admit("account:b", "ip:2")
+
+    def test_rejection_records_nothing(self):
+        service = HashingService(workers=0, max_pending=4, attempts_per_window=1, window_seconds=60)
+        service.record_failure("ip:1")
+        with self.assertRaises(HTTPException):
+            service.admit("account:a", "ip:1")
+        service.admit("account:a", "ip:2")  # the rejection left no attempt on account:a
+
+    def test_busy_when_pending_cap_reached(self):
+        service = HashingService(workers=0, max_pending=0, attempts_per_window=10, window_seconds=60)
+        with self.assertRaises(HTTPException) as ctx:
+            asyncio.run(service.hash("pw"))
+        self.assertEqual(ctx.exception.status_code, 503)
+        service.shutdown()
+
+    def test_verify_in_pool(self):
+        service = HashingService(workers=0, max_pending=4, attempts_per_window=10, window_seconds=60)
+        try:
+            pw_hash = asyncio.run(service.hash("pw"))
+            self.assertEqual(asyncio.run(service.verify("pw", pw_hash)), (True, None))
+            self.assertFalse(asyncio.run(service.verify("nope", pw_hash))[0])
+        finally:
+            service.shutdown()
+
+class LoginRehashTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = make_client()
+
+    def test_login_upgrades_weak_hash(self):
+        weak = pbkdf2_sha256.using(rounds=1000).hash(DEMO_PASSWORD)
+        with SessionLocal() as db:
+            db.query(User).filter(User.email == "employee@local").update({"password_hash": weak})
+            db.commit()
+
+        auth_headers(self.client, "employee@local")
+
+        with SessionLocal() as db:
+            stored = db.query(User.password_hash).filter(User.email == "employee@local").scalar()
+        self.assertNotEqual(stored, weak)
+        self.assertTrue(pbkdf2_sha256.verify(DEMO_PASSWORD, stored))
+
+    def test_wrong_password_rejected(self):
+        resp = self.client.post("/auth/login", data={"username": "employee@local", "password": "wrong"})
+        self.assertEqual(resp.status_code, 401)
+
+class CreateUserHashingTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = make_client()
+
+    def test_rejected_requests_never_hash(self):
+        body = {"email": "hashing@example.com", "full_name": "Dup", "password": "ChangeMe123!"}
+        admin, employee = auth_headers(self.client), auth_headers(self.client, "employee@local")
+        self.assertEqual(self.client.post("/users", headers=admin, json=body).status_code, 200)
+        with mock.patch.object(hasher, "hash", wraps=hasher.hash) as hash_:
+            self.assertEqual(self.client.post("/users", json=body).status_code, 401)
+            self.assertEqual(self.client.post("/users", headers=employee, json=body).status_code, 403)
+            self.assertEqual(self.client.post("/users", headers=admin, json=body).status_code, 409)
+        hash_.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import json
+import unittest
+
+from support import auth_headers, make_client
+
+class BulkImportTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = make_client()
+        cls.headers = auth_headers(cls.client)
+
+    def _upload(self, path, name, body, ctype):
+        return self.client.post(path, headers=self.headers, files={"file": (name, body, ctype)})
+
+    def test_controls_csv_upserts_by_name(self):
+        body = "name,description\nImport A,first\nImport B,second\n,missing name\nImport A,updated\n"
+        resp = self._upload("/compliance/controls/import", "controls.csv", body, "text/csv")
+        self.assertEqual(resp.status_code, 200)
+        result = resp.json()
+        self.assertEqual((result["received"], result["imported"], result["skipped"], result["failed"]), (4, 2, 1, 1))
+        self.assertEqual(result["errors"][0]["row"], 4)
+
+        controls = self.client.get("/compliance/controls", headers=self.headers, params={"name_prefix": "Import "}).json()
+        self.assertEqual({c["name"]: c["description"] for c in controls}, {"Import A": "updated", "Import B": "second"})
+
+    def test_frameworks_count_only_inserted_rows(self):
+        body = "name\nSOC 2\nImport FW\nImport FW\n"
+        result = self._upload("/compliance/frameworks/import", "frameworks.csv", body, "text/csv").json()
+        self.assertEqual((result["received"], result["imported"], result["skipped"], result["failed"]), (3, 1, 2, 0))
+        audit = self.client.get("/audit", headers=self.headers, params={"action": "FRAMEWORK_IMPORT"}).json()
+        self.assertIn("imported=1 skipped=2", audit[0]["details"])
+
+    def test_mappings_ndjson_by_name(self):
+        lines = [
+            {"control": "MFA Enabled", "framework": "ISO 27001", "status": "COMPLIANT"},
+            {"control": "No Such Control", "framework": "GDPR"},
+            "not json",
+        ]
+        body = "\n".join(json.dumps(x) if isinstance(x, dict) else x for x in lines)
+        resp = self._upload("/compliance/mappings/import", "mappings.ndjson", body, "application/x-ndjson")
+        result = resp.json()
+        self.assertEqual((result["imported"], result["failed"]), (1, 2))
+        self.assertEqual(sorted(e["row"] for e in result["errors"]), [2, 3])
+
+    def test_risks_import_validates_scale(self):
+        body = "title,likelihood,impact\nBulk risk,3,3\nBad risk,4,1\n"
+        result = self._upload("/risks/import", "risks.csv", body, "text/csv").json()
+        self.assertEqual((result["imported"], result["failed"]), (1, 1))
+        self.assertIn("likelihood must be 1..3", result["errors"][0]["error"])
+
+    def test_non_utf8_upload_is_rejected(self):
+        rows = "".join(f"Latin {i},plain\n" for i in range(50))
+        body = ("name,description\n" + rows + "Caf\u00e9 Latin,r\u00e9sum\u00e9\n").encode("latin-1")
+        resp = self._upload("/compliance/controls/import", "controls.csv", body, "text/csv")
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("UTF-8", resp.json()["detail"])
+        controls = self.client.get("/compliance/controls", headers=self.headers, params={"name_prefix": "Latin "}).json()
+        self.assertEqual(controls, [])  # nothing from the rejected file was kept
+
+    def test_unknown_format(self):
+        resp = self._upload("/risks/import", "risks.xlsx", b"PK", "application/octet-stream")
+        self.assertEqual(resp.status_code, 415)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import re
+import unittest
+
+from support import auth_headers, make_client
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+def sample(text: str, name: str, route: str, extra: str = "") -> float:
+    match = re.search(rf'^{name}{{method="GET",route="{re.escape(route)}"{extra}}} (\S+)$', text, re.M)
+    return float(match.group(1)) if match else 0.0
+
+class MetricsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = make_client()
+        cls.headers = auth_headers(cls.client)
+
+    def setUp(self):
+        registry.clear()
+
+    def test_route_metrics(self):
+        for _ in range(3):
+            self.assertEqual(self.client.get("/risks", headers=self.headers).status_code, 200)
+        self.client.get("/risks/999999999/nope", headers=self.headers)
+        text = self.client.get("/metrics").text
+
+        self.assertEqual(sample(text, "grc_http_requests_total", "/risks", ',status="200"'), 3)
+        self.assertEqual(sample(text, "grc_http_request_duration_seconds_count", "/risks"), 3)
+        self.assertGreaterEqual(sample(text, "grc_http_request_db_statements_sum", "/risks"), 3)
+        self.assertGreater(sample(text, "grc_http_request_db_seconds_total", "/risks"), 0)
+        self.assertGreater(sample(text, "grc_http_request_phase_seconds_total", "/risks", ',phase="auth"'), 0)
+        self.assertEqual(sample(text, "grc_http_requests_total", "<unmatched>", ',status="404"'), 1)
+        self.assertIn('le="+Inf"', text)
+
+    def test_slow_request_log(self):
+        settings.SLOW_REQUEST_MS = 0.001
+        try:
+            with self.assertLogs("app.core.metrics", "WARNING") as logs:
+                self.client.get("/risks", headers=self.headers)
+        finally:
+            settings.SLOW_REQUEST_MS = 0
+        self.assertIn('"route": "/risks"', logs.output[0])
+        self.assertIn("FROM risks", logs.output[0])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from support import auth_headers, make_client
+
+class KeysetPaginationTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = make_client()
+        cls.headers = auth_headers(cls.client)
+        for i in range(25):
+            cls.client.post("/risks", headers=cls.headers, json={
+                "title": f"paging risk {i}", "likelihood": i % 3 + 1, "impact": 2,
+            })
+
+    def _walk(self, path, params):
+        seen, cursor = [], None
+        while True:
+            resp = self.client.get(path, headers=self.headers, params={**params, **({"cursor": cursor} if cursor else {})})
+            self.assertEqual(resp.status_code, 200)
+            seen.extend(resp.json())
+            cursor = resp.headers.get("X-Next-Cursor")
+            if not cursor:
+                return seen
+
+    def test_pages_cover_sort_order_without_overlap(self):
+        full = self.client.get("/risks", headers=self.headers, params={"limit": 1000}).json()
+        paged = self._walk("/risks", {"limit": 7})
+        self.assertEqual([r["id"] for r in paged], [r["id"] for r in full])
+        keys = [(r["score"], r["updated_at"], r["id"]) for r in paged]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+
+    def test_filters_are_applied(self):
+        rows = self._walk("/risks", {"limit": 5, "min_score": 4, "max_score": 4})
+        self.assertTrue(rows)
+        self.assertTrue(all(r["score"] == 4 for r in rows))
+
+    def test_invalid_cursor(self):
+        resp = self.client.get("/risks", headers=self.headers, params={"cursor": "not-a-cursor"})
+        self.assertEqual(resp.status_code, 400)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+from datetime import datetime
+
+from support import auth_headers, count_queries, make_client
+
+from app.core.coverage import invalidate_coverage
+from app.core.rbac import load_principal
+from app.db.session import SessionLocal
+from app.models.access import AccessRequest
+from app.models.audit import AuditLog
+from app.models.compliance import Control, ControlMapping, Framework
+from app.models.risk import Risk
+from app.models.user import Role, User
+
+# Statement counts for these must not depend on how many rows they return
+ENDPOINTS = [
+    "/users?limit=1000",
+    "/auth/me",
+    "/risks?limit=1000",
+    "/risks/heatmap",
+    "/risks/rollup?by=owner",
+    "/access-requests?limit=1000",
+    "/audit?limit=1000",
+    "/compliance/frameworks?limit=1000",
+    "/compliance/controls?limit=1000",
+    "/compliance/mappings?limit=1000",
+    "/compliance/coverage",
+    "/reports/access-reviews?fresh=true",
+    "/reports/risk-summary?fresh=true",
+    "/reports/compliance-gap?fresh=true",
+]
+
+_batch = 0
+
+def grow(n: int) -> None:
+    # Adds n users (each with every role) and rows that reference them in every table
+    global _batch
+    _batch += 1
+    with SessionLocal() as db:
+        roles = db.query(Role).all()
+        users = [User(email=f"budget-{_batch}-{i}@example.com", full_name="", password_hash="x", roles=roles) for i in range(n)]
+        fws = [Framework(name=f"Budget FW {_batch}-{i}") for i in range(n)]
+        ctls = [Control(name=f"Budget Control {_batch}-{i}") for i in range(n)]
+        db.add_all(users + fws + ctls)
+        db.flush()
+        now = datetime.utcnow()
+        for i, u in enumerate(users):
+            db.add(Risk(title=f"r{i}", likelihood=2, impact=2, score=4, owner_id=u.id, updated_at=now))
+            db.add(AccessRequest(resource="app", requested_role="reader", requested_by_id=u.id))
+            db.add(AuditLog(actor_user_id=u.id, action="TEST", entity_type="User", entity_id=str(u.id)))
+            db.add(ControlMapping(control_id=ctls[i].id, framework_id=fws[i].id, status="COMPLIANT"))
+        db.commit()
+
+class QueryBudgetTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = make_client()
+        cls.headers = auth_headers(cls.client)
+
+    def statements(self, path: str) -> int:
+        self.client.get(path, headers=self.headers)  # warm the principal cache
+        invalidate_coverage()
+        with count_queries() as queries:
+            resp = self.client.get(path, headers=self.headers)
+        self.assertEqual(resp.status_code, 200, path)
+        return len(queries)
+
+    def test_statement_count_independent_of_result_size(self):
+        grow(2)
+        before = {path: self.statements(path) for path in ENDPOINTS}
+        grow(20)
+        for path in ENDPOINTS:
+            with self.subTest(path=path):
+                self.assertEqual(self.statements(path), before[path])
+
+    def test_principal_load_independent_of_role_count(self):
+        grow(1)
+        with SessionLocal() as db:
+            with count_queries() as one_role:
+                load_principal(db, "employee@local")
+            with count_queries() as all_roles:
+                self.assertIsNotNone(load_principal(db, f"budget-{_batch}-0@example.com"))
+        self.assertEqual(len(all_roles), len(one_role))
+
+if __name__ == "__main__":
+    unittest.main()
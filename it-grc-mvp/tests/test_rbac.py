@@ -0,0 +1,101 @@
+import fnmatch
+import time
+import unittest
+
+from support import auth_headers, make_client
+
+from app.core.cache import RedisCache, TTLCache
+from app.core.rbac import principal_cache
+
+class TTLCacheTest(unittest.TestCase):
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_ttl_expiry(self):
+        cache = TTLCache(maxsize=10, ttl=0.01)
+        cache.set("a", 1)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["misses"], 1)
+
+class FakeRedis:
+    # The subset of redis.Redis that RedisCache uses; expiry is recorded, not enforced
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+        self.expiry_ms: dict[str, int] = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, px=None):
+        self.data[key] = value.encode()
+        self.expiry_ms[key] = px
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, match, count=None):
+        return [k for k in list(self.data) if fnmatch.fnmatchcase(k, match)]
+
+class RedisCacheTest(unittest.TestCase):
+    def test_round_trip_prefix_and_clear(self):
+        client = FakeRedis()
+        client.set("other:a", "1")
+        cache = RedisCache("redis://unused", "grc:test:", ttl=2.5, client=client)
+        self.assertIsNone(cache.get("a"))
+        cache.set("a", [{"id": 1, "name": "SOC 2"}])
+        self.assertEqual(cache.get("a"), [{"id": 1, "name": "SOC 2"}])
+        self.assertEqual(client.expiry_ms["grc:test:a"], 2500)
+        cache.set("b", 2)
+        cache.pop("b")
+        self.assertIsNone(cache.get("b"))
+        cache.clear()
+        self.assertEqual(set(client.data), {"other:a"})
+        self.assertEqual((cache.stats()["hits"], cache.stats()["misses"]), (1, 2))
+
+    def test_zero_ttl_stores_nothing(self):
+        client = FakeRedis()
+        RedisCache("redis://unused", "grc:test:", ttl=0, client=client).set("a", 1)
+        self.assertEqual(client.data, {})
+
+class PrincipalCacheTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = make_client()
+
+    def test_repeat_requests_hit_cache(self):
+        headers = auth_headers(self.client, "auditor@local")
+        principal_cache.clear()
+        before = principal_cache.stats()
+        for _ in range(3):
+            self.assertEqual(self.client.get("/risks", headers=headers).status_code, 200)
+        after = principal_cache.stats()
+        self.assertEqual(after["misses"] - before["misses"], 1)
+        self.assertEqual(after["hits"] - before["hits"], 2)
+
+    def test_role_assignment_invalidates(self):
+        admin = auth_headers(self.client)
+        user = self.client.post(
+            "/users", headers=admin,
+            json={"email": "analyst@example.com", "full_name": "Analyst", "password": "pw-12345"},
+        ).json()
+        headers = auth_headers(self.client, "analyst@example.com", "pw-12345")
+        self.assertEqual(self.client.get("/audit", headers=headers).status_code, 403)
+
+        resp = self.client.post(f"/users/{user['id']}/roles", headers=admin, json={"roles": ["Auditor"]})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self.client.get("/audit", headers=headers).status_code, 200)
+
+        self.client.post(f"/users/{user['id']}/roles", headers=admin, json={"roles": ["Employee"]})
+        self.assertEqual(self.client.get("/audit", headers=headers).status_code, 403)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import tempfile
+import unittest
+from unittest import mock
+
+from support import auth_headers, make_client
+from sqlalchemy import create_engine
+
+from app.core.config import settings
+from app.core.versions import version_cache
+from app.db.base import Base
+from app.db.session import READ_PRIMARY_COOKIE, engine, open_read_session, read_engines, recent_writers
+from app.models.risk import Risk
+
+@unittest.skipIf(settings.DB_ASYNC, "routes the sync read engines")
+class ReadRoutingTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = make_client()
+        cls.headers = auth_headers(cls.client)
+        # A "replica" with the schema but none of the primary's rows, so the tests can
+        # tell which side answered; plus one that cannot be opened at all
+        cls.replica = create_engine(f"sqlite:///{tempfile.mkdtemp()}/replica.db")
+        Base.metadata.create_all(cls.replica)
+        cls.broken = create_engine("sqlite:////nonexistent/dir/replica.db")
+
+    def setUp(self):
+        for patch in (
+            mock.patch.object(read_engines, "engines", [self.broken, self.replica]),
+            mock.patch.object(read_engines, "replicas", True),
+            mock.patch.object(read_engines, "_down_until", {}),
+        ):
+            patch.start()
+            self.addCleanup(patch.stop)
+        for cache in (version_cache, recent_writers):
+            cache.clear()
+            self.addCleanup(cache.clear)
+        self.client.cookies.clear()
+
+    def test_lists_read_from_replica_and_skip_broken_one(self):
+        resp = self.client.get("/risks", headers=self.headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json(), [])
+        self.assertEqual(read_engines.candidates(), [self.replica])
+
+    def test_falls_back_to_primary(self):
+        with mock.patch.object(read_engines, "engines", [self.broken]):
+            db = open_read_session()
+            try:
+                self.assertIs(db.get_bind(), engine)
+            finally:
+                db.close()
+
+    def test_read_your_writes(self):
+        resp = self.client.post("/risks", headers=self.headers, json={"title": "fresh", "likelihood": 2, "impact": 2})
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn(READ_PRIMARY_COOKIE, resp.cookies)
+        titles = [r["title"] for r in self.client.get("/risks", headers=self.headers).json()]
+        self.assertIn("fresh", titles)
+
+        # Without the cookie, the same token is still remembered by this worker
+        self.client.cookies.clear()
+        titles = [r["title"] for r in self.client.get("/risks", headers=self.headers).json()]
+        self.assertIn("fresh", titles)
+
+        # Once the window is gone, reads are back on the replica
+        recent_writers.clear()
+        self.assertEqual(self.client.get("/risks", headers=self.headers).json(), [])
+
+    def test_read_session_refuses_writes(self):
+        db = open_read_session()
+        try:
+            db.add(Risk(title="nope", likelihood=1, impact=1, score=1))
+            with self.assertRaises(RuntimeError):
+                db.flush()
+        finally:
+            db.close()
+
+if __name__ == "__main__":
+    unittest.main()
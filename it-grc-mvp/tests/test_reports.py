@@ -0,0 +1,114 @@
+import csv
+import unittest
+from io import StringIO
+from unittest import mock
+
+from support import auth_headers, make_client
+
+from app.core.config import settings
+from app.core.reports import list_snapshots, prune_snapshots, refresh_snapshots
+from app.routers.reports import iter_csv
+
+class CsvStreamTest(unittest.TestCase):
+    def test_empty_report(self):
+        self.assertEqual("".join(iter_csv(["a", "b"], [])), "no_data\r\n")
+
+    def test_flushes_in_chunks(self):
+        rows = ((i, f"row {i}") for i in range(500))
+        with mock.patch.object(settings, "EXPORT_CHUNK_BYTES", 256):
+            chunks = list(iter_csv(["id", "name"], rows))
+        self.assertGreater(len(chunks), 10)
+        parsed = list(csv.reader(StringIO("".join(chunks))))
+        self.assertEqual(parsed[0], ["id", "name"])
+        self.assertEqual(len(parsed), 501)
+
+class ReportEndpointTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = make_client()
+        cls.headers = auth_headers(cls.client)
+
+    def test_compliance_gap_streams_csv(self):
+        resp = self.client.get("/reports/compliance-gap", headers=self.headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.headers["content-type"].startswith("text/csv"))
+        rows = list(csv.DictReader(StringIO(resp.text)))
+        self.assertIn({"framework": "SOC 2", "control": "MFA Enabled", "status": "COMPLIANT",
+                       "notes": "MFA enforced for admin roles."}, rows)
+
+class ReportSnapshotTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = make_client()
+        cls.headers = auth_headers(cls.client)
+
+    def get(self, path: str, **headers):
+        return self.client.get(path, headers={**self.headers, **headers})
+
+    def test_served_from_snapshot_with_validators_and_ranges(self):
+        first = self.get("/reports/access-reviews")
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("Last-Modified", first.headers)
+        second = self.get("/reports/access-reviews")
+        self.assertEqual(second.headers["X-Snapshot-Id"], first.headers["X-Snapshot-Id"])
+        self.assertEqual(second.content, first.content)
+
+        self.assertEqual(self.get("/reports/access-reviews", **{"If-None-Match": first.headers["ETag"]}).status_code, 304)
+        self.assertEqual(self.get("/reports/access-reviews", **{"If-Modified-Since": first.headers["Last-Modified"]}).status_code, 304)
+        part = self.get("/reports/access-reviews", Range="bytes=0-9")
+        self.assertEqual(part.status_code, 206)
+        self.assertEqual(part.content, first.content[:10])
+
+    def test_refresh_on_data_change_and_history(self):
+        old = self.get("/reports/risk-summary").headers["X-Snapshot-Id"]
+        self.assertEqual(refresh_snapshots(["risk-summary"])["unchanged"], ["risk-summary"])
+        self.client.post("/risks", headers=self.headers, json={"title": "snapshot evidence", "likelihood": 2, "impact": 2})
+
+        latest = self.get("/reports/risk-summary")  # the write made the old snapshot stale
+        self.assertNotEqual(latest.headers["X-Snapshot-Id"], old)
+        self.assertIn("snapshot evidence", latest.text)
+        self.assertEqual(refresh_snapshots(["risk-summary"])["unchanged"], ["risk-summary"])
+        with mock.patch.object(settings, "REPORT_SNAPSHOT_MAX_AGE_HOURS", 0):
+            self.assertNotEqual(self.get("/reports/risk-summary").headers["X-Snapshot-Id"], latest.headers["X-Snapshot-Id"])
+        latest = self.get("/reports/risk-summary")
+
+        listed = [s["id"] for s in self.get("/reports/snapshots?report=risk-summary").json()]
+        self.assertEqual(listed[0], latest.headers["X-Snapshot-Id"])
+        self.assertIn(old, listed)
+        previous = self.get(f"/reports/risk-summary/snapshots/{old}")
+        self.assertEqual(previous.status_code, 200)
+        self.assertNotIn("snapshot evidence", previous.text)
+        self.assertEqual(self.get("/reports/risk-summary/snapshots/..%2Fx").status_code, 404)
+
+    def test_access_request_writes_refresh_access_reviews(self):
+        old = self.get("/reports/access-reviews").headers["X-Snapshot-Id"]
+        created = self.client.post("/access-requests", headers=self.headers, json={"resource": "snapshot-vault", "requested_role": "reader"}).json()
+        after_create = self.get("/reports/access-reviews")
+        self.assertNotEqual(after_create.headers["X-Snapshot-Id"], old)
+        self.assertIn("snapshot-vault", after_create.text)
+
+        self.client.post(f"/access-requests/{created['id']}/approve", headers=self.headers)
+        rows = list(csv.DictReader(StringIO(self.get("/reports/access-reviews").text)))
+        self.assertEqual(next(r["status"] for r in rows if r["id"] == str(created["id"])), "APPROVED")
+
+        other = self.client.post("/access-requests", headers=self.headers, json={"resource": "snapshot-batch", "requested_role": "reader"}).json()
+        self.client.post("/access-requests/decisions", headers=self.headers, json={"decisions": [{"id": other["id"], "decision": "DENY"}]})
+        rows = list(csv.DictReader(StringIO(self.get("/reports/access-reviews").text)))
+        self.assertEqual(next(r["status"] for r in rows if r["id"] == str(other["id"])), "DENIED")
+
+    def test_retention_keeps_latest(self):
+        refresh_snapshots(["compliance-gap"], force=True)
+        refresh_snapshots(["compliance-gap"], force=True)
+        latest = list_snapshots("compliance-gap")[0]
+        with mock.patch.object(settings, "REPORT_SNAPSHOT_RETENTION_MAX", 1):
+            self.assertGreaterEqual(prune_snapshots("compliance-gap"), 1)
+        self.assertEqual(list_snapshots("compliance-gap"), [latest])
+
+    def test_request_path_writes_apply_retention(self):
+        refresh_snapshots(["compliance-gap"], force=True)
+        with mock.patch.object(settings, "REPORT_SNAPSHOT_RETENTION_MAX", 1), mock.patch.object(settings, "REPORT_SNAPSHOT_MAX_AGE_HOURS", 0):
+            served = self.get("/reports/compliance-gap").headers["X-Snapshot-Id"]
+        self.assertEqual([s.id for s in list_snapshots("compliance-gap")], [served])
+
+if __name__ == "__main__":
+    unittest.main()
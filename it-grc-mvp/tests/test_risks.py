@@ -0,0 +1,34 @@
+import unittest
+from collections import Counter
+
+from support import auth_headers, make_client
+
+class RiskAggregateTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = make_client()
+        cls.headers = auth_headers(cls.client)
+        for likelihood, impact in [(1, 1), (3, 3), (3, 3), (2, 2), (1, 3)]:
+            cls.client.post("/risks", headers=cls.headers, json={"title": "agg", "likelihood": likelihood, "impact": impact})
+
+    def _all_risks(self):
+        return self.client.get("/risks", headers=self.headers, params={"limit": 1000}).json()
+
+    def test_heatmap_matches_register(self):
+        heatmap = self.client.get("/risks/heatmap", headers=self.headers).json()
+        risks = self._all_risks()
+        self.assertEqual(len(heatmap["cells"]), 9)
+        self.assertEqual(heatmap["total"], len(risks))
+        expected = Counter((r["likelihood"], r["impact"]) for r in risks)
+        self.assertEqual({(c["likelihood"], c["impact"]): c["count"] for c in heatmap["cells"] if c["count"]}, dict(expected))
+
+    def test_rollup_by_band(self):
+        rows = self.client.get("/risks/rollup", headers=self.headers, params={"by": "band"}).json()
+        bands = {r["key"]: r["count"] for r in rows}
+        risks = self._all_risks()
+        self.assertEqual(bands.get("HIGH", 0), sum(1 for r in risks if r["score"] >= 6))
+        self.assertEqual(sum(bands.values()), len(risks))
+        self.assertEqual(rows[0]["key"], "HIGH")
+
+if __name__ == "__main__":
+    unittest.main()
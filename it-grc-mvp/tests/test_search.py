@@ -0,0 +1,77 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from support import auth_headers, make_client
+
+from app.core.config import settings
+from app.core.search import fts5_query
+from app.db.session import SessionLocal
+from app.models.audit import AuditLog
+
+class Fts5QueryTest(unittest.TestCase):
+    def test_user_input_is_quoted(self):
+        self.assertEqual(fts5_query('resource=payroll'), '"resource" "payroll"')
+        self.assertEqual(fts5_query('vend* OR "x'), '"vend"* "OR" "x"')
+        self.assertEqual(fts5_query("-- ()"), "")
+
+class SearchTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = make_client()
+        cls.admin = auth_headers(cls.client)
+        cls.employee = auth_headers(cls.client, "employee@local")
+        resp = cls.client.post("/risks", headers=cls.admin, json={
+            "title": "Quokka vendor outage", "description": "Single supplier for payroll processing",
+            "likelihood": 2, "impact": 3, "mitigation_plan": "Second vendor",
+        })
+        cls.risk_id = resp.json()["id"]
+        cls.client.post("/access-requests", headers=cls.employee, json={"resource": "payroll", "requested_role": "reader"})
+
+    def search(self, headers, **params):
+        return self.client.get("/search", headers=headers, params=params)
+
+    def test_ranked_hits_across_types(self):
+        hits = self.search(self.admin, q="payroll").json()
+        types = {h["type"] for h in hits}
+        self.assertEqual(types, {"risk", "audit"})
+        self.assertEqual(hits, sorted(hits, key=lambda h: h["score"], reverse=True))
+        risk = next(h for h in hits if h["type"] == "risk")
+        self.assertEqual(risk["id"], self.risk_id)
+        self.assertIn("[payroll]", risk["snippet"])
+
+        audit = self.search(self.admin, q="resource=payroll", type="audit").json()
+        self.assertEqual(audit[0]["title"], f"ACCESS_REQUEST_CREATE AccessRequest {audit[0]['title'].split()[-1]}")
+
+    def test_stemming_prefix_and_incremental_update(self):
+        self.assertTrue(self.search(self.admin, q="vendors", type="risk").json())
+        self.assertTrue(self.search(self.admin, q="quok*", type="risk").json())
+
+        self.client.patch(f"/risks/{self.risk_id}", headers=self.admin, json={"title": "Wombat vendor outage"})
+        self.assertFalse(self.search(self.admin, q="quokka", type="risk").json())
+        self.assertEqual(self.search(self.admin, q="wombat", type="risk").json()[0]["id"], self.risk_id)
+
+    def test_permissions(self):
+        hits = self.search(self.employee, q="payroll").json()
+        self.assertEqual({h["type"] for h in hits}, {"risk"})
+        self.assertEqual(self.search(self.employee, q="payroll", type="audit").status_code, 403)
+        self.assertEqual(self.client.get("/search", params={"q": "payroll"}).status_code, 401)
+
+    def test_date_filter(self):
+        hits = self.search(self.admin, q="payroll", created_from="2999-01-01T00:00:00").json()
+        self.assertEqual(hits, [])
+
+    def test_date_window_older_than_candidate_floor(self):
+        old = datetime(2021, 3, 1)
+        with SessionLocal() as db:
+            db.add(AuditLog(action="ARCHIVED_EVENT", entity_type="Test", entity_id="1", details="resource=ledgerzz", created_at=old))
+            db.commit()
+        for i in range(3):  # newer matches that fill the candidate window
+            self.client.post("/access-requests", headers=self.employee, json={"resource": "ledgerzz", "requested_role": f"r{i}"})
+        with mock.patch.object(settings, "SEARCH_MAX_CANDIDATES", 2):
+            hits = self.search(self.admin, q="ledgerzz", type="audit",
+                               created_from=(old - timedelta(days=1)).isoformat(), created_to=(old + timedelta(days=1)).isoformat()).json()
+        self.assertEqual([h["title"] for h in hits], ["ARCHIVED_EVENT Test 1"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from unittest import mock
+
+from support import auth_headers, make_client
+
+from app.core.config import settings
+
+LISTS = [
+    "/risks", "/risks?limit=1", "/audit?limit=5", "/access-requests", "/users",
+    "/compliance/frameworks", "/compliance/controls?limit=2", "/compliance/mappings",
+]
+
+class FastListJsonTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = make_client()
+        cls.headers = auth_headers(cls.client)
+        for title in ("serialize me", "and me"):
+            cls.client.post("/risks", headers=cls.headers, json={"title": title, "likelihood": 3, "impact": 2})
+        cls.client.post("/access-requests", headers=cls.headers, json={"resource": "crm", "requested_role": "reader"})
+
+    def test_same_body_and_headers_as_pydantic_path(self):
+        for path in LISTS:
+            with self.subTest(path=path):
+                fast = self.client.get(path, headers=self.headers)
+                with mock.patch.object(settings, "FAST_LIST_JSON", False):
+                    slow = self.client.get(path, headers=self.headers)
+                self.assertEqual(fast.status_code, 200)
+                self.assertTrue(fast.json())
+                self.assertEqual(fast.json(), slow.json())
+                self.assertEqual(fast.headers["content-type"], slow.headers["content-type"])
+                for name in ("ETag", "X-Next-Cursor"):
+                    self.assertEqual(fast.headers.get(name), slow.headers.get(name))
+
+    def test_cursor_pages_through(self):
+        first = self.client.get("/risks?limit=1", headers=self.headers)
+        cursor = first.headers["X-Next-Cursor"]
+        second = self.client.get(f"/risks?limit=1&cursor={cursor}", headers=self.headers)
+        self.assertNotEqual(first.json()[0]["id"], second.json()[0]["id"])
+
+    def test_openapi_keeps_response_models(self):
+        schema = self.client.get("/openapi.json").json()
+        ok = schema["paths"]["/risks"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+        self.assertEqual(ok, {"type": "array", "items": {"$ref": "#/components/schemas/RiskOut"}, "title": "Response List Risks Risks Get"})
+
+if __name__ == "__main__":
+    unittest.main()